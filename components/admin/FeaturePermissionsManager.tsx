@@ -531,6 +531,8 @@ export const FeaturePermissionsManager: React.FC = () => {
               return (
                 <div
                   key={tool.type}
+                  data-testid="widget-permission-card"
+                  data-widget-type={tool.type}
                   className="bg-white border-2 border-slate-200 rounded-xl hover:border-brand-blue-light transition-colors overflow-hidden"
                 >
                   {/* Top Bar */}
@@ -683,6 +685,8 @@ export const FeaturePermissionsManager: React.FC = () => {
             return (
               <div
                 key={tool.type}
+                data-testid="widget-permission-card"
+                data-widget-type={tool.type}
                 className="bg-white border-2 border-slate-200 rounded-xl p-4 hover:border-brand-blue-light transition-colors"
               >
                 {/* Widget Header */}
@@ -46,7 +46,10 @@ export const InstructionalRoutinesManager: React.FC<
 
   return (
     <div className="fixed inset-0 z-modal-nested bg-slate-900/50 backdrop-blur-sm flex items-center justify-center p-4 animate-in fade-in duration-200">
-      <div className="bg-white w-full max-w-2xl h-[80vh] rounded-2xl shadow-2xl overflow-hidden flex flex-col">
+      <div
+        data-testid="routines-library"
+        className="bg-white w-full max-w-2xl h-[80vh] rounded-2xl shadow-2xl overflow-hidden flex flex-col"
+      >
         <div className="flex items-center justify-between p-4 border-b">
           <h3 className="font-black text-sm uppercase tracking-widest text-slate-500">
             Instructional Routines Library
@@ -100,6 +103,8 @@ export const InstructionalRoutinesManager: React.FC<
               return (
                 <div
                   key={routine.id}
+                  data-testid="routine-card"
+                  data-routine-id={routine.id}
                   className="bg-white border-2 border-slate-200 rounded-2xl p-4 flex items-center justify-between group hover:border-brand-blue-light transition-all shadow-sm"
                 >
                   <div className="flex items-center gap-4">
@@ -164,7 +169,10 @@ export const InstructionalRoutinesManager: React.FC<
       {/* Routine Editor Modal */}
       {editingRoutine && (
         <div className="fixed inset-0 z-modal-deep bg-slate-900/50 backdrop-blur-sm flex items-center justify-center p-4 animate-in fade-in duration-200">
-          <div className="bg-white w-full max-w-2xl h-[80vh] rounded-2xl shadow-2xl overflow-hidden flex flex-col">
+          <div
+            data-testid="routine-editor"
+            className="bg-white w-full max-w-2xl h-[80vh] rounded-2xl shadow-2xl overflow-hidden flex flex-col"
+          >
             <LibraryManager
               routine={editingRoutine}
               onChange={setEditingRoutine}
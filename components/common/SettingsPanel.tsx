@@ -143,6 +143,7 @@ export const SettingsPanel: React.FC<SettingsPanelProps> = ({
   return createPortal(
     <div
       ref={panelRef}
+      data-testid="settings-panel"
       className={`font-${globalStyle.fontFamily}`}
       style={{
         position: 'fixed',
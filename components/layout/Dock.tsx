@@ -754,6 +754,7 @@ export const Dock: React.FC = () => {
       onContextMenu={(e) => e.preventDefault()}
       data-role="dock"
       data-testid="dock"
+      data-expanded={isExpanded}
       data-screenshot="exclude"
       className={`fixed ${containerPositionClasses} z-dock flex items-center gap-4 transition-all duration-300 select-none ${
         isDragCollapsing ? 'transition-none' : 'ease-out'
@@ -801,6 +801,7 @@ export const LunchCountWidget: React.FC<{ widget: WidgetData }> = ({
             >
               <DroppableZone
                 id="unassigned"
+                data-testid="unassigned-zone"
                 className={`${stats.remaining > 0 ? 'flex-1' : 'flex-none'} border-2 border-dashed border-slate-200 rounded-3xl overflow-y-auto custom-scrollbar shadow-inner`}
                 style={{
                   backgroundColor: hexToRgba(cardColor, cardOpacity),
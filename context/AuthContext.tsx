@@ -1325,6 +1325,15 @@ export const AuthProvider: React.FC<{ children: React.ReactNode }> = ({
     };
   }, []);
 
+  // Bypass mode only: publish auth/admin resolution on <html> so the
+  // scripts/tools Playwright flows can wait on it instead of sleeping.
+  useEffect(() => {
+    if (!isAuthBypass || loading) return;
+    const { dataset } = document.documentElement;
+    dataset.authReady = 'true';
+    dataset.isAdmin = isAdmin ? 'true' : 'false';
+  }, [loading, isAdmin]);
+
   // Helper for checking if a user has beta access
   const isBetaUser = useCallback(
     (betaUsers: string[], email: string | null | undefined) => {
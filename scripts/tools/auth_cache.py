@@ -0,0 +1,97 @@
+"""Storage-state snapshots so admin flows start already signed in.
+
+The first flow that needs a role opens a throwaway context, waits for auth
+(and the isAdmin check for ``admin``) to settle, and saves cookies,
+localStorage and IndexedDB (where Firebase keeps its session) to
+``scripts/tools/.cache/auth/<version>/<role>.json``. Later contexts for that
+role are created from the snapshot.
+
+``<version>`` is the build id scripts/generate-version.js writes to
+version.json, read from the running server so it always matches what is
+being tested. A new build gets a new directory and older ones are deleted.
+Dev servers report ``dev`` for every build, so for them the git HEAD is
+mixed in.
+
+Under ``VITE_AUTH_BYPASS`` both roles sign in as the mock user; ``teacher``
+just does not wait for the isAdmin check.
+"""
+import json
+import os
+import shutil
+import subprocess
+import urllib.request
+from pathlib import Path
+
+from harness import BASE_URL, REPO_ROOT, TOOLS_DIR, VIEWPORT
+from readiness import wait_for_auth, wait_for_dashboard
+
+CACHE_DIR = TOOLS_DIR / ".cache" / "auth"
+ROLES = ("admin", "teacher")
+
+
+def app_version(base_url: str = BASE_URL) -> str:
+    """Return the build id of the app at ``base_url`` (falls back to public/version.json)."""
+    try:
+        with urllib.request.urlopen(f"{base_url.rstrip('/')}/version.json", timeout=2) as resp:
+            version = json.load(resp).get("version")
+    except (OSError, ValueError):
+        try:
+            version = json.loads((REPO_ROOT / "public" / "version.json").read_text()).get("version")
+        except (OSError, ValueError):
+            version = None
+    version = str(version or "unknown")
+    if version in ("dev", "unknown"):
+        head = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True
+        ).stdout.strip()
+        version = f"{version}-{head or 'nogit'}"
+    return version
+
+
+def snapshot_path(role: str, version: str) -> Path:
+    if role not in ROLES:
+        raise ValueError(f"Unknown role {role!r}; expected one of {', '.join(ROLES)}")
+    return CACHE_DIR / version / f"{role}.json"
+
+
+def prune(version: str):
+    """Delete snapshots captured for any other build."""
+    if not CACHE_DIR.exists():
+        return
+    for entry in CACHE_DIR.iterdir():
+        if entry.is_dir() and entry.name != version:
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+async def capture(browser, role: str, path: Path):
+    """Sign in once in a fresh context and save its storage state to ``path``."""
+    context = await browser.new_context(viewport=VIEWPORT)
+    try:
+        page = await context.new_page()
+        await page.goto(BASE_URL)
+        await wait_for_dashboard(page)
+        await wait_for_auth(page, admin=role == "admin")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Parallel workers may capture the same role; never share a temp file.
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        await context.storage_state(path=str(tmp), indexed_db=True)
+        tmp.replace(path)
+    finally:
+        await context.close()
+
+
+async def ensure_snapshots(browser, roles, refresh: bool = False) -> dict:
+    """Return ``{role: snapshot path}``, capturing any that are missing for this build."""
+    roles = sorted(set(roles))
+    if not roles:
+        return {}
+    version = app_version()
+    prune(version)
+    paths = {}
+    for role in roles:
+        path = snapshot_path(role, version)
+        if refresh or not path.exists():
+            print(f"Capturing {role} auth snapshot for build {version}...", flush=True)
+            await capture(browser, role, path)
+        paths[role] = str(path)
+    return paths
@@ -0,0 +1,209 @@
+"""Widget mount benchmark: how long every dock widget takes to open.
+
+For each ``button[data-tool-id]`` in the dock the benchmark clicks the
+button, measures in the page (no IPC in the measurement) the time from the
+pointerdown to
+
+* **visible** - the new ``.widget`` has a box and receives hit tests, and
+* **interactive** - the first task the main thread runs after that frame,
+
+samples CDP ``Performance.getMetrics`` around the mount for layout, style,
+script and task time, then deletes the widget again.
+
+Usage:
+
+    python scripts/tools/bench_widgets.py                    # every dock widget once
+    python scripts/tools/bench_widgets.py --repeat 5 --top 15
+    python scripts/tools/bench_widgets.py --only clock --only lunchCount --json out.json
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import tracebuffer
+from dashboard import DOCK_TOOL, open_dock, dock_tool_ids, remove_widget, widget_ids
+from devserver import server
+from harness import BASE_URL, VIEWPORT, Flow, run_many
+from readiness import wait_for_animations, wait_for_auth, wait_for_dashboard
+from timing import step
+
+# Arms window.__mountProbe before the click so the click itself is measured
+# from its pointerdown event timestamp (same clock as performance.now()).
+_MOUNT_PROBE_JS = """
+([known, timeout]) => {
+  window.__mountProbe = new Promise((resolve) => {
+    let t0 = null;
+    document.addEventListener('pointerdown', (e) => { t0 = t0 ?? e.timeStamp; }, { capture: true, once: true });
+    const deadline = performance.now() + timeout;
+    const check = () => {
+      const el = [...document.querySelectorAll('.widget[data-widget-id]')]
+        .find((w) => !known.includes(w.dataset.widgetId));
+      if (el) {
+        const r = el.getBoundingClientRect();
+        const hit = r.width > 0 && r.height > 0
+          && el.contains(document.elementFromPoint(r.x + r.width / 2, r.y + r.height / 2));
+        if (hit) {
+          const visible = performance.now();
+          const channel = new MessageChannel();
+          channel.port1.onmessage = () =>
+            resolve({ id: el.dataset.widgetId, t0, visible, interactive: performance.now() });
+          channel.port2.postMessage(null);
+          return;
+        }
+      }
+      if (performance.now() > deadline) return resolve(null);
+      requestAnimationFrame(check);
+    };
+    requestAnimationFrame(check);
+  });
+}
+"""
+
+# CDP Performance metrics diffed around each mount. Durations are seconds.
+_METRICS = {
+    "LayoutDuration": "layout_ms",
+    "RecalcStyleDuration": "style_ms",
+    "ScriptDuration": "script_ms",
+    "TaskDuration": "task_ms",
+    "LayoutCount": "layouts",
+    "Nodes": "nodes",
+}
+
+
+@dataclass
+class MountSample:
+    tool: str
+    visible_ms: Optional[float] = None
+    interactive_ms: Optional[float] = None
+    layout_ms: Optional[float] = None
+    style_ms: Optional[float] = None
+    script_ms: Optional[float] = None
+    task_ms: Optional[float] = None
+    layouts: Optional[float] = None
+    nodes: Optional[float] = None
+    error: Optional[str] = None
+
+
+async def get_metrics(cdp) -> dict:
+    response = await cdp.send("Performance.getMetrics")
+    return {m["name"]: m["value"] for m in response["metrics"]}
+
+
+async def measure_mount(page, cdp, tool: str, timeout: int = 10000) -> MountSample:
+    sample = MountSample(tool)
+    known = await widget_ids(page)
+    await page.evaluate(_MOUNT_PROBE_JS, [known, timeout])
+    before = await get_metrics(cdp)
+    await page.locator(f'{DOCK_TOOL}[data-tool-id="{tool}"]').click(force=True)
+    mounted = await page.evaluate("() => window.__mountProbe")
+    after = await get_metrics(cdp)
+
+    if mounted is None:
+        # Some dock tools open a popover or modal instead of adding a widget.
+        sample.error = "no widget mounted"
+        await page.keyboard.press("Escape")
+        return sample
+
+    t0 = mounted["t0"] if mounted["t0"] is not None else mounted["visible"]
+    sample.visible_ms = mounted["visible"] - t0
+    sample.interactive_ms = mounted["interactive"] - t0
+    for name, field in _METRICS.items():
+        delta = after.get(name, 0) - before.get(name, 0)
+        setattr(sample, field, delta * 1000 if name.endswith("Duration") else delta)
+
+    widget = page.locator(f'.widget[data-widget-id="{mounted["id"]}"]')
+    await remove_widget(page, widget)
+    await wait_for_animations(page)
+    return sample
+
+
+def make_flow(samples: list, only=None, repeat: int = 1, timeout: int = 10000) -> Flow:
+    async def bench_widgets(page):
+        async with step("Loading app"):
+            await page.goto(BASE_URL)
+            await wait_for_dashboard(page)
+            await wait_for_auth(page)
+        await open_dock(page)
+        tools = await dock_tool_ids(page)
+        if only:
+            tools = [t for t in tools if t in only]
+        cdp = await page.context.new_cdp_session(page)
+        await cdp.send("Performance.enable", {"timeDomain": "threadTicks"})
+        for _ in range(repeat):
+            for tool in tools:
+                async with step(f"Mount {tool}"):
+                    try:
+                        sample = await measure_mount(page, cdp, tool, timeout)
+                    except Exception as e:
+                        sample = MountSample(tool, error=f"{type(e).__name__}: {e}")
+                samples.append(sample)
+
+    return Flow(name="bench_widgets", func=bench_widgets, module="bench_widgets", viewport=VIEWPORT)
+
+
+def summarize(samples: list[MountSample]) -> list[dict]:
+    """One row per tool, slowest median time-to-interactive first."""
+    by_tool: dict[str, list[MountSample]] = {}
+    for s in samples:
+        by_tool.setdefault(s.tool, []).append(s)
+
+    rows = []
+    for tool, items in by_tool.items():
+        ok = [s for s in items if s.error is None]
+        row = {"tool": tool, "runs": len(items), "failed": len(items) - len(ok)}
+        for field in ("visible_ms", "interactive_ms", "layout_ms", "style_ms", "script_ms", "task_ms", "nodes"):
+            values = [getattr(s, field) for s in ok]
+            row[field] = statistics.median(values) if values else None
+        row["interactive_max_ms"] = max((s.interactive_ms for s in ok), default=None)
+        rows.append(row)
+    rows.sort(key=lambda r: (r["interactive_ms"] is None, -(r["interactive_ms"] or 0)))
+    return rows
+
+
+def print_table(rows: list[dict], top: Optional[int] = None):
+    def fmt(value, width=8):
+        return f"{'-':>{width}}" if value is None else f"{value:>{width}.0f}"
+
+    print(f"{'#':>3} {'Widget':<24} {'visible':>8} {'interact':>8} {'max':>8} "
+          f"{'layout':>8} {'style':>8} {'script':>8} {'nodes':>8} {'fail':>5}")
+    for i, r in enumerate(rows[:top] if top else rows, 1):
+        print(
+            f"{i:>3} {r['tool'][:24]:<24} {fmt(r['visible_ms'])} {fmt(r['interactive_ms'])} "
+            f"{fmt(r['interactive_max_ms'])} {fmt(r['layout_ms'])} {fmt(r['style_ms'])} "
+            f"{fmt(r['script_ms'])} {fmt(r['nodes'])} {r['failed']:>5}"
+        )
+    print("(times are medians in ms from pointerdown; layout/style/script are main-thread ms from CDP)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=1, help="mount every widget N times")
+    parser.add_argument("--only", action="append", help="tool id(s) to benchmark (data-tool-id)")
+    parser.add_argument("--top", type=int, help="only print the N slowest widgets")
+    parser.add_argument("--timeout", type=int, default=10000, help="per-widget mount timeout in ms")
+    parser.add_argument("--json", help="write raw samples and the summary to this file")
+    parser.add_argument("--headed", action="store_true", help="show the browser")
+    args = parser.parse_args(argv)
+    tracebuffer.measuring()
+
+    samples: list[MountSample] = []
+    flow = make_flow(samples, args.only, args.repeat, args.timeout)
+    with server():
+        _, (result,) = asyncio.run(run_many([flow], headless=not args.headed))
+    if not result.passed:
+        print(f"Benchmark aborted: {result.error}", file=sys.stderr)
+
+    rows = summarize(samples)
+    print_table(rows, args.top)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"summary": rows, "samples": [asdict(s) for s in samples]}, f, indent=2)
+    return 0 if result.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,609 @@
+"""Single-pass codemods for the TSX sources.
+
+A transform is a function registered with ``@codemod`` that receives a
+``Source`` and queues edits on it. ``Source`` tokenizes the file once
+(strings, template literals, comments, regex literals, JSX tags and text)
+and records every bracket pair and JSX element, so transforms select code
+by structure instead of multi-line regexes:
+
+    @codemod("components/widgets/Breathing/BreathingWidget.tsx")
+    def breathing_controls(src):
+        controls = src.element(src.after("{/* Controls */}"))
+        src.replace(controls, NEW_CONTROLS)
+
+Lookups raise ``CodemodError`` (with ``file:line``) when a pattern is
+missing or ambiguous, and edits that overlap are rejected; nothing is
+written unless every edit of the file applies. All queued edits are applied
+in one pass over the text.
+
+Usage:
+
+    python scripts/tools/codemod.py --list
+    python scripts/tools/codemod.py breathing_controls              # dry run: unified diff
+    python scripts/tools/codemod.py feature_permissions_panels --write
+    python scripts/tools/codemod.py NAME path/to/File.tsx ...       # other files than the default
+    python scripts/tools/codemod.py control_button_sizing "components/**/*.tsx" -j 8 --write
+
+Files run on a process pool (``--jobs``, default one per CPU). A
+content-hash cache in ``scripts/tools/.cache/codemod/`` remembers which
+files a transform already left in their final state, so a re-run only
+parses files that changed since; editing the transform's module
+invalidates its cache. Writes go through a temp file and ``os.replace``.
+A per-file timing report is printed to stderr.
+"""
+import argparse
+import bisect
+import difflib
+import hashlib
+import inspect
+import json
+import importlib
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from harness import REPO_ROOT, TOOLS_DIR
+
+# Modules whose import registers transforms.
+TRANSFORM_MODULES = ("transforms",)
+CACHE_DIR = TOOLS_DIR / ".cache" / "codemod"
+
+
+class CodemodError(Exception):
+    """A pattern did not match exactly once, the source did not parse, or edits overlap."""
+
+
+@dataclass(frozen=True)
+class Span:
+    start: int
+    end: int
+
+
+@dataclass
+class Element:
+    """A JSX element: ``start`` at its ``<``, ``end`` after its closing tag or ``/>``."""
+
+    name: str
+    start: int
+    open_end: int = -1
+    end: int = -1
+
+
+@dataclass
+class _Frame:
+    kind: str  # "js", "template", "tag" or "children"
+    pos: int
+    opener: Optional[str] = None
+    element: Optional[Element] = None
+
+
+_PAIRS = {"(": ")", "[": "]", "{": "}"}
+_SKIP = {
+    "js": re.compile(r"[^'\"`/(){}\[\]<>]+"),
+    "template": re.compile(r"[^`\\$]+"),
+    "tag": re.compile(r"[^'\"{}/>]+"),
+    "children": re.compile(r"[^<{]+"),
+}
+_STRING = {"'": re.compile(r"'(?:[^'\\\n]|\\.)*'"), '"': re.compile(r'"(?:[^"\\\n]|\\.)*"')}
+_ATTR_STRING = {"'": re.compile(r"'[^']*'"), '"': re.compile(r'"[^"]*"')}
+_LINE_COMMENT = re.compile(r"//[^\n]*")
+_BLOCK_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_REGEX = re.compile(r"/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[a-z]*")
+_TAG_NAME = re.compile(r"[A-Za-z_$][\w$.:-]*")
+_GENERIC = re.compile(r"<\s*[A-Za-z_$][\w$]*\s*(?:,|extends\b)")
+_WORD_BEFORE = re.compile(r"[A-Za-z_$][\w$]*$")
+# Characters and keywords after which ``/`` starts a regex and ``<`` a JSX tag.
+_EXPRESSION_CHARS = set("(,=:?&|[{};!~+-*%^<>")
+_EXPRESSION_WORDS = {"return", "case", "default", "yield", "await", "typeof", "else", "do", "in", "of", "void"}
+
+
+class Source:
+    """A TSX file tokenized once, with structural lookups and queued edits."""
+
+    def __init__(self, text: str, path: str = "<string>", jsx: Optional[bool] = None):
+        self.text = text
+        self.path = path
+        # Plain .ts files have no JSX; there ``<T>x`` is a type assertion.
+        self.jsx = not path.endswith(".ts") if jsx is None else jsx
+        self.brackets: dict[int, int] = {}
+        self.elements: list[Element] = []
+        self.edits: list[tuple[int, int, str]] = []
+        # Spans of JSX text children and of quoted string literals in code.
+        self.texts: list[Span] = []
+        self.strings: list[Span] = []
+        self._comment_ends: dict[int, int] = {}
+        self._scan()
+
+    # -- tokenizer -------------------------------------------------------
+
+    def _scan(self):
+        text, n, i = self.text, len(self.text), 0
+        stack = [_Frame("js", -1)]
+        while i < n:
+            frame = stack[-1]
+            skip = _SKIP[frame.kind].match(text, i)
+            if skip:
+                if frame.kind == "children" and not skip.group().isspace():
+                    self.texts.append(Span(i, skip.end()))
+                i = skip.end()
+                continue
+            c = text[i]
+            if frame.kind == "js":
+                i = self._scan_js(stack, frame, c, i)
+            elif frame.kind == "template":
+                if c == "\\":
+                    i += 2
+                elif c == "`":
+                    stack.pop()
+                    i += 1
+                elif text.startswith("${", i):
+                    stack.append(_Frame("js", i + 1, "{"))
+                    i += 2
+                else:
+                    i += 1
+            elif frame.kind == "tag":
+                i = self._scan_tag(stack, frame, c, i)
+            else:
+                i = self._scan_children(stack, frame, c, i)
+        if len(stack) > 1:
+            raise self.error(stack[-1].pos, f"unclosed {stack[-1].element.name if stack[-1].element else stack[-1].opener or '`'}")
+        self.elements.sort(key=lambda el: el.start)
+        self._opens = sorted(self.brackets)
+
+    def _scan_js(self, stack, frame, c, i) -> int:
+        text = self.text
+        if c in "'\"":
+            end = self._consume(_STRING[c], i, "unterminated string")
+            self.strings.append(Span(i, end))
+            return end
+        if c == "`":
+            stack.append(_Frame("template", i))
+            return i + 1
+        if c == "/":
+            following = text[i + 1 : i + 2]
+            if following == "/" or following == "*":
+                pattern = _LINE_COMMENT if following == "/" else _BLOCK_COMMENT
+                end = self._consume(pattern, i, "unterminated comment")
+                self._comment_ends[end] = i
+                return end
+            if self._expression_position(i):
+                regex = _REGEX.match(text, i)
+                if regex:
+                    return regex.end()
+            return i + 1
+        if c in _PAIRS:
+            stack.append(_Frame("js", i, c))
+            return i + 1
+        if c in ")]}":
+            if frame.opener is None or _PAIRS[frame.opener] != c:
+                raise self.error(i, f"unbalanced {c!r}")
+            stack.pop()
+            self.brackets[frame.pos] = i
+            return i + 1
+        if c == "<" and self.jsx and self._jsx_start(i):
+            return self._open_tag(stack, i)
+        return i + 1
+
+    def _scan_tag(self, stack, frame, c, i) -> int:
+        if c in "'\"":
+            return self._consume(_ATTR_STRING[c], i, "unterminated attribute")
+        if c == "{":
+            stack.append(_Frame("js", i, "{"))
+            return i + 1
+        if c == "}":
+            raise self.error(i, "unbalanced '}' in JSX tag")
+        if self.text.startswith("/>", i):
+            frame.element.open_end = frame.element.end = i + 2
+            self.elements.append(frame.element)
+            stack.pop()
+            return i + 2
+        if c == ">":
+            frame.element.open_end = i + 1
+            stack[-1] = _Frame("children", frame.pos, element=frame.element)
+            return i + 1
+        return i + 1
+
+    def _scan_children(self, stack, frame, c, i) -> int:
+        if c == "{":
+            stack.append(_Frame("js", i, "{"))
+            return i + 1
+        if self.text.startswith("</", i):
+            close = self.text.find(">", i)
+            name = self.text[i + 2 : close].strip()
+            if close < 0 or name != frame.element.name:
+                raise self.error(i, f"</{name}> closes <{frame.element.name}> opened on line {self.line(frame.pos)}")
+            frame.element.end = close + 1
+            self.elements.append(frame.element)
+            stack.pop()
+            return close + 1
+        return self._open_tag(stack, i)
+
+    def _open_tag(self, stack, i) -> int:
+        name = _TAG_NAME.match(self.text, i + 1)
+        element = Element(name.group() if name else "", i)
+        stack.append(_Frame("tag", i, element=element))
+        pos = name.end() if name else i + 1
+        if self.text.startswith("<", pos):
+            # Type arguments, e.g. <AssignModal<ClassPickerValue> ...>
+            depth = 0
+            while pos < len(self.text):
+                depth += {"<": 1, ">": -1}.get(self.text[pos], 0)
+                pos += 1
+                if depth == 0:
+                    break
+        return pos
+
+    def _consume(self, pattern, i, message) -> int:
+        match = pattern.match(self.text, i)
+        if not match:
+            raise self.error(i, message)
+        return match.end()
+
+    def _expression_position(self, i) -> bool:
+        """Whether an operand (not an operator) is expected at ``i``."""
+        text, j = self.text, i
+        while True:
+            j -= 1
+            while j >= 0 and text[j] in " \t\r\n":
+                j -= 1
+            if j + 1 not in self._comment_ends:
+                break
+            j = self._comment_ends[j + 1]
+        if j < 0:
+            return True
+        if text[j] in _EXPRESSION_CHARS:
+            # ``a > <b/>`` never occurs; ``=> <div>`` does.
+            return text[j] != ">" or text[j - 1] == "="
+        word = _WORD_BEFORE.search(text, max(0, j - 11), j + 1)
+        return bool(word) and word.group() in _EXPRESSION_WORDS
+
+    def _jsx_start(self, i) -> bool:
+        following = self.text[i + 1 : i + 2]
+        if not (following.isalpha() or following in ("_", "$", ">")):
+            return False
+        if _GENERIC.match(self.text, i):
+            return False
+        return self._expression_position(i)
+
+    # -- lookups ---------------------------------------------------------
+
+    def line(self, pos: int) -> int:
+        return self.text.count("\n", 0, pos) + 1
+
+    def error(self, pos: int, message: str) -> CodemodError:
+        return CodemodError(f"{self.path}:{self.line(max(pos, 0))}: {message}")
+
+    def find(self, needle: str, start: int = 0, end: Optional[int] = None) -> int:
+        """Offset of the only occurrence of ``needle`` in ``[start, end)``."""
+        end = len(self.text) if end is None else end
+        first = self.text.find(needle, start, end)
+        if first < 0:
+            raise self.error(start, f"pattern not found: {needle!r}")
+        second = self.text.find(needle, first + 1, end)
+        if second >= 0:
+            raise self.error(second, f"pattern is ambiguous (also on line {self.line(first)}): {needle!r}")
+        return first
+
+    def after(self, needle: str, start: int = 0, end: Optional[int] = None) -> int:
+        return self.find(needle, start, end) + len(needle)
+
+    def block(self, start: int, opener: str = "{") -> Span:
+        """The first ``opener`` bracket at or after ``start``, through its match."""
+        pos = start
+        while True:
+            pos = self.text.find(opener, pos)
+            if pos < 0:
+                raise self.error(start, f"no {opener!r} block after this point")
+            if pos in self.brackets:
+                return Span(pos, self.brackets[pos] + 1)
+            pos += 1
+
+    def element(self, start: int, name: Optional[str] = None) -> Span:
+        """The first JSX element (optionally named ``name``) starting at or after ``start``."""
+        for el in self.elements:
+            if el.start >= start and (name is None or el.name == name):
+                return Span(el.start, el.end)
+        raise self.error(start, f"no <{name or 'element'}> after this point")
+
+    def const(self, name: str) -> Span:
+        """A ``const name = (...) => { ... };`` declaration (also ``async``)."""
+        pattern = re.compile(rf"\bconst {re.escape(name)}\s*=\s*(?:async\s*)?\(")
+        matches = [m for m in pattern.finditer(self.text) if m.end() - 1 in self.brackets]
+        if len(matches) != 1:
+            raise self.error(matches[1].start() if matches else 0, f"{len(matches)} declarations of const {name}")
+        params_end = self.brackets[matches[0].end() - 1] + 1
+        arrow = self.text.find("=>", params_end)
+        body = len(self.text) - len(self.text[arrow + 2 :].lstrip())
+        if arrow < 0 or self.text[body] not in "{(" or body not in self.brackets:
+            raise self.error(matches[0].start(), f"const {name} is not an arrow function with a block body")
+        end = self.brackets[body] + 1
+        if self.text.startswith(";", end):
+            end += 1
+        return Span(matches[0].start(), end)
+
+    def elements_named(self, name: str) -> list[Element]:
+        return [el for el in self.elements if el.name == name]
+
+    def attribute(self, element: Element, name: str) -> Optional[Span]:
+        """The value (quotes or braces included) of JSX attribute ``name`` on ``element``."""
+        pattern = re.compile(rf"\s{re.escape(name)}=")
+        nested = [
+            (o, self.brackets[o])
+            for o in self._opens[bisect.bisect_right(self._opens, element.start) : bisect.bisect_left(self._opens, element.open_end)]
+        ]
+        for match in pattern.finditer(self.text, element.start, element.open_end):
+            if any(o < match.start() < c for o, c in nested):
+                continue
+            pos = match.end()
+            if self.text[pos] == "{":
+                return Span(pos, self.brackets[pos] + 1)
+            return Span(pos, self.text.index(self.text[pos], pos + 1) + 1)
+        return None
+
+    def line_of(self, needle: str) -> Span:
+        """The whole line containing the only occurrence of ``needle``."""
+        return self.lines(Span(self.find(needle), self.find(needle) + len(needle)), blank=False)
+
+    def lines(self, span: Span, blank: bool = True) -> Span:
+        """``span`` widened to whole lines, plus one following blank line if ``blank``."""
+        start = self.text.rfind("\n", 0, span.start) + 1
+        end = self.text.find("\n", span.end)
+        end = len(self.text) if end < 0 else end + 1
+        if blank and self.text.startswith("\n", end):
+            end += 1
+        return Span(start, end)
+
+    def source(self, span: Span) -> str:
+        return self.text[span.start : span.end]
+
+    # -- edits -----------------------------------------------------------
+
+    def replace(self, span: Span, text: str):
+        self.edits.append((span.start, span.end, text))
+
+    def delete(self, span: Span, lines: bool = True):
+        self.replace(self.lines(span) if lines else span, "")
+
+    def insert(self, pos: int, text: str):
+        self.edits.append((pos, pos, text))
+
+    def render(self) -> str:
+        """The text with every queued edit applied, in a single pass."""
+        out, pos = [], 0
+        for start, end, text in sorted(self.edits, key=lambda e: (e[0], e[1])):
+            if start < pos:
+                raise self.error(start, "overlapping edits")
+            out.append(self.text[pos:start])
+            out.append(text)
+            pos = end
+        out.append(self.text[pos:])
+        return "".join(out)
+
+
+@dataclass(frozen=True)
+class Transform:
+    name: str
+    func: Callable[[Source], None]
+    paths: tuple[str, ...]
+
+
+_REGISTRY: dict[str, Transform] = {}
+
+
+def codemod(*paths: str, name: Optional[str] = None):
+    """Register ``func(src)`` as a transform over ``paths`` (globs relative to the repo root)."""
+
+    def register(func):
+        _REGISTRY[name or func.__name__] = Transform(name or func.__name__, func, paths)
+        return func
+
+    return register
+
+
+def discover() -> dict[str, Transform]:
+    if str(TOOLS_DIR) not in sys.path:
+        sys.path.insert(0, str(TOOLS_DIR))
+    for module in TRANSFORM_MODULES:
+        importlib.import_module(module)
+    # Transforms register with the importable ``codemod`` module, which is not
+    # this one when the file runs as __main__.
+    return dict(importlib.import_module("codemod")._REGISTRY)
+
+
+def expand(paths) -> list[Path]:
+    files = []
+    for pattern in paths:
+        matches = sorted(REPO_ROOT.glob(pattern)) if any(ch in pattern for ch in "*?[") else [REPO_ROOT / pattern]
+        files.extend(matches)
+    return list(dict.fromkeys(files))
+
+
+def write_atomic(path: Path, text: str):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+def digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+@dataclass
+class Result:
+    path: Path
+    changed: bool = False
+    diff: str = ""
+    error: Optional[str] = None
+    seconds: float = 0.0
+    edits: int = 0
+    cached: bool = False
+    # Content hash of the file once this run is done with it (None if unknown).
+    final: Optional[str] = None
+
+
+def apply(transform: Transform, path: Path, write: bool = False) -> Result:
+    """Run ``transform`` on ``path``; write the file only if ``write`` and every edit applied."""
+    start = time.perf_counter()
+    result = Result(path)
+    try:
+        original = path.read_text()
+        src = Source(original, str(path.relative_to(REPO_ROOT) if path.is_relative_to(REPO_ROOT) else path))
+        transform.func(src)
+        updated = src.render()
+        result.edits = len(src.edits)
+        result.changed = updated != original
+        if result.changed:
+            result.diff = "".join(
+                difflib.unified_diff(
+                    original.splitlines(keepends=True),
+                    updated.splitlines(keepends=True),
+                    f"a/{src.path}",
+                    f"b/{src.path}",
+                )
+            )
+            if write:
+                write_atomic(path, updated)
+                result.final = digest(updated)
+        else:
+            result.final = digest(original)
+    except (CodemodError, OSError) as e:
+        result.error = str(e)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _apply_named(name: str, path: Path, write: bool) -> Result:
+    """Process-pool entry point: transforms are looked up again in the worker."""
+    return apply(discover()[name], path, write)
+
+
+class Cache:
+    """Content hashes of files a transform has already left in their final state.
+
+    Keyed by repo-relative path; invalidated as a whole when the transform's
+    module or this engine changes.
+    """
+
+    def __init__(self, transform: Transform):
+        self.path = CACHE_DIR / f"{transform.name}.json"
+        self.version = digest(Path(inspect.getsourcefile(transform.func)).read_text() + Path(__file__).read_text())
+        self.files: dict[str, str] = {}
+        if self.path.exists():
+            data = json.loads(self.path.read_text())
+            if data.get("version") == self.version:
+                self.files = data["files"]
+
+    def done(self, path: Path, text_digest: str) -> bool:
+        return self.files.get(str(path.relative_to(REPO_ROOT))) == text_digest
+
+    def record(self, result: Result):
+        if result.final is not None:
+            self.files[str(result.path.relative_to(REPO_ROOT))] = result.final
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, json.dumps({"version": self.version, "files": self.files}, indent=1))
+
+
+def run_batch(transform: Transform, files: list[Path], jobs: int = 1, write: bool = False, cache: bool = True) -> list[Result]:
+    """Apply ``transform`` to ``files`` on ``jobs`` processes, skipping files the cache marks done."""
+    store = Cache(transform) if cache else None
+    results: dict[Path, Result] = {}
+    todo = []
+    for path in files:
+        if store is not None and path.exists() and store.done(path, digest(path.read_text())):
+            results[path] = Result(path, cached=True)
+        else:
+            todo.append(path)
+
+    if jobs > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(todo))) as executor:
+            chunk = max(1, len(todo) // (jobs * 4))
+            done = executor.map(_apply_named, [transform.name] * len(todo), todo, [write] * len(todo), chunksize=chunk)
+            results.update((r.path, r) for r in done)
+    else:
+        results.update((path, apply(transform, path, write)) for path in todo)
+
+    if store is not None:
+        for path in todo:
+            store.record(results[path])
+        store.save()
+    return [results[path] for path in files]
+
+
+def print_report(results: list[Result], wall: float, jobs: int, top: int = 10):
+    ran = [r for r in results if not r.cached]
+    if ran and top:
+        print(f"{'Time':>8} {'Edits':>5}  File", file=sys.stderr)
+        for r in sorted(ran, key=lambda r: r.seconds, reverse=True)[:top]:
+            status = "ERROR" if r.error else ("changed" if r.changed else "")
+            print(f"{r.seconds * 1000:>6.1f}ms {r.edits:>5}  {r.path.relative_to(REPO_ROOT)} {status}", file=sys.stderr)
+    changed = sum(r.changed for r in results)
+    errors = sum(r.error is not None for r in results)
+    cached = sum(r.cached for r in results)
+    busy = sum(r.seconds for r in ran)
+    print(
+        f"{len(results)} files: {changed} changed, {len(ran) - changed - errors} unchanged, "
+        f"{cached} skipped (cached), {errors} errors in {wall:.2f}s "
+        f"({busy:.2f}s of transform time on {jobs} process(es))",
+        file=sys.stderr,
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("transform", nargs="?", help="registered transform name")
+    parser.add_argument("files", nargs="*", help="files or globs (default: the transform's own)")
+    parser.add_argument("--list", action="store_true", help="list transforms and exit")
+    parser.add_argument("--write", action="store_true", help="write changes (default: print a diff)")
+    parser.add_argument("--jobs", "-j", type=int, default=0, help="worker processes (default: one per CPU)")
+    parser.add_argument("--no-cache", action="store_true", help="re-run files the cache marks as done")
+    parser.add_argument("--top", type=int, default=10, help="slowest files to list in the report")
+    parser.add_argument("--report", help="also write per-file results to this JSON file")
+    args = parser.parse_args(argv)
+
+    transforms = discover()
+    if args.list or not args.transform:
+        for t in transforms.values():
+            print(f"{t.name:<32} {', '.join(t.paths)}")
+        return 0
+    if args.transform not in transforms:
+        print(f"Unknown transform: {args.transform}", file=sys.stderr)
+        return 2
+
+    transform = transforms[args.transform]
+    files = expand(args.files or transform.paths)
+    jobs = args.jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    results = run_batch(transform, files, jobs, write=args.write, cache=not args.no_cache)
+    wall = time.perf_counter() - start
+
+    for result in results:
+        if result.error:
+            print(f"ERROR {result.error}", file=sys.stderr)
+        elif result.changed and not args.write:
+            sys.stdout.write(result.diff)
+        elif result.changed:
+            print(f"rewrote {result.path.relative_to(REPO_ROOT)} ({result.edits} edits)")
+    print_report(results, wall, jobs, args.top)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(
+                [
+                    {"path": str(r.path.relative_to(REPO_ROOT)), "changed": r.changed, "cached": r.cached,
+                     "edits": r.edits, "seconds": r.seconds, "error": r.error}
+                    for r in results
+                ],
+                f,
+                indent=2,
+            )
+    return 1 if any(r.error for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
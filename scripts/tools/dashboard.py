@@ -0,0 +1,71 @@
+"""Dock and widget helpers shared by the benchmark and profiling tools."""
+from readiness import SETTINGS_PANEL, wait_for_animations, wait_for_dock_expanded, wait_for_settings_panel
+
+DOCK_TOOL = '[data-testid="dock"] button[data-tool-id]'
+WIDGET = ".widget[data-widget-id]"
+
+
+async def open_dock(page):
+    """Expand the dock if it is collapsed and return its locator."""
+    dock = page.locator('[data-testid="dock"]')
+    if await dock.get_attribute("data-expanded") != "true":
+        await page.get_by_title("Open Tools").click()
+    return await wait_for_dock_expanded(page)
+
+
+async def dock_tool_ids(page) -> list[str]:
+    """Return the ``data-tool-id`` of every tool button in the dock, in dock order."""
+    return await page.eval_on_selector_all(DOCK_TOOL, "els => els.map((el) => el.dataset.toolId)")
+
+
+async def widget_ids(page) -> list[str]:
+    return await page.eval_on_selector_all(WIDGET, "els => els.map((el) => el.dataset.widgetId)")
+
+
+async def add_widget(page, tool_id: str, timeout: int = 10000):
+    """Click ``tool_id`` in the dock and return the locator of the widget it adds."""
+    before = set(await widget_ids(page))
+    await page.locator(f'{DOCK_TOOL}[data-tool-id="{tool_id}"]').click(force=True)
+    handle = await page.wait_for_function(
+        """(known) => [...document.querySelectorAll('.widget[data-widget-id]')]
+            .map((el) => el.dataset.widgetId)
+            .find((id) => !known.includes(id))""",
+        arg=sorted(before),
+        timeout=timeout,
+    )
+    widget_id = await handle.json_value()
+    return page.locator(f'.widget[data-widget-id="{widget_id}"]')
+
+
+async def remove_widget(page, widget, timeout: int = 10000):
+    """Delete ``widget`` the way a teacher would: Delete key, then confirm if asked."""
+    widget_id = await widget.get_attribute("data-widget-id")
+    await widget.focus()
+    await page.keyboard.press("Delete")
+    outcome = await page.wait_for_function(
+        """(id) => {
+            const el = document.querySelector(`.widget[data-widget-id="${id}"]`);
+            if (!el) return 'removed';
+            return el.querySelector('[role="alertdialog"]') ? 'confirm' : false;
+        }""",
+        arg=widget_id,
+        timeout=timeout,
+    )
+    if await outcome.json_value() == "confirm":
+        await widget.get_by_role("alertdialog").get_by_role("button").last.click()
+        await widget.wait_for(state="detached", timeout=timeout)
+
+
+async def remove_all_widgets(page, timeout: int = 10000):
+    for widget_id in await widget_ids(page):
+        widget = page.locator(f'.widget[data-widget-id="{widget_id}"]')
+        await remove_widget(page, widget, timeout)
+    await wait_for_animations(page, timeout)
+
+
+async def set_settings_open(page, widget, open: bool = True):
+    """Flip ``widget`` to its settings side (or back) with the Alt+S shortcut."""
+    if (await page.locator(SETTINGS_PANEL).count() > 0) != open:
+        await widget.focus()
+        await page.keyboard.press("Alt+s")
+    return await wait_for_settings_panel(page, open=open)
@@ -0,0 +1,154 @@
+"""Named device profiles: run the flows the way the classroom hardware would.
+
+A profile sets the context's viewport, device scale factor, touch support
+and ``prefers-reduced-motion``, and per page the CDP CPU slowdown
+(``Emulation.setCPUThrottlingRate``) and network conditions
+(``Network.emulateNetworkConditions``). The active profile comes from
+``TOOLS_DEVICE`` (``run_flows.py --device``), so spawned workers inherit it,
+and is written into every step timing so runs can be compared per profile.
+
+CPU rates slow down the machine running the flows, so absolute numbers are
+only comparable between runs on the same machine; the side-by-side ratios
+are what to look at.
+
+Usage:
+
+    python scripts/tools/devices.py                          # list profiles
+    python scripts/tools/run_flows.py --device chromebook --device smartboard --repeat 5
+    python scripts/tools/timing_report.py --compare-devices
+"""
+import argparse
+import os
+import sys
+import weakref
+from dataclasses import dataclass
+from typing import Optional
+
+from harness import VIEWPORT
+
+DEFAULT = "desktop"
+
+
+@dataclass(frozen=True)
+class Network:
+    latency_ms: float
+    download_kbps: float
+    upload_kbps: float
+
+
+@dataclass(frozen=True)
+class Profile:
+    name: str
+    description: str
+    viewport: dict
+    device_scale_factor: float = 1
+    cpu_throttle: float = 1
+    network: Optional[Network] = None
+    has_touch: bool = False
+    reduced_motion: bool = False
+
+    def context_options(self) -> dict:
+        return {
+            "viewport": self.viewport,
+            "device_scale_factor": self.device_scale_factor,
+            "has_touch": self.has_touch,
+            "reduced_motion": "reduce" if self.reduced_motion else "no-preference",
+        }
+
+
+# Throughput in kbit/s, as in the DevTools network presets.
+SCHOOL_WIFI = Network(latency_ms=40, download_kbps=20_000, upload_kbps=5_000)
+CONGESTED_WIFI = Network(latency_ms=150, download_kbps=1_600, upload_kbps=750)
+
+PROFILES = {
+    p.name: p
+    for p in (
+        Profile("desktop", "developer machine, no throttling", VIEWPORT),
+        Profile(
+            "chromebook",
+            "student Chromebook: 1366x768, 4x slower CPU, school Wi-Fi",
+            {"width": 1366, "height": 768},
+            cpu_throttle=4,
+            network=SCHOOL_WIFI,
+            has_touch=True,
+        ),
+        Profile(
+            "chromebook-low",
+            "older Chromebook on a busy network: 6x slower CPU, congested Wi-Fi",
+            {"width": 1366, "height": 768},
+            cpu_throttle=6,
+            network=CONGESTED_WIFI,
+            has_touch=True,
+        ),
+        Profile(
+            "smartboard",
+            "interactive display's built-in browser: 1080p at DPR 2, 6x slower CPU, touch",
+            {"width": 1920, "height": 1080},
+            device_scale_factor=2,
+            cpu_throttle=6,
+            network=SCHOOL_WIFI,
+            has_touch=True,
+        ),
+        Profile(
+            "smartboard-reduced-motion",
+            "smartboard with the OS reduced-motion setting on",
+            {"width": 1920, "height": 1080},
+            device_scale_factor=2,
+            cpu_throttle=6,
+            network=SCHOOL_WIFI,
+            has_touch=True,
+            reduced_motion=True,
+        ),
+    )
+}
+
+
+# Overrides last only as long as their CDP session; keep it with the page.
+_sessions: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def current() -> Profile:
+    name = os.environ.get("TOOLS_DEVICE", DEFAULT)
+    if name not in PROFILES:
+        raise ValueError(f"TOOLS_DEVICE must be one of {', '.join(PROFILES)}, not {name!r}")
+    return PROFILES[name]
+
+
+async def apply(page, profile: Optional[Profile] = None):
+    """Throttle ``page``'s CPU and network to ``profile`` (default: the active one)."""
+    profile = profile or current()
+    if profile.cpu_throttle <= 1 and profile.network is None:
+        return
+    cdp = _sessions[page] = await page.context.new_cdp_session(page)
+    if profile.cpu_throttle > 1:
+        await cdp.send("Emulation.setCPUThrottlingRate", {"rate": profile.cpu_throttle})
+    if profile.network:
+        await cdp.send("Network.enable")
+        await cdp.send(
+            "Network.emulateNetworkConditions",
+            {
+                "offline": False,
+                "latency": profile.network.latency_ms,
+                # CDP wants bytes per second.
+                "downloadThroughput": profile.network.download_kbps * 1000 / 8,
+                "uploadThroughput": profile.network.upload_kbps * 1000 / 8,
+            },
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args(argv)
+    print(f"{'Profile':<26} {'viewport':<10} {'DPR':>3} {'CPU':>4} {'RTT':>6} {'down':>9}  description")
+    for p in PROFILES.values():
+        network = p.network
+        print(
+            f"{p.name:<26} {'{width}x{height}'.format(**p.viewport):<10} {p.device_scale_factor:>3g} "
+            f"{p.cpu_throttle:>3g}x {(f'{network.latency_ms:g}ms' if network else '-'):>6} "
+            f"{(f'{network.download_kbps / 1000:g}Mbit/s' if network else '-'):>9}  {p.description}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,318 @@
+"""Managed app server for the flows, like the ``webServer`` block in playwright.config.ts.
+
+``server()`` makes sure something healthy is answering on ``BASE_URL``:
+
+* ``auto`` (default) - attach to a server that is already up, otherwise
+  serve a cached production build with ``pnpm run preview``,
+* ``attach`` - only attach; fail fast if nothing is listening,
+* ``dev`` - like ``auto`` but start ``pnpm dev`` (no build, slower first
+  load, hot reload).
+
+A preview server this module left running is restarted when its build is
+stale; servers started by anything else are used as they are.
+
+The build lives in ``scripts/tools/.cache/server/dist`` and is only redone
+when a source file, the lockfile or the ``VITE_*`` environment changed since
+the last build; ``dist/`` in the repo is never touched. The server gets the
+same environment as the Playwright config: the real Firebase settings when
+all six are set, ``dummy`` otherwise, and ``VITE_AUTH_BYPASS=true``.
+Readiness is polled over HTTP rather than slept for.
+
+run_flows.py starts one server before spawning workers, so every flow and
+worker shares it. ``--keep-server`` leaves it running for the next
+invocation, which attaches in milliseconds.
+
+Usage:
+
+    python scripts/tools/devserver.py start      # build if needed, serve, leave running
+    python scripts/tools/devserver.py status
+    python scripts/tools/devserver.py stop
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Optional
+from urllib.parse import urlsplit
+
+from harness import BASE_URL, REPO_ROOT, TOOLS_DIR
+
+MODES = ("auto", "attach", "dev")
+SERVER_DIR = TOOLS_DIR / ".cache" / "server"
+BUILD_DIR = SERVER_DIR / "dist"
+STATE_PATH = SERVER_DIR / "server.json"
+LOG_PATH = SERVER_DIR / "server.log"
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "0.0.0.0", "::1"}
+# Same as WEBSERVER_TIMEOUT in playwright.config.ts.
+TIMEOUT = 120
+
+# Inputs of `vite build`; anything else (scripts, tests, docs, functions/)
+# does not change the bundle.
+SOURCES = (
+    "App.tsx", "index.tsx", "index.html", "index.css", "types.ts",
+    "components", "config", "context", "hooks", "i18n", "locales", "public", "types", "utils",
+    "package.json", "pnpm-lock.yaml", "vite.config.ts", "tailwind.config.js", "postcss.config.js", "tsconfig.json",
+)
+# Rewritten by scripts/generate-version.js on every build.
+GENERATED = {"public/version.json"}
+
+FIREBASE_ENV = (
+    "VITE_FIREBASE_API_KEY",
+    "VITE_FIREBASE_AUTH_DOMAIN",
+    "VITE_FIREBASE_PROJECT_ID",
+    "VITE_FIREBASE_STORAGE_BUCKET",
+    "VITE_FIREBASE_MESSAGING_SENDER_ID",
+    "VITE_FIREBASE_APP_ID",
+)
+OPTIONAL_ENV = ("VITE_GOOGLE_CLIENT_ID", "VITE_GEMINI_API_KEY", "VITE_OPENWEATHER_API_KEY")
+
+
+class ServerError(RuntimeError):
+    """The app server could not be reached or started."""
+
+
+def app_env() -> dict[str, str]:
+    """The ``VITE_*`` variables playwright.config.ts gives its web server."""
+    real_firebase = all(os.environ.get(name) for name in FIREBASE_ENV)
+    env = {name: os.environ[name] if real_firebase else "dummy" for name in FIREBASE_ENV}
+    env.update({name: os.environ.get(name) or "dummy" for name in OPTIONAL_ENV})
+    env["VITE_AUTH_BYPASS"] = "true"
+    return env
+
+
+def source_digest() -> str:
+    """Hash of every build input's path, size and mtime, plus the app env."""
+    h = hashlib.sha256(json.dumps(app_env(), sort_keys=True).encode())
+    for name in SOURCES:
+        root = REPO_ROOT / name
+        paths = [root] if root.is_file() else sorted(p for p in root.rglob("*") if p.is_file()) if root.exists() else []
+        for path in paths:
+            rel = path.relative_to(REPO_ROOT).as_posix()
+            if rel in GENERATED:
+                continue
+            stat = path.stat()
+            h.update(f"{rel}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return h.hexdigest()[:16]
+
+
+def healthy(url: str = BASE_URL, timeout: float = 1.0) -> bool:
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            return resp.status < 500
+    except OSError:
+        return False
+
+
+def load_state() -> Optional[dict]:
+    try:
+        return json.loads(STATE_PATH.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+# Servers launched by this process, so stop() can reap them.
+_children: dict[int, subprocess.Popen] = {}
+
+
+def _alive(pid: int) -> bool:
+    try:
+        # Our own exited child is a zombie until reaped; kill(pid, 0) would still see it.
+        if os.waitpid(pid, os.WNOHANG)[0] == pid:
+            return False
+    except ChildProcessError:
+        pass  # Not our child (a kept server from an earlier run).
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def stop(state: Optional[dict] = None):
+    """Stop a server this module started (its whole process group)."""
+    state = state or load_state()
+    process = _children.pop(state["pid"], None) if state else None
+    if state and (process.poll() is None if process else _alive(state["pid"])):
+        try:
+            os.killpg(state["pid"], signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        if process:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                os.killpg(state["pid"], signal.SIGKILL)
+                process.wait()
+        else:
+            deadline = time.monotonic() + 10
+            while _alive(state["pid"]) and time.monotonic() < deadline:
+                time.sleep(0.1)
+            if _alive(state["pid"]):
+                os.killpg(state["pid"], signal.SIGKILL)
+    STATE_PATH.unlink(missing_ok=True)
+
+
+def _pnpm(*args) -> list[str]:
+    pnpm = shutil.which("pnpm")
+    if pnpm is None:
+        raise ServerError("pnpm is not on PATH; start the app yourself and use --server attach")
+    return [pnpm, *args]
+
+
+def build(digest: str) -> float:
+    """``pnpm run build`` into the cache unless it is already built from ``digest``."""
+    stamp = BUILD_DIR / ".digest"
+    if stamp.exists() and stamp.read_text() == digest:
+        return 0.0
+    command = _pnpm("run", "build", "--outDir", str(BUILD_DIR), "--emptyOutDir")
+    start = time.perf_counter()
+    print(f"Building the app into {BUILD_DIR.relative_to(REPO_ROOT)} ...", flush=True)
+    SERVER_DIR.mkdir(parents=True, exist_ok=True)
+    with open(LOG_PATH, "w") as log:
+        done = subprocess.run(
+            command,
+            cwd=REPO_ROOT,
+            env={**os.environ, **app_env()},
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+    if done.returncode != 0:
+        raise ServerError(f"pnpm run build failed (exit {done.returncode}):\n{_log_tail()}")
+    stamp.write_text(digest)
+    return time.perf_counter() - start
+
+
+def _log_tail(lines: int = 20) -> str:
+    try:
+        return "\n".join(LOG_PATH.read_text(errors="replace").splitlines()[-lines:])
+    except OSError:
+        return ""
+
+
+def launch(mode: str, digest: Optional[str], timeout: float = TIMEOUT) -> dict:
+    """Start ``pnpm run preview`` (or ``pnpm dev``) and poll until it answers."""
+    port = str(urlsplit(BASE_URL).port or 3000)
+    if mode == "dev":
+        command = _pnpm("dev", "--port", port, "--strictPort")
+    else:
+        command = _pnpm("run", "preview", "--outDir", str(BUILD_DIR), "--port", port, "--strictPort")
+    SERVER_DIR.mkdir(parents=True, exist_ok=True)
+    with open(LOG_PATH, "a") as log:
+        # Own process group so stop() also takes down vite behind pnpm.
+        process = subprocess.Popen(
+            command,
+            cwd=REPO_ROOT,
+            env={**os.environ, **app_env()},
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    _children[process.pid] = process
+    state = {"pid": process.pid, "url": BASE_URL, "mode": mode, "digest": digest, "started": time.time()}
+
+    start = time.monotonic()
+    delay = 0.05
+    while not healthy(timeout=0.5):
+        if process.poll() is not None:
+            raise ServerError(f"{' '.join(command[1:])} exited with {process.returncode}:\n{_log_tail()}")
+        if time.monotonic() - start > timeout:
+            stop(state)
+            raise ServerError(f"{BASE_URL} did not answer within {timeout:.0f}s:\n{_log_tail()}")
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+    STATE_PATH.write_text(json.dumps(state))
+    return state
+
+
+@contextmanager
+def server(mode: str = "auto", keep: bool = False, timeout: float = TIMEOUT):
+    """Yield the base URL with a healthy app behind it.
+
+    A server started here is stopped on exit unless ``keep``; one that was
+    already running (ours from an earlier ``keep``, or anyone else's) is
+    left alone.
+    """
+    if mode not in MODES:
+        raise ValueError(f"server mode must be one of {', '.join(MODES)}, not {mode!r}")
+    if urlsplit(BASE_URL).hostname not in LOCAL_HOSTS:
+        # A remote PLAYWRIGHT_BASE_URL is somebody else's deployment.
+        mode = "attach"
+    start = time.perf_counter()
+    state = load_state()
+    if state and not _alive(state["pid"]):
+        STATE_PATH.unlink(missing_ok=True)
+        state = None
+
+    digest = source_digest() if mode == "auto" else None
+    if state and digest and state["mode"] == "preview" and state.get("digest") != digest:
+        # Our kept server is serving an outdated build.
+        print("Sources changed since the kept server was built; restarting it", flush=True)
+        stop(state)
+        state = None
+
+    if healthy():
+        print(f"Using the app already running on {BASE_URL}", flush=True)
+        yield BASE_URL
+        return
+    if mode == "attach":
+        raise ServerError(f"Nothing is answering on {BASE_URL}")
+    if state:
+        # Ours, alive but not answering: start over.
+        stop(state)
+
+    built = build(digest) if mode == "auto" else 0.0
+    state = launch("dev" if mode == "dev" else "preview", digest, timeout)
+    took = time.perf_counter() - start
+    print(
+        f"Started {state['mode']} server on {BASE_URL} (pid {state['pid']}) in {took:.1f}s"
+        + (f", {built:.1f}s of it building" if built else ""),
+        flush=True,
+    )
+    try:
+        yield BASE_URL
+    finally:
+        if not keep:
+            stop(state)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    start = sub.add_parser("start", help="build if needed and leave a server running")
+    start.add_argument("--mode", choices=MODES, default="auto")
+    sub.add_parser("stop", help="stop the server started by start or --keep-server")
+    sub.add_parser("status", help="is the app up, and is the cached build current?")
+    args = parser.parse_args(argv)
+
+    if args.command == "start":
+        try:
+            with server(args.mode, keep=True):
+                pass
+        except ServerError as e:
+            print(e, file=sys.stderr)
+            return 1
+    elif args.command == "stop":
+        stop()
+    else:
+        state = load_state()
+        stamp = BUILD_DIR / ".digest"
+        current = stamp.exists() and stamp.read_text() == source_digest()
+        print(f"{BASE_URL}: {'up' if healthy() else 'down'}")
+        if state and _alive(state["pid"]):
+            print(f"Managed {state['mode']} server, pid {state['pid']}")
+        print(f"Cached build: {'current' if current else 'stale or missing'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+"""One-file diagnostics bundle for a page: where did the time go?
+
+``async with capture(page, "debug_landing") as path:`` wraps the part of a
+flow to diagnose. The bundle is a gzip-compressed JSONL stream, one record
+per line with a ``type`` field, written as events arrive rather than
+buffered:
+
+* ``console`` / ``pageerror`` - every console message and uncaught error,
+* ``request`` - one HAR 1.2 ``entry`` per finished or failed request,
+  including the phase timings (dns, connect, ssl, send, wait, receive),
+* ``navigation`` / ``resource`` - Navigation and Resource Timing entries,
+* ``vitals`` - LCP, CLS (largest session window) and INP-style worst
+  interaction latency, observed from before the first navigation,
+* ``heap`` - JS heap used/total from CDP,
+* ``dom`` - the full serialized HTML plus an ``inventory.py`` snapshot.
+
+Usage:
+
+    python scripts/tools/debug_landing.py                     # writes test-results/tools/diagnostics/
+    python scripts/tools/diagnostics.py summary BUNDLE.jsonl.gz
+    python scripts/tools/diagnostics.py har BUNDLE.jsonl.gz landing.har   # open in DevTools
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from harness import ARTIFACT_DIR, RUN_ID, worker_id
+from inventory import Inventory
+
+DIAGNOSTICS_DIR = ARTIFACT_DIR / "diagnostics"
+
+# Installed with add_init_script so buffered entries from the very first
+# paint are seen. CLS uses the web-vitals session-window definition; INP is
+# approximated by the slowest interaction (event entries with an
+# interactionId), which is exact for fewer than 50 interactions.
+_VITALS_JS = """
+(() => {
+  const vitals = (window.__flowVitals = { lcp: null, lcpElement: null, cls: 0, inp: null, interactions: 0 });
+  const observe = (type, callback, extra = {}) => {
+    try {
+      new PerformanceObserver((list) => list.getEntries().forEach(callback))
+        .observe({ type, buffered: true, ...extra });
+    } catch (e) {
+      // Entry type unsupported in this browser.
+    }
+  };
+  observe('largest-contentful-paint', (e) => {
+    vitals.lcp = e.startTime;
+    vitals.lcpElement = e.element ? e.element.tagName.toLowerCase() + (e.element.className ? '.' + String(e.element.className).split(' ')[0] : '') : null;
+  });
+  let session = 0, first = 0, last = 0;
+  observe('layout-shift', (e) => {
+    if (e.hadRecentInput) return;
+    if (session && e.startTime - last < 1000 && e.startTime - first < 5000) {
+      session += e.value;
+    } else {
+      session = e.value;
+      first = e.startTime;
+    }
+    last = e.startTime;
+    vitals.cls = Math.max(vitals.cls, session);
+  });
+  observe('event', (e) => {
+    if (!e.interactionId) return;
+    vitals.interactions += 1;
+    vitals.inp = Math.max(vitals.inp ?? 0, e.duration);
+  }, { durationThreshold: 16 });
+})();
+"""
+
+_TIMING_JS = """
+() => ({
+  navigation: performance.getEntriesByType('navigation').map((e) => e.toJSON()),
+  resource: performance.getEntriesByType('resource').map((e) => e.toJSON()),
+  paint: performance.getEntriesByType('paint').map((e) => e.toJSON()),
+  vitals: window.__flowVitals || null,
+})
+"""
+
+
+class Bundle:
+    """Append-only gzip JSONL writer; records are compressed to disk as they arrive."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+
+    def write(self, kind: str, data):
+        self._file.write(json.dumps({"type": kind, "time": time.time(), "data": data}) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+def _ms(start: float, end: float) -> float:
+    """Duration between two Playwright timing marks (-1 when the phase did not happen)."""
+    return end - start if start >= 0 and end >= 0 else -1
+
+
+def har_entry(request, response, failure=None) -> dict:
+    """A HAR 1.2 entry built from Playwright's request timing."""
+    t = request.timing
+    timings = {
+        "blocked": -1,
+        "dns": _ms(t["domainLookupStart"], t["domainLookupEnd"]),
+        "connect": _ms(t["connectStart"], t["connectEnd"]),
+        "ssl": _ms(t["secureConnectionStart"], t["connectEnd"]),
+        "send": 0,
+        "wait": _ms(t["requestStart"], t["responseStart"]),
+        "receive": _ms(t["responseStart"], t["responseEnd"]),
+    }
+    total = sum(v for k, v in timings.items() if v > 0 and k != "ssl")
+    headers = lambda h: [{"name": k, "value": v} for k, v in h.items()]  # noqa: E731
+    return {
+        "startedDateTime": datetime.fromtimestamp(t["startTime"] / 1000, timezone.utc).isoformat(),
+        "time": total,
+        "request": {
+            "method": request.method,
+            "url": request.url,
+            "httpVersion": "HTTP/1.1",
+            "headers": headers(request.headers),
+            "queryString": [],
+            "cookies": [],
+            "headersSize": -1,
+            "bodySize": len(request.post_data_buffer or b""),
+        },
+        "response": {
+            "status": response.status if response else 0,
+            "statusText": (response.status_text if response else failure) or "",
+            "httpVersion": "HTTP/1.1",
+            "headers": headers(response.headers) if response else [],
+            "cookies": [],
+            "content": {"size": -1, "mimeType": (response.headers.get("content-type", "") if response else "")},
+            "redirectURL": "",
+            "headersSize": -1,
+            "bodySize": int(response.headers.get("content-length", -1)) if response else -1,
+        },
+        "cache": {},
+        "timings": timings,
+        "_resourceType": request.resource_type,
+        "_failure": failure,
+    }
+
+
+@asynccontextmanager
+async def capture(page, name: str):
+    """Stream diagnostics for ``page`` to ``<run id>-<name>.jsonl.gz`` while the block runs.
+
+    Enter before the first ``goto`` so the vitals observers see the initial
+    load. Page-level timing, heap and DOM records are written on exit, also
+    when the block raises.
+    """
+    suffix = f".w{worker_id()}" if worker_id() is not None else ""
+    bundle = Bundle(DIAGNOSTICS_DIR / f"{RUN_ID}-{name}{suffix}.jsonl.gz")
+    pending: set[asyncio.Task] = set()
+
+    def on_console(msg):
+        bundle.write("console", {"level": msg.type, "text": msg.text, "location": msg.location})
+
+    def on_pageerror(error):
+        bundle.write("pageerror", {"message": str(error), "stack": getattr(error, "stack", None)})
+
+    async def finished(request, failure=None):
+        response = None if failure else await request.response()
+        bundle.write("request", har_entry(request, response, failure))
+
+    def track(coro):
+        task = asyncio.ensure_future(coro)
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    handlers = {
+        "console": on_console,
+        "pageerror": on_pageerror,
+        "requestfinished": lambda request: track(finished(request)),
+        "requestfailed": lambda request: track(finished(request, request.failure)),
+    }
+    await page.add_init_script(_VITALS_JS)
+    for event, handler in handlers.items():
+        page.on(event, handler)
+    bundle.write("meta", {"name": name, "run": RUN_ID, "worker": worker_id()})
+
+    try:
+        yield bundle.path
+    finally:
+        try:
+            await _write_page_state(page, bundle)
+        except Exception as e:
+            bundle.write("capture_error", f"{type(e).__name__}: {e}")
+        for event, handler in handlers.items():
+            page.remove_listener(event, handler)
+        await asyncio.gather(*pending, return_exceptions=True)
+        bundle.close()
+
+
+async def _write_page_state(page, bundle: Bundle):
+    timing = await page.evaluate(_TIMING_JS)
+    for entry in timing["navigation"]:
+        bundle.write("navigation", entry)
+    for entry in timing["resource"]:
+        bundle.write("resource", entry)
+    bundle.write("vitals", {**(timing["vitals"] or {}), "paint": {e["name"]: e["startTime"] for e in timing["paint"]}})
+
+    cdp = await page.context.new_cdp_session(page)
+    try:
+        heap = await cdp.send("Runtime.getHeapUsage")
+        bundle.write("heap", {"used": heap["usedSize"], "total": heap["totalSize"]})
+    finally:
+        await cdp.detach()
+
+    inventory = await Inventory.capture(page)
+    bundle.write("dom", {"url": page.url, "html": await page.content(), "inventory": [vars(el) for el in inventory]})
+
+
+def read(path: Path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def to_har(path: Path, out: Path):
+    entries = [record["data"] for record in read(path) if record["type"] == "request"]
+    entries.sort(key=lambda e: e["startedDateTime"])
+    har = {"log": {"version": "1.2", "creator": {"name": "scripts/tools/diagnostics.py", "version": "1"}, "pages": [], "entries": entries}}
+    with open(out, "w") as f:
+        json.dump(har, f, indent=2)
+
+
+def summary(path: Path, top: int = 10):
+    records: dict[str, list] = {}
+    for record in read(path):
+        records.setdefault(record["type"], []).append(record["data"])
+
+    for nav in records.get("navigation", []):
+        print(
+            f"Navigation {nav['name']}: TTFB {nav['responseStart']:.0f}ms, "
+            f"DOMContentLoaded {nav['domContentLoadedEventEnd']:.0f}ms, load {nav['loadEventEnd']:.0f}ms"
+        )
+    for vitals in records.get("vitals", []):
+        fmt = lambda v, unit="ms": "-" if v is None else f"{v:.0f}{unit}"  # noqa: E731
+        print(
+            f"Vitals: FCP {fmt(vitals.get('paint', {}).get('first-contentful-paint'))}, "
+            f"LCP {fmt(vitals.get('lcp'))} ({vitals.get('lcpElement') or '-'}), "
+            f"CLS {vitals.get('cls', 0):.3f}, INP~ {fmt(vitals.get('inp'))} over {vitals.get('interactions', 0)} interactions"
+        )
+    for heap in records.get("heap", []):
+        print(f"JS heap: {heap['used'] / 2**20:.1f} MiB used of {heap['total'] / 2**20:.1f} MiB")
+
+    requests = records.get("request", [])
+    failed = [r for r in requests if r["_failure"] or r["response"]["status"] >= 400]
+    print(f"{len(requests)} requests, {len(failed)} failed; slowest:")
+    for entry in sorted(requests, key=lambda e: e["time"], reverse=True)[:top]:
+        t = entry["timings"]
+        print(
+            f"  {entry['time']:>7.0f}ms  wait {t['wait']:>6.0f}  recv {t['receive']:>6.0f}  "
+            f"{entry['response']['status']:>3} {entry['request']['url'][:90]}"
+        )
+    for entry in failed:
+        print(f"  FAILED {entry['response']['status']} {entry['_failure'] or ''} {entry['request']['url'][:100]}")
+
+    errors = records.get("pageerror", []) + [c for c in records.get("console", []) if c["level"] == "error"]
+    print(f"{len(records.get('console', []))} console messages, {len(errors)} errors")
+    for error in errors[:top]:
+        print(f"  {(error.get('message') or error.get('text') or '')[:160]}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    show = sub.add_parser("summary", help="print the highlights of a bundle")
+    show.add_argument("bundle", type=Path)
+    show.add_argument("--top", type=int, default=10)
+    export = sub.add_parser("har", help="export the network records as a .har file")
+    export.add_argument("bundle", type=Path)
+    export.add_argument("out", type=Path)
+    args = parser.parse_args(argv)
+
+    if args.command == "summary":
+        summary(args.bundle, args.top)
+    else:
+        to_har(args.bundle, args.out)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""Async flow layer for the scripts/tools verification scripts.
+
+Every flow takes an ``async_api`` Page and is registered with ``@flow`` under
+the name of its standalone wrapper script. Run them together with
+``run_flows.py`` (``--concurrency`` pages in one event loop) or one at a time
+through the wrapper, e.g. ``python scripts/tools/verify_lunch_count.py``.
+Steps are marked with ``timing.step`` so every run leaves a latency trace.
+"""
+import asyncio
+
+from playwright.async_api import Page, expect
+
+import diagnostics
+from auth_cache import app_version
+from harness import BASE_URL, flow, save_screenshot, screenshot_path
+from inventory import Inventory
+from pages import AdminSettings, Dock, LunchCount
+from readiness import wait_for_animations, wait_for_auth, wait_for_dashboard
+from timing import frame_intervals, step
+from timing_report import percentile
+
+
+@flow(script="debug_landing", viewport={"width": 1280, "height": 720})
+async def debug_landing(page: Page):
+    async with diagnostics.capture(page, "debug_landing") as bundle:
+        async with step("Loading landing page"):
+            await page.goto(BASE_URL)
+            await wait_for_dashboard(page)
+            await wait_for_auth(page)
+        await save_screenshot(page, "debug_landing.png")
+    print(f"URL: {page.url}")
+    print(f"Diagnostics: {bundle} (python scripts/tools/diagnostics.py summary {bundle})")
+
+
+@flow(script="debug_admin_settings", role="admin")
+async def debug_admin_settings(page: Page):
+    async with diagnostics.capture(page, "debug_admin_settings") as bundle:
+        async with step("Loading app"):
+            await page.goto(BASE_URL)
+            await wait_for_auth(page, admin=True)
+        async with step("Opening Admin Settings"):
+            admin = await AdminSettings(page).open()
+        await save_screenshot(admin.dialog, "admin_settings_debug.png")
+    print(f"Diagnostics: {bundle} (python scripts/tools/diagnostics.py summary {bundle})")
+
+
+@flow(script="inspect_buttons", viewport={"width": 1280, "height": 720})
+async def inspect_buttons(page: Page):
+    async with step("Loading app"):
+        await page.goto(BASE_URL)
+        await wait_for_dashboard(page)
+        await wait_for_auth(page)
+    # One evaluate for the whole page instead of two round trips per button.
+    snapshot = await Inventory.capture(page, build=await asyncio.to_thread(app_version))
+    for i, btn in enumerate(snapshot.filter(tag="button")):
+        print(f"Button {i}: Label='{btn.label}', Text='{btn.text or ''}'")
+    print(f"Inventory saved to {snapshot.save('inspect_buttons')}")
+
+
+@flow(script="verify_dock_icons", viewport={"width": 1280, "height": 720})
+async def verify_dock_icons(page: Page):
+    async with step("Navigating to app"):
+        await page.goto(BASE_URL)
+
+    dock = Dock(page)
+    async with step("Waiting for Open Tools button"):
+        await dock.open_button.wait_for()
+
+    async with step("Opening dock"):
+        await dock.open()
+
+    async with step("Taking screenshot of initial dock"):
+        await save_screenshot(dock.root, "dock_start.png")
+
+    async with step("Scrolling dock to end"):
+        await dock.scroll_to_end()
+
+    async with step("Taking screenshot of scrolled dock"):
+        await save_screenshot(dock.root, "dock_end.png")
+
+
+@flow(script="verify_lunch_count")
+async def test_lunch_count_drag(page: Page):
+    async with step("Navigating to app"):
+        await page.goto(BASE_URL)
+        await wait_for_dashboard(page)
+
+    async with step("Adding Lunch widget"):
+        lunch = await LunchCount.add(page)
+        await expect(lunch.hot_zone).to_be_visible()
+
+    async with step("Adding students"):
+        await lunch.set_roster(["Student A", "Student B"])
+
+    student = lunch.chips(lunch.unassigned_zone).filter(has_text="Student A")
+    await expect(student).to_be_visible()
+
+    await save_screenshot(lunch.root, "before_drag.png")
+
+    async with step("Dragging student"):
+        await lunch.drag("Student A", lunch.hot_zone)
+        await expect(lunch.chips(lunch.hot_zone).filter(has_text="Student A")).to_be_visible()
+
+    await save_screenshot(lunch.root, "after_drag.png")
+    print("Verification complete!")
+
+
+@flow(script="verify_routines", role="admin")
+async def verify_instructional_routines(page: Page):
+    async with step(f"Navigating to {BASE_URL}"):
+        await page.goto(BASE_URL)
+        await wait_for_dashboard(page, timeout=30000)
+
+    # 1. Verify Admin Builder
+    admin = AdminSettings(page)
+    async with step("Opening Admin Menu"):
+        await admin.open()
+
+    async with step("Opening Instructional Routines Library"):
+        card = admin.permissions.card("instructionalRoutines")
+        library = await card.open_routines_library()
+
+    async with step("Editing Chalk Talk"):
+        editor = await library.edit("Chalk Talk")
+
+    # The file write overlaps with closing the builder below.
+    await save_screenshot(editor, "admin_builder.png")
+
+    # 2. Verify Widget Rendering
+    async with step("Returning to Dashboard"):
+        await admin.close()
+
+    dock = Dock(page)
+    async with step("Opening Tools from Dock"):
+        await dock.open()
+        await dock.tool("instructionalRoutines").wait_for(state="visible")
+
+    async with step("Adding Routines widget"):
+        widget = await dock.add("instructionalRoutines")
+        chalk_talk_item = widget.get_by_text("Chalk Talk").last
+        await expect(chalk_talk_item).to_be_visible(timeout=10000)
+
+    async with step("Selecting Chalk Talk in widget"):
+        await chalk_talk_item.click(force=True)
+        await widget.get_by_text("For Students").first.wait_for(state="visible")
+
+    # Take a screenshot of the widget in Linear mode
+    await save_screenshot(widget, "widget_linear.png")
+
+
+@flow(script="verify_routines_manager", viewport={"width": 1280, "height": 720}, role="admin")
+async def verify_instructional_routines_manager(page: Page):
+    async with step(f"Navigating to home page at {BASE_URL}"):
+        await page.goto(BASE_URL)
+        await wait_for_dashboard(page)
+
+    # The Admin Settings button requires isAdmin to be true.
+    admin = AdminSettings(page)
+    async with step("Waiting for Admin Settings button"):
+        try:
+            await wait_for_auth(page, admin=True, timeout=10000)
+            await admin.button.wait_for(state="visible", timeout=10000)
+        except Exception:
+            print("Admin Settings button not found. Taking screenshot of dock.")
+            await page.screenshot(path=screenshot_path("debug_dock.png"))
+            raise
+
+    async with step("Opening Admin Settings"):
+        await admin.open()
+        # Feature Permissions is the default tab
+        await admin.permissions.wait()
+
+    async with step("Finding Instructional Routines card"):
+        card = admin.permissions.card("instructionalRoutines")
+        await card.configure_button.wait_for(state="visible", timeout=5000)
+
+    async with step("Opening Routines library"):
+        library = await card.open_routines_library()
+
+    path = await save_screenshot(library.root, "verification_routines_manager.png")
+    print(f"Screenshot saved to {path}")
+
+
+@flow(script="verify_breathing")
+async def verify_breathing_animation(page: Page):
+    async with step("Navigating to app"):
+        await page.goto(BASE_URL)
+        await wait_for_dashboard(page)
+        await wait_for_auth(page)
+
+    async with step("Adding Breathing widget"):
+        dock = Dock(page)
+        await dock.open()
+        widget = await dock.add("breathing")
+        await wait_for_animations(widget)
+
+    async with step("Starting exercise"):
+        await widget.get_by_role("button", name="Start").click()
+        await expect(widget.get_by_role("button", name="Pause")).to_be_visible()
+
+    # Long tasks recorded for this step are the animation's jank.
+    async with step("Animating for 3s"):
+        gaps = await frame_intervals(page, 3000)
+    typical = percentile(gaps, 50)
+    slow = sum(gap > 2 * typical for gap in gaps)
+    print(f"{len(gaps)} frames, p50 {typical:.1f}ms, p95 {percentile(gaps, 95):.1f}ms, {slow} over 2x p50")
+
+    async with step("Pausing and resetting"):
+        await widget.get_by_role("button", name="Pause").click()
+        await widget.get_by_role("button", name="Reset").click()
+        await expect(widget.get_by_role("button", name="Start")).to_be_visible()
+
+    await save_screenshot(widget, "breathing.png")
@@ -0,0 +1,368 @@
+"""Shared Playwright plumbing for the scripts/tools verification flows.
+
+Flows are ``async def flow(page)`` coroutines registered with ``@flow``
+(most live in ``flows.py``). ``run_flows.py`` discovers them, launches one
+browser and runs them concurrently in a single event loop through
+``run_many``, each on a fresh context from a ``ContextPool`` (seeded from an
+``auth_cache`` snapshot when the flow declares a ``role``). The
+verify_*/debug_*/inspect_* scripts are thin synchronous wrappers that run
+one flow through ``run_standalone``.
+"""
+import asyncio
+import contextvars
+import fnmatch
+import importlib
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+BASE_URL = os.environ.get("PLAYWRIGHT_BASE_URL", "http://localhost:3000")
+VIEWPORT = {"width": 1280, "height": 800}
+
+TOOLS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = TOOLS_DIR.parent.parent
+SCREENSHOT_DIR = REPO_ROOT / "tests" / "e2e" / "screenshots"
+ARTIFACT_DIR = REPO_ROOT / "test-results" / "tools"
+
+# Shared by every flow and worker process of one run_flows.py invocation
+# (spawned workers inherit the environment).
+RUN_ID = os.environ.setdefault("TOOLS_RUN_ID", time.strftime("%Y%m%d-%H%M%S"))
+
+# Modules that hold flows. The other scripts here (codemods, reports,
+# benchmarks) are not imported by discovery.
+FLOW_MODULE_PATTERNS = ("flows.py", "verify_*.py", "debug_*.py", "inspect_*.py")
+
+
+@dataclass(frozen=True)
+class Flow:
+    name: str
+    func: Callable
+    module: str
+    viewport: dict
+    role: Optional[str] = None
+
+
+_REGISTRY: dict[str, Flow] = {}
+
+# Set in run_flows.py worker processes so parallel shards never write the
+# same screenshot file.
+_worker_id: Optional[int] = None
+
+# Background work (screenshot writes) started by the running flow; run_flow
+# waits for it before the flow's context is closed.
+_pending: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("pending", default=None)
+
+
+def flow(
+    func=None,
+    *,
+    name: Optional[str] = None,
+    script: Optional[str] = None,
+    viewport: Optional[dict] = None,
+    role: Optional[str] = None,
+):
+    """Register ``async func(page)`` as a flow the runner can call.
+
+    ``script`` names the standalone wrapper script (e.g. ``verify_lunch_count``)
+    so flows can be selected by script name and timed as separate processes.
+    ``role`` (``"admin"``/``"teacher"``) starts the flow from a cached signed-in
+    storage state instead of a cold context.
+    """
+
+    def register(f):
+        flow_name = name or f.__name__
+        _REGISTRY[flow_name] = Flow(
+            name=flow_name,
+            func=f,
+            module=script or f.__module__,
+            viewport=viewport or VIEWPORT,
+            role=role,
+        )
+        return f
+
+    return register(func) if func is not None else register
+
+
+def discover_flows(selected: Optional[list[str]] = None) -> list[Flow]:
+    """Import every flow module in scripts/tools and return the registered flows.
+
+    ``selected`` may contain flow names or module names; unknown names raise
+    so a typo does not silently run nothing.
+    """
+    if str(TOOLS_DIR) not in sys.path:
+        sys.path.insert(0, str(TOOLS_DIR))
+    for path in sorted(TOOLS_DIR.glob("*.py")):
+        if any(fnmatch.fnmatch(path.name, pattern) for pattern in FLOW_MODULE_PATTERNS):
+            importlib.import_module(path.stem)
+
+    flows = sorted(_REGISTRY.values(), key=lambda f: (f.module, f.name))
+    if not selected:
+        return flows
+
+    picked = [f for f in flows if f.name in selected or f.module in selected]
+    known = {f.name for f in flows} | {f.module for f in flows}
+    unknown = [s for s in selected if s not in known]
+    if unknown:
+        raise KeyError(f"Unknown flow(s): {', '.join(unknown)}")
+    return picked
+
+
+def set_worker_id(worker_id: Optional[int]):
+    global _worker_id
+    _worker_id = worker_id
+
+
+def worker_id() -> Optional[int]:
+    """The run_flows.py worker this process is, or None outside a sharded run."""
+    return _worker_id
+
+
+def screenshot_path(filename: str) -> str:
+    """Return the path for a screenshot under tests/e2e/screenshots.
+
+    Inside a parallel worker the worker id is appended to the file stem,
+    e.g. ``before_drag.w2.png``.
+    """
+    SCREENSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    if _worker_id is not None:
+        stem, dot, ext = filename.rpartition(".")
+        filename = f"{stem}.w{_worker_id}.{ext}" if dot else f"{filename}.w{_worker_id}"
+    return str(SCREENSHOT_DIR / filename)
+
+
+def in_background(coro):
+    """Start ``coro`` without waiting for it; the flow's runner awaits it at the end."""
+    task = asyncio.ensure_future(coro)
+    pending = _pending.get()
+    if pending is not None:
+        pending.append(task)
+    return task
+
+
+async def save_screenshot(target, filename: str, **kwargs) -> str:
+    """Capture ``target`` (Page or Locator) now and store it in the background.
+
+    A Locator is clipped to its element. The capture itself is awaited so the
+    image shows the current state, but the disk write and the manifest entry
+    ``screenshots.py compare`` checks against baselines overlap with whatever
+    the flow does next.
+    """
+    import devices
+    import screenshots
+    import timing
+
+    kwargs.setdefault("animations", "disabled")
+    kwargs.setdefault("caret", "hide")
+    tracer = timing.current_tracer()
+    flow_name = tracer.flow if tracer else "adhoc"
+    device = (tracer and tracer.device) or devices.DEFAULT
+    data = await target.screenshot(**kwargs)
+    path = screenshots.shot_path(filename, flow_name, device)
+    entry = {"run": RUN_ID, "flow": flow_name, "step": filename.rpartition(".")[0] or filename, "device": device}
+    in_background(asyncio.to_thread(screenshots.store, path, data, entry))
+    return str(path)
+
+
+class ContextPool:
+    """Hands out fresh, isolated browser contexts from one shared browser.
+
+    Contexts are never reused between flows (cookies, storage and service
+    workers would leak across them); instead the pool keeps ``size`` spare
+    contexts being created in the background so a flow does not wait on
+    ``new_context`` when it starts. Contexts for a role are created from that
+    role's entry in ``storage_states``; spares are kept per role.
+    """
+
+    def __init__(self, browser, size: int = 1, storage_states: Optional[dict] = None, **context_options):
+        self.browser = browser
+        self.size = size
+        self.storage_states = storage_states or {}
+        self.context_options = {"viewport": VIEWPORT, **context_options}
+        self._spare: dict[Optional[str], list[asyncio.Future]] = {}
+        self._fill(None)
+
+    async def _new_context(self, role: Optional[str]):
+        import netreplay
+
+        options = dict(self.context_options)
+        if role in self.storage_states:
+            options["storage_state"] = self.storage_states[role]
+        context = await self.browser.new_context(**options)
+        await netreplay.attach(context)
+        return context
+
+    def _fill(self, role: Optional[str]):
+        spare = self._spare.setdefault(role, [])
+        while len(spare) < self.size:
+            spare.append(asyncio.ensure_future(self._new_context(role)))
+
+    async def acquire(self, role: Optional[str] = None):
+        spare = self._spare.get(role)
+        if spare:
+            context = await spare.pop(0)
+            self._fill(role)
+            return context
+        self._fill(role)
+        return await self._new_context(role)
+
+    async def release(self, context):
+        await context.close()
+
+    @asynccontextmanager
+    async def page(self, viewport: Optional[dict] = None, role: Optional[str] = None):
+        context = await self.acquire(role)
+        try:
+            page = await context.new_page()
+            if viewport and viewport != self.context_options["viewport"]:
+                await page.set_viewport_size(viewport)
+            yield page
+        finally:
+            await self.release(context)
+
+    async def close(self):
+        spare = [context for contexts in self._spare.values() for context in contexts]
+        self._spare = {}
+        for context in await asyncio.gather(*spare, return_exceptions=True):
+            if not isinstance(context, BaseException):
+                await context.close()
+
+
+@dataclass
+class FlowResult:
+    name: str
+    module: str
+    passed: bool
+    duration: float
+    error: Optional[str] = None
+    worker: Optional[int] = None
+
+
+async def run_flow(pool: ContextPool, f: Flow) -> FlowResult:
+    """Run one flow on a fresh page, saving an error screenshot on failure.
+
+    The flow's ``timing.step`` blocks are traced and appended to this run's
+    timings file. Under ``TOOLS_NETWORK=offline`` a flow that made requests
+    the network store has no response for fails. The page is throttled to the
+    ``TOOLS_DEVICE`` profile. Unless ``TOOLS_TRACE=off`` a rolling trace of
+    the page is kept and written to a zip only if the flow fails (see
+    tracebuffer.py).
+    """
+    import devices
+    import netreplay
+    import timing
+    import tracebuffer
+
+    profile = devices.current()
+    # A device profile brings its own screen; the flow's viewport is for desktop runs.
+    viewport = f.viewport if profile.name == devices.DEFAULT else profile.viewport
+    pending: list = []
+    token = _pending.set(pending)
+    trace_token = None
+    start = time.perf_counter()
+    error = None
+    try:
+        async with pool.page(viewport, f.role) as page:
+            tracer = timing.Tracer(f.name, page, _worker_id, device=profile.name)
+            trace_token = timing.activate(tracer)
+            recorder = None
+            if tracebuffer.enabled():
+                recorder = tracebuffer.TraceBuffer(page, f.name).attach()
+                tracer.listeners.append(recorder)
+            try:
+                await devices.apply(page, profile)
+                await tracer.install()
+                await f.func(page)
+                await asyncio.gather(*pending)
+                missed = netreplay.unrecorded(page.context)
+                if missed:
+                    raise netreplay.UnrecordedRequestError(missed)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                await asyncio.gather(*pending, return_exceptions=True)
+                try:
+                    await page.screenshot(path=screenshot_path(f"{f.name}_error.png"))
+                except Exception:
+                    pass
+                if recorder is not None:
+                    suffix = "" if _worker_id is None else f".w{_worker_id}"
+                    print(f"Trace: {await recorder.flush(error, suffix)}", flush=True)
+            finally:
+                tracer.flush()
+                if recorder is not None:
+                    recorder.detach()
+                    recorder.discard()
+    finally:
+        if trace_token is not None:
+            timing.deactivate(trace_token)
+        _pending.reset(token)
+    return FlowResult(f.name, f.module, error is None, time.perf_counter() - start, error, _worker_id)
+
+
+async def run_many(
+    flows: list[Flow],
+    concurrency: int = 1,
+    headless: bool = True,
+    pool_size: Optional[int] = None,
+    auth_cache: bool = True,
+    refresh_auth: bool = False,
+):
+    """Run ``flows`` in one browser, at most ``concurrency`` at a time.
+
+    Returns ``(startup_seconds, results)`` with results in ``flows`` order.
+    Auth snapshots for the flows' roles are captured (or reused) up front
+    unless ``auth_cache`` is off.
+    """
+    from playwright.async_api import async_playwright
+
+    import auth_cache as auth
+    import devices
+
+    start = time.perf_counter()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        roles = {f.role for f in flows if f.role} if auth_cache else set()
+        storage_states = await auth.ensure_snapshots(browser, roles, refresh=refresh_auth)
+        startup = time.perf_counter() - start
+        pool = ContextPool(
+            browser,
+            size=concurrency if pool_size is None else pool_size,
+            storage_states=storage_states,
+            **devices.current().context_options(),
+        )
+        limit = asyncio.Semaphore(concurrency)
+
+        async def run_limited(f: Flow) -> FlowResult:
+            async with limit:
+                prefix = "---" if _worker_id is None else f"--- [w{_worker_id}]"
+                print(f"{prefix} {f.name}", flush=True)
+                return await run_flow(pool, f)
+
+        try:
+            results = await asyncio.gather(*(run_limited(f) for f in flows))
+        finally:
+            await pool.close()
+            await browser.close()
+    return startup, list(results)
+
+
+def run_standalone(func: Callable, headless: bool = True) -> FlowResult:
+    """Run a single flow in its own browser; the synchronous entry point for scripts.
+
+    The app is started (or attached to) through ``devserver`` first.
+    """
+    f = next((f for f in _REGISTRY.values() if f.func is func), None)
+    if f is None:
+        f = Flow(name=func.__name__, func=func, module=func.__module__, viewport=VIEWPORT)
+    import devserver
+
+    with devserver.server():
+        _, (result,) = asyncio.run(run_many([f], concurrency=1, headless=headless, pool_size=0))
+    if result.passed:
+        print(f"{f.name} passed in {result.duration:.1f}s")
+    else:
+        print(f"Error: {result.error}")
+    return result
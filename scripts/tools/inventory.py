@@ -0,0 +1,278 @@
+"""Interactive-element inventory of a page, captured in one ``evaluate``.
+
+``Inventory.capture(page)`` walks every interactive element (buttons, links,
+form controls, ARIA widget roles, focusable elements) in a single in-page
+pass and returns role, accessible label, title, text, ``data-testid``,
+bounding box and visibility for each. Snapshots export to JSON/CSV, diff
+against each other across builds, and hand out selectors so flows can look
+elements up without querying the DOM again.
+
+Usage:
+
+    python scripts/tools/run_flows.py inspect_buttons          # writes test-results/tools/inventory/
+    python scripts/tools/inventory.py show SNAPSHOT.json --role button --visible
+    python scripts/tools/inventory.py csv SNAPSHOT.json out.csv
+    python scripts/tools/inventory.py diff OLD.json NEW.json
+"""
+import argparse
+import csv
+import json
+import sys
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Optional
+
+from harness import ARTIFACT_DIR, RUN_ID
+
+INVENTORY_DIR = ARTIFACT_DIR / "inventory"
+
+_INTERACTIVE = ", ".join(
+    [
+        "button",
+        "a[href]",
+        "input:not([type=hidden])",
+        "select",
+        "textarea",
+        "summary",
+        "[contenteditable=''], [contenteditable='true']",
+        "[tabindex]:not([tabindex='-1'])",
+        *(
+            f"[role={role}]"
+            for role in (
+                "button", "link", "tab", "menuitem", "menuitemcheckbox", "menuitemradio", "option",
+                "checkbox", "radio", "switch", "slider", "spinbutton", "combobox", "textbox", "treeitem",
+            )
+        ),
+    ]
+)
+
+_INVENTORY_JS = """
+([root, selector]) => {
+  const scope = root ? document.querySelector(root) : document;
+  if (!scope) return [];
+  const implicitRole = (el) => {
+    const tag = el.tagName.toLowerCase();
+    if (tag === 'button' || tag === 'summary') return 'button';
+    if (tag === 'a') return 'link';
+    if (tag === 'select') return el.multiple ? 'listbox' : 'combobox';
+    if (tag === 'textarea') return 'textbox';
+    if (tag === 'input') {
+      const type = (el.getAttribute('type') || 'text').toLowerCase();
+      return { checkbox: 'checkbox', radio: 'radio', range: 'slider', number: 'spinbutton',
+               button: 'button', submit: 'button', reset: 'button', image: 'button' }[type] || 'textbox';
+    }
+    return null;
+  };
+  const clean = (s) => (s || '').replace(/\\s+/g, ' ').trim().slice(0, 200);
+  return [...scope.querySelectorAll(selector)].map((el, index) => {
+    const r = el.getBoundingClientRect();
+    const visible = r.width > 0 && r.height > 0 &&
+      (el.checkVisibility ? el.checkVisibility({ visibilityProperty: true, opacityProperty: true }) : true);
+    return {
+      index,
+      tag: el.tagName.toLowerCase(),
+      role: el.getAttribute('role') || implicitRole(el),
+      label: el.getAttribute('aria-label'),
+      title: el.getAttribute('title'),
+      text: clean(el.innerText ?? el.textContent) || null,
+      testid: el.getAttribute('data-testid'),
+      x: Math.round(r.x), y: Math.round(r.y), width: Math.round(r.width), height: Math.round(r.height),
+      visible,
+      disabled: el.disabled === true || el.getAttribute('aria-disabled') === 'true',
+    };
+  });
+}
+"""
+
+
+def _quoted(value: str) -> str:
+    # A CSS/Playwright string: quotes and backslashes escaped, other text
+    # (umlauts, emoji, CJK) kept as is; "\u00e9" is not an escape in CSS.
+    return json.dumps(value, ensure_ascii=False)
+
+
+@dataclass
+class Element:
+    index: int
+    tag: str
+    role: Optional[str]
+    label: Optional[str]
+    title: Optional[str]
+    text: Optional[str]
+    testid: Optional[str]
+    x: int
+    y: int
+    width: int
+    height: int
+    visible: bool
+    disabled: bool
+
+    @property
+    def name(self) -> Optional[str]:
+        """Approximate accessible name: aria-label, then text, then title."""
+        return self.label or self.text or self.title
+
+    @property
+    def selector(self) -> Optional[str]:
+        """The most stable Playwright selector for this element, if it has one."""
+        if self.testid:
+            return f"[data-testid={_quoted(self.testid)}]"
+        if self.label:
+            return f"{self.tag}[aria-label={_quoted(self.label)}]"
+        if self.title:
+            return f"{self.tag}[title={_quoted(self.title)}]"
+        if self.role and self.text:
+            return f"role={self.role}[name={_quoted(self.text)}]"
+        return None
+
+    @property
+    def key(self) -> str:
+        """Identity used to match elements between snapshots."""
+        return self.testid or f"{self.role}|{self.label or self.title or self.text or self.tag}"
+
+
+class Inventory:
+    """A snapshot of the interactive elements on a page."""
+
+    def __init__(self, elements: list[Element], meta: Optional[dict] = None):
+        self.elements = elements
+        self.meta = meta or {}
+
+    @classmethod
+    async def capture(cls, page, root: Optional[str] = None, **meta) -> "Inventory":
+        rows = await page.evaluate(_INVENTORY_JS, [root, _INTERACTIVE])
+        return cls([Element(**row) for row in rows], {"url": page.url, "root": root, **meta})
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __iter__(self):
+        return iter(self.elements)
+
+    def filter(self, visible: Optional[bool] = None, **match) -> list[Element]:
+        """Elements whose attributes equal every ``match`` value, e.g. ``filter(role="button")``."""
+        return [
+            el
+            for el in self.elements
+            if (visible is None or el.visible == visible) and all(getattr(el, k) == v for k, v in match.items())
+        ]
+
+    def find(self, name: Optional[str] = None, **match) -> Element:
+        """The single visible element matching; ``name`` matches label, text or title."""
+        candidates = [el for el in self.filter(visible=True, **match) if name is None or name in (el.label, el.text, el.title)]
+        if len(candidates) != 1:
+            raise LookupError(f"{len(candidates)} elements match name={name!r} {match}")
+        return candidates[0]
+
+    def locator(self, page, name: Optional[str] = None, **match):
+        element = self.find(name, **match)
+        if element.selector is None:
+            raise LookupError(f"element {element.index} ({element.tag}) has no label, title, text or test id")
+        return page.locator(element.selector)
+
+    def to_json(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"meta": self.meta, "elements": [asdict(el) for el in self.elements]}, f, indent=2)
+
+    def to_csv(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=[field.name for field in fields(Element)] + ["selector"])
+            writer.writeheader()
+            for el in self.elements:
+                writer.writerow({**asdict(el), "selector": el.selector})
+
+    @classmethod
+    def load(cls, path: Path) -> "Inventory":
+        with open(path) as f:
+            data = json.load(f)
+        return cls([Element(**row) for row in data["elements"]], data.get("meta"))
+
+    def save(self, name: str) -> Path:
+        """Write ``<run id>-<name>.json`` and ``.csv`` under test-results/tools/inventory."""
+        path = INVENTORY_DIR / f"{RUN_ID}-{name}.json"
+        self.to_json(path)
+        self.to_csv(path.with_suffix(".csv"))
+        return path
+
+
+def _keyed(inventory: Inventory) -> dict[str, Element]:
+    keyed, seen = {}, {}
+    for el in inventory:
+        n = seen[el.key] = seen.get(el.key, 0) + 1
+        keyed[el.key if n == 1 else f"{el.key}#{n}"] = el
+    return keyed
+
+
+def diff(old: Inventory, new: Inventory, move_tolerance: int = 2) -> dict:
+    """Added, removed and changed elements between two snapshots."""
+    before, after = _keyed(old), _keyed(new)
+    changed = []
+    for key in before.keys() & after.keys():
+        a, b = before[key], after[key]
+        changes = {
+            f: [getattr(a, f), getattr(b, f)]
+            for f in ("role", "label", "title", "text", "testid", "visible", "disabled")
+            if getattr(a, f) != getattr(b, f)
+        }
+        if max(abs(a.x - b.x), abs(a.y - b.y), abs(a.width - b.width), abs(a.height - b.height)) > move_tolerance:
+            changes["box"] = [[a.x, a.y, a.width, a.height], [b.x, b.y, b.width, b.height]]
+        if changes:
+            changed.append({"key": key, "changes": changes})
+    return {
+        "added": sorted(after.keys() - before.keys()),
+        "removed": sorted(before.keys() - after.keys()),
+        "changed": sorted(changed, key=lambda c: c["key"]),
+    }
+
+
+def print_table(elements: list[Element]):
+    print(f"{'#':>4} {'role':<10} {'vis':<3} {'testid':<22} {'name':<40} selector")
+    for el in elements:
+        print(
+            f"{el.index:>4} {(el.role or '-')[:10]:<10} {'y' if el.visible else 'n':<3} "
+            f"{(el.testid or '-')[:22]:<22} {(el.name or '-')[:40]:<40} {el.selector or '-'}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    show = sub.add_parser("show", help="print a snapshot")
+    show.add_argument("snapshot", type=Path)
+    show.add_argument("--role")
+    show.add_argument("--visible", action="store_true", help="only visible elements")
+    to_csv = sub.add_parser("csv", help="convert a JSON snapshot to CSV")
+    to_csv.add_argument("snapshot", type=Path)
+    to_csv.add_argument("out", type=Path)
+    compare = sub.add_parser("diff", help="diff two snapshots, e.g. from two builds")
+    compare.add_argument("old", type=Path)
+    compare.add_argument("new", type=Path)
+    compare.add_argument("--json", action="store_true", help="print JSON instead of text")
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        inventory = Inventory.load(args.snapshot)
+        match = {"role": args.role} if args.role else {}
+        print_table(inventory.filter(visible=True if args.visible else None, **match))
+    elif args.command == "csv":
+        Inventory.load(args.snapshot).to_csv(args.out)
+    else:
+        result = diff(Inventory.load(args.old), Inventory.load(args.new))
+        if args.json:
+            json.dump(result, sys.stdout, indent=2)
+            print()
+        else:
+            for key in result["added"]:
+                print(f"+ {key}")
+            for key in result["removed"]:
+                print(f"- {key}")
+            for item in result["changed"]:
+                print(f"~ {item['key']}: " + ", ".join(f"{f} {a!r} -> {b!r}" for f, (a, b) in item["changes"].items()))
+        return 1 if any(result.values()) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""Widget leak harness: does the heap keep growing as a widget is opened and closed?
+
+For each dock tool the harness adds the widget from the dock and deletes it
+again, ``--cycles`` times. After every cycle it forces a full garbage
+collection through CDP (``HeapProfiler.collectGarbage``) and samples
+``JSHeapUsedSize``, ``Nodes`` and ``JSEventListeners`` from
+``Performance.getMetrics``. A least-squares line through the samples gives
+the growth per cycle; a widget is flagged when its heap slope exceeds
+``--heap-threshold`` and the fit is good (so a single late allocation does
+not count), or when DOM nodes or listeners grow by at least one per cycle.
+
+The first ``--warmup`` cycles are not sampled: they load the widget's lazy
+chunk and fill caches that legitimately stay. With ``--snapshots N`` the N
+worst flagged widgets are cycled once more after the sampling pass, with a
+heap snapshot after warm-up and after the last cycle; load both in
+DevTools' Memory tab and use the Comparison view.
+
+Usage:
+
+    python scripts/tools/leak_widgets.py                        # every dock widget, 10 cycles
+    python scripts/tools/leak_widgets.py --only lunchCount --only instructionalRoutines --cycles 30
+    python scripts/tools/leak_widgets.py --snapshots 3 --json leaks.json
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+import tracebuffer
+from bench_widgets import get_metrics
+from dashboard import add_widget, dock_tool_ids, open_dock, remove_widget
+from devserver import server
+from harness import ARTIFACT_DIR, BASE_URL, RUN_ID, VIEWPORT, Flow, run_many
+from readiness import wait_for_animations, wait_for_auth, wait_for_dashboard
+from timing import step
+
+LEAK_DIR = ARTIFACT_DIR / "leaks"
+
+
+@dataclass
+class LeakSample:
+    tool: str
+    cycle: int
+    heap_used: float
+    nodes: float
+    listeners: float
+
+
+@dataclass
+class LeakResult:
+    tool: str
+    cycles: int
+    heap_slope: Optional[float] = None  # bytes per cycle
+    heap_r: Optional[float] = None  # correlation of the fit
+    nodes_slope: Optional[float] = None
+    listeners_slope: Optional[float] = None
+    heap_growth: Optional[float] = None  # last - first sample, bytes
+    flagged: bool = False
+    snapshots: Optional[list[str]] = None
+    error: Optional[str] = None
+
+
+async def collect_garbage(cdp):
+    # Twice: the first pass can only queue finalizers that free more memory.
+    await cdp.send("HeapProfiler.collectGarbage")
+    await cdp.send("HeapProfiler.collectGarbage")
+
+
+async def sample(cdp, tool: str, cycle: int) -> LeakSample:
+    await collect_garbage(cdp)
+    metrics = await get_metrics(cdp)
+    return LeakSample(tool, cycle, metrics["JSHeapUsedSize"], metrics["Nodes"], metrics["JSEventListeners"])
+
+
+async def heap_snapshot(cdp, path: Path) -> Path:
+    """Stream a ``.heapsnapshot`` to ``path`` as CDP sends it in chunks."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        def on_chunk(event):
+            f.write(event["chunk"])
+
+        cdp.on("HeapProfiler.addHeapSnapshotChunk", on_chunk)
+        try:
+            await cdp.send("HeapProfiler.takeHeapSnapshot", {"reportProgress": False})
+        finally:
+            cdp.remove_listener("HeapProfiler.addHeapSnapshotChunk", on_chunk)
+    return path
+
+
+async def cycle(page, tool: str):
+    widget = await add_widget(page, tool)
+    await wait_for_animations(widget)
+    await remove_widget(page, widget)
+    await wait_for_animations(page)
+
+
+def slope(samples: list[LeakSample], field: str) -> tuple[float, Optional[float]]:
+    """Least-squares growth per cycle and the correlation of the fit."""
+    x = [s.cycle for s in samples]
+    y = [getattr(s, field) for s in samples]
+    fit = statistics.linear_regression(x, y)
+    try:
+        r = statistics.correlation(x, y)
+    except statistics.StatisticsError:
+        r = None  # constant series: no growth at all
+    return fit.slope, r
+
+
+def analyze(result: LeakResult, samples: list[LeakSample], heap_threshold: float, min_r: float):
+    if len(samples) < 3:
+        result.error = result.error or f"only {len(samples)} samples"
+        return
+    result.heap_slope, result.heap_r = slope(samples, "heap_used")
+    result.nodes_slope, _ = slope(samples, "nodes")
+    result.listeners_slope, _ = slope(samples, "listeners")
+    result.heap_growth = samples[-1].heap_used - samples[0].heap_used
+    result.flagged = (
+        (result.heap_slope > heap_threshold and (result.heap_r or 0) >= min_r)
+        or result.nodes_slope >= 1
+        or result.listeners_slope >= 1
+    )
+
+
+def make_flow(
+    samples: list,
+    results: list,
+    only=None,
+    cycles: int = 10,
+    warmup: int = 2,
+    heap_threshold: float = 16 * 1024,
+    min_r: float = 0.8,
+    snapshots: int = 0,
+) -> Flow:
+    async def leak_widgets(page):
+        async with step("Loading app"):
+            await page.goto(BASE_URL)
+            await wait_for_dashboard(page)
+            await wait_for_auth(page)
+        await open_dock(page)
+        tools = await dock_tool_ids(page)
+        if only:
+            tools = [t for t in tools if t in only]
+        cdp = await page.context.new_cdp_session(page)
+        await cdp.send("Performance.enable")
+        await cdp.send("HeapProfiler.enable")
+
+        async def run_tool(tool: str, tool_samples: list[LeakSample], snapshot: bool = False) -> list[Path]:
+            paths = []
+            async with step(f"Warming up {tool}"):
+                for _ in range(warmup):
+                    await cycle(page, tool)
+            tool_samples.append(await sample(cdp, tool, 0))
+            if snapshot:
+                paths.append(await heap_snapshot(cdp, LEAK_DIR / f"{RUN_ID}-{tool}-before.heapsnapshot"))
+            async with step(f"Cycling {tool} x{cycles}"):
+                for n in range(1, cycles + 1):
+                    await cycle(page, tool)
+                    tool_samples.append(await sample(cdp, tool, n))
+            if snapshot:
+                paths.append(await heap_snapshot(cdp, LEAK_DIR / f"{RUN_ID}-{tool}-after.heapsnapshot"))
+            return paths
+
+        for tool in tools:
+            result = LeakResult(tool, cycles)
+            tool_samples: list[LeakSample] = []
+            try:
+                await run_tool(tool, tool_samples)
+            except Exception as e:
+                # Tools that open a modal or popover instead of a widget end up here.
+                result.error = f"{type(e).__name__}: {e}".splitlines()[0]
+                await page.keyboard.press("Escape")
+            analyze(result, tool_samples, heap_threshold, min_r)
+            samples.extend(tool_samples)
+            results.append(result)
+
+        # Snapshots are large and slow to take, so only the worst offenders are
+        # cycled again with one before and one after.
+        for result in [r for r in rank(results)[:snapshots] if r.flagged]:
+            try:
+                paths = await run_tool(result.tool, [], snapshot=True)
+            except Exception as e:
+                result.error = f"snapshot pass: {type(e).__name__}: {e}".splitlines()[0]
+                await page.keyboard.press("Escape")
+                continue
+            result.snapshots = [str(p) for p in paths]
+
+    return Flow(name="leak_widgets", func=leak_widgets, module="leak_widgets", viewport=VIEWPORT)
+
+
+def rank(results: list[LeakResult]) -> list[LeakResult]:
+    """Flagged widgets first, then by heap growth per cycle."""
+    return sorted(results, key=lambda r: (not r.flagged, r.heap_slope is None, -(r.heap_slope or 0)))
+
+
+def print_table(results: list[LeakResult]):
+    def fmt(value, width=9, digits=1):
+        return f"{'-':>{width}}" if value is None else f"{value:>{width}.{digits}f}"
+
+    def kib(value):
+        return None if value is None else value / 1024
+
+    print(f"{'Widget':<24} {'KiB/cycle':>9} {'r':>5} {'KiB total':>9} {'nodes/c':>9} {'listen/c':>9}  flag")
+    for r in rank(results):
+        print(
+            f"{r.tool[:24]:<24} {fmt(kib(r.heap_slope))} {fmt(r.heap_r, 5, 2)} {fmt(kib(r.heap_growth))} "
+            f"{fmt(r.nodes_slope)} {fmt(r.listeners_slope)}  {'LEAK' if r.flagged else ''}"
+            + (f"  {r.error}" if r.error else "")
+        )
+        for path in r.snapshots or ():
+            print(f"    {path}")
+    print("(after forced GC; slopes are least-squares growth per add/remove cycle)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", action="append", help="tool id(s) to cycle (data-tool-id)")
+    parser.add_argument("--cycles", type=int, default=10, help="sampled add/remove cycles per widget")
+    parser.add_argument("--warmup", type=int, default=2, help="unsampled cycles first")
+    parser.add_argument(
+        "--heap-threshold", type=float, default=16, help="flag heap growth above this many KiB per cycle"
+    )
+    parser.add_argument("--min-r", type=float, default=0.8, help="minimum correlation for a heap slope to count")
+    parser.add_argument("--snapshots", type=int, default=0, help="re-run the N worst flagged widgets with before/after heap snapshots")
+    parser.add_argument("--json", help="write samples and results to this file")
+    parser.add_argument("--headed", action="store_true", help="show the browser")
+    args = parser.parse_args(argv)
+    tracebuffer.measuring()
+
+    samples: list[LeakSample] = []
+    results: list[LeakResult] = []
+    flow = make_flow(
+        samples, results, args.only, args.cycles, args.warmup, args.heap_threshold * 1024, args.min_r, args.snapshots
+    )
+    with server():
+        _, (result,) = asyncio.run(run_many([flow], headless=not args.headed))
+    if not result.passed:
+        print(f"Leak run aborted: {result.error}", file=sys.stderr)
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"results": [asdict(r) for r in results], "samples": [asdict(s) for s in samples]}, f, indent=2)
+    flagged = [r.tool for r in results if r.flagged]
+    if flagged:
+        print(f"{len(flagged)} widget(s) keep growing: {', '.join(flagged)}")
+    return 0 if result.passed and not flagged else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""Concurrent independent boards: interaction latency as more are open at once.
+
+Opens boards (isolated browser contexts, like separate teachers) one level
+at a time - e.g. 1, 2, 4, 8, 16 - keeping the earlier ones open, and on
+every open board at the same moment runs ``--rounds`` rounds of
+
+* **mount** - add a Clock from the dock; pointerdown to interactive, measured
+  in the page (see bench_widgets.py),
+* **routine** - add Instructional Routines and pick Chalk Talk; pointerdown
+  to the routine's steps being on screen, measured in the page,
+* **drag** - drag a LunchCount chip between zones; p95 frame time during the
+  drag (see profile_lunch_drag.py).
+
+Boards run against the server devserver.py manages. With ``VITE_AUTH_BYPASS``
+the app keeps dashboards in its in-browser mock store instead of Firestore,
+and that store lives in each context: no two boards see the same
+dashboard, so sharing paths and backend contention are not exercised. What
+is measured is client-side load from N independent boards (one renderer
+process per browser, one preview server); ``--network replay`` keeps
+third-party traffic local too. Measuring shared dashboards needs a Firestore
+emulator hook the app does not have.
+
+Every board is a context with the ``TOOLS_DEVICE`` profile's screen and
+throttling, like the flow's own page. Reports p50/p95 per interaction and
+board count, the first level at which each interaction's p95 is more than
+``--limit`` times its p95 at the smallest level (the baseline, named in the
+output), and writes an SVG chart of latency against board count.
+
+Usage:
+
+    python scripts/tools/load_boards.py                          # 1, 2, 4, 8 boards
+    python scripts/tools/load_boards.py --levels 1,4,8,16,24 --rounds 5
+    python scripts/tools/load_boards.py --network replay --json load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import devices
+import tracebuffer
+from bench_widgets import measure_mount
+from charts import line_chart
+from dashboard import add_widget, open_dock, remove_widget
+from devserver import server
+from harness import ARTIFACT_DIR, BASE_URL, RUN_ID, VIEWPORT, ContextPool, Flow, run_many
+from netreplay import MODES
+from profile_lunch_drag import HOT_ZONE, UNASSIGNED_ZONE, DragSample, drag, idle_frame_interval, load_roster
+from readiness import wait_for_animations, wait_for_auth, wait_for_dashboard
+from timing import step
+from timing_report import percentile
+
+LOAD_DIR = ARTIFACT_DIR / "load"
+INTERACTIONS = ("mount", "routine", "drag")
+
+# Resolves with pointerdown -> first frame where ``text`` is rendered in the widget.
+_TEXT_PROBE_JS = """
+([id, text, timeout]) => {
+  window.__textProbe = new Promise((resolve) => {
+    let t0 = null;
+    document.addEventListener('pointerdown', (e) => { t0 = t0 ?? e.timeStamp; }, { capture: true, once: true });
+    const deadline = performance.now() + timeout;
+    const check = () => {
+      const el = document.querySelector(`.widget[data-widget-id="${id}"]`);
+      if (t0 !== null && el && el.innerText.includes(text)) return resolve(performance.now() - t0);
+      if (performance.now() > deadline) return resolve(null);
+      requestAnimationFrame(check);
+    };
+    requestAnimationFrame(check);
+  });
+}
+"""
+
+
+@dataclass
+class LoadSample:
+    boards: int
+    board: int
+    round: int
+    interaction: str
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+class Board:
+    """One signed-in dashboard with a LunchCount widget ready to drag."""
+
+    def __init__(self, index: int, page):
+        self.index = index
+        self.page = page
+        self.cdp = None
+        self.lunch = None
+        self.refresh_ms = 16.7
+        self.drags = 0
+
+    async def open(self, roster: int):
+        page = self.page
+        await page.goto(BASE_URL)
+        await wait_for_dashboard(page)
+        await wait_for_auth(page)
+        await open_dock(page)
+        self.cdp = await page.context.new_cdp_session(page)
+        await self.cdp.send("Performance.enable", {"timeDomain": "threadTicks"})
+        self.lunch = await add_widget(page, "lunchCount")
+        await wait_for_animations(self.lunch)
+        await load_roster(page, self.lunch, roster)
+        self.refresh_ms = await idle_frame_interval(page)
+
+    async def mount(self) -> float:
+        sample = await measure_mount(self.page, self.cdp, "clock")
+        if sample.error:
+            raise AssertionError(sample.error)
+        return sample.interactive_ms
+
+    async def routine(self, timeout: int = 10000) -> float:
+        widget = await add_widget(self.page, "instructionalRoutines", timeout)
+        await wait_for_animations(widget)
+        widget_id = await widget.get_attribute("data-widget-id")
+        await self.page.evaluate(_TEXT_PROBE_JS, [widget_id, "For Students", timeout])
+        await widget.get_by_text("Chalk Talk").last.click(force=True)
+        latency = await self.page.evaluate("() => window.__textProbe")
+        await remove_widget(self.page, widget)
+        await wait_for_animations(self.page)
+        if latency is None:
+            raise AssertionError("routine steps never rendered")
+        return latency
+
+    async def drag(self) -> float:
+        # Alternate directions so the roster ends where it started.
+        source, target = (UNASSIGNED_ZONE, HOT_ZONE) if self.drags % 2 == 0 else (HOT_ZONE, UNASSIGNED_ZONE)
+        self.drags += 1
+        sample = DragSample(0, 20, "")
+        try:
+            await drag(self.page, self.lunch, source, target, 20, self.refresh_ms, sample)
+        except Exception:
+            await self.page.mouse.up()
+            raise
+        return sample.frame_p95_ms
+
+
+async def run_round(board: Board, boards: int, n: int) -> list[LoadSample]:
+    samples = []
+    for interaction in INTERACTIONS:
+        sample = LoadSample(boards, board.index, n, interaction)
+        try:
+            sample.latency_ms = await getattr(board, interaction)()
+        except Exception as e:
+            sample.error = f"{type(e).__name__}: {e}".splitlines()[0]
+            await board.page.keyboard.press("Escape")
+        samples.append(sample)
+    return samples
+
+
+def make_flow(samples: list, levels: list[int], rounds: int, roster: int) -> Flow:
+    async def load_boards(page):
+        # The flow's own page is board 0; the others come from the same browser.
+        pool = ContextPool(page.context.browser, size=0, **devices.current().context_options())
+        contexts = []
+        boards = [Board(0, page)]
+        try:
+            async with step("Opening board 0"):
+                await boards[0].open(roster)
+            for level in levels:
+                if len(boards) < level:
+                    async with step(f"Opening boards {len(boards)}-{level - 1}"):
+                        while len(boards) < level:
+                            context = await pool.acquire()
+                            contexts.append(context)
+                            board_page = await context.new_page()
+                            await devices.apply(board_page)
+                            boards.append(Board(len(boards), board_page))
+                        await asyncio.gather(*(b.open(roster) for b in boards if b.lunch is None))
+                for n in range(rounds):
+                    async with step(f"{level} boards, round {n + 1}"):
+                        results = await asyncio.gather(*(run_round(b, level, n) for b in boards[:level]))
+                    samples.extend(s for board_samples in results for s in board_samples)
+        finally:
+            await asyncio.gather(*(context.close() for context in contexts), return_exceptions=True)
+            await pool.close()
+
+    return Flow(name="load_boards", func=load_boards, module="load_boards", viewport=VIEWPORT)
+
+
+def summarize(samples: list[LoadSample], limit: float) -> tuple[list[dict], dict]:
+    """Rows per (boards, interaction) and, per interaction, the baseline board count and the first one over ``limit``x it."""
+    groups: dict[tuple, list[LoadSample]] = {}
+    for s in samples:
+        groups.setdefault((s.boards, s.interaction), []).append(s)
+    rows = []
+    for (boards, interaction), items in sorted(groups.items(), key=lambda kv: (kv[0][0], INTERACTIONS.index(kv[0][1]))):
+        values = [s.latency_ms for s in items if s.latency_ms is not None]
+        rows.append(
+            {
+                "boards": boards,
+                "interaction": interaction,
+                "samples": len(values),
+                "failed": len(items) - len(values),
+                "p50_ms": percentile(values, 50) if values else None,
+                "p95_ms": percentile(values, 95) if values else None,
+                "max_ms": max(values, default=None),
+            }
+        )
+
+    limits = {}
+    for interaction in INTERACTIONS:
+        series = [r for r in rows if r["interaction"] == interaction and r["p95_ms"] is not None]
+        if series:
+            # Rows are sorted by board count: the smallest level measured is the baseline.
+            base = series[0]
+            limits[interaction] = {
+                "baseline": base["boards"],
+                "over": next((r["boards"] for r in series if r["p95_ms"] > limit * base["p95_ms"]), None),
+            }
+    return rows, limits
+
+
+def print_table(rows: list[dict], limits: dict, limit: float):
+    def fmt(value):
+        return f"{'-':>8}" if value is None else f"{value:>6.0f}ms"
+
+    print(f"{'Boards':>6} {'Interaction':<12} {'n':>4} {'p50':>8} {'p95':>8} {'max':>8} {'fail':>5}")
+    for r in rows:
+        print(
+            f"{r['boards']:>6} {r['interaction']:<12} {r['samples']:>4} {fmt(r['p50_ms'])} {fmt(r['p95_ms'])} "
+            f"{fmt(r['max_ms'])} {r['failed']:>5}"
+        )
+    print("(independent boards, no shared dashboards; mount/routine: pointerdown to on screen; drag: p95 frame time)")
+    for interaction, levels in limits.items():
+        base = f"{levels['baseline']} board{'s' if levels['baseline'] != 1 else ''}"
+        verdict = (
+            f"p95 over {limit:g}x its value at {base} once {levels['over']} boards are open"
+            if levels["over"]
+            else f"held up at every level (relative to {base})"
+        )
+        print(f"{interaction}: {verdict}")
+
+
+def write_chart(rows: list[dict]) -> str:
+    series = {
+        f"{interaction} {stat}": [(r["boards"], r[f"{stat}_ms"]) for r in rows if r["interaction"] == interaction and r[f"{stat}_ms"] is not None]
+        for interaction in INTERACTIONS
+        for stat in ("p50", "p95")
+    }
+    path = LOAD_DIR / f"{RUN_ID}-load_boards.svg"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(line_chart(series, "Interaction latency vs. concurrent independent boards", "independent boards", "ms"))
+    return str(path)
+
+
+def int_list(value: str) -> list[int]:
+    return sorted({int(v) for v in value.split(",") if v.strip()})
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int_list, default=[1, 2, 4, 8], help="comma-separated board counts")
+    parser.add_argument("--rounds", type=int, default=3, help="interaction rounds per board at each level")
+    parser.add_argument("--roster", type=int, default=20, help="students on each board's LunchCount")
+    parser.add_argument("--limit", type=float, default=2, help="report where p95 exceeds this multiple of the smallest level")
+    parser.add_argument("--network", choices=MODES, help="third-party traffic mode (see netreplay.py)")
+    parser.add_argument("--json", help="write samples and the summary to this file")
+    parser.add_argument("--headed", action="store_true", help="show the browser")
+    args = parser.parse_args(argv)
+    tracebuffer.measuring()
+    if args.network:
+        os.environ["TOOLS_NETWORK"] = args.network
+
+    samples: list[LoadSample] = []
+    flow = make_flow(samples, args.levels, args.rounds, args.roster)
+    with server():
+        _, (result,) = asyncio.run(run_many([flow], headless=not args.headed))
+    if not result.passed:
+        print(f"Load run aborted: {result.error}", file=sys.stderr)
+
+    rows, limits = summarize(samples, args.limit)
+    print_table(rows, limits, args.limit)
+    if rows:
+        print(f"Chart: {write_chart(rows)}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"summary": rows, "limits": limits, "samples": [asdict(s) for s in samples]}, f, indent=2)
+    return 0 if result.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""Record/replay of the app's third-party traffic for offline, deterministic flows.
+
+Everything the app requests from hosts other than the app server itself
+(Firebase, weather and calendar fetchers, Gemini, CDNs, ...) can be served
+from a store under ``scripts/tools/.cache/network/`` instead of the real
+network. The mode comes from ``TOOLS_NETWORK`` (``run_flows.py --network``):
+
+* ``live`` (default) - no interception,
+* ``record`` - fetch live and (re-)record every response,
+* ``replay`` - serve recorded responses; unseen requests are fetched live
+  and recorded, so the first run fills the store,
+* ``offline`` - serve recorded responses only; an unseen request is aborted
+  immediately and fails the flow, listing what was missing.
+
+Requests are matched on method, URL (minus cache-busting and session query
+parameters) and a hash of the POST body. Repeats of the same request are
+served in recorded order, the last one repeating. When a request was
+recorded by several runs only the newest run's responses are used.
+Long-poll streaming channels are never recorded; in replay they are
+aborted so the app falls back to its offline state straight away.
+"""
+import hashlib
+import json
+import os
+import weakref
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from harness import BASE_URL, RUN_ID, TOOLS_DIR
+
+MODES = ("live", "record", "replay", "offline")
+STORE_DIR = Path(os.environ.get("TOOLS_NETWORK_STORE", TOOLS_DIR / ".cache" / "network"))
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "0.0.0.0", urlsplit(BASE_URL).hostname}
+# Query parameters that change on every request without changing the response.
+VOLATILE_PARAMS = {"_", "t", "cb", "zx", "RID", "SID", "AID", "gsessionid", "ofs", "CI", "TYPE"}
+# Hanging GETs that only end when the page goes away.
+STREAMING = ("/Listen/channel", "/Write/channel", "/channel?")
+# route.fetch() returns decoded bodies, so these no longer describe them.
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class UnrecordedRequestError(AssertionError):
+    """An ``offline`` run saw requests the store has no response for."""
+
+    def __init__(self, keys: list[str]):
+        self.keys = keys
+        super().__init__(
+            f"{len(keys)} request(s) not in {STORE_DIR} (re-run with --network replay to record):\n  "
+            + "\n  ".join(keys[:20])
+        )
+
+
+def mode() -> str:
+    value = os.environ.get("TOOLS_NETWORK", "live")
+    if value not in MODES:
+        raise ValueError(f"TOOLS_NETWORK must be one of {', '.join(MODES)}, not {value!r}")
+    return value
+
+
+def is_external(url: str) -> bool:
+    parts = urlsplit(url)
+    return parts.scheme in ("http", "https") and parts.hostname not in LOCAL_HOSTS
+
+
+def request_key(request) -> str:
+    parts = urlsplit(request.url)
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in VOLATILE_PARAMS))
+    url = urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+    body = request.post_data_buffer
+    digest = f" #{hashlib.sha256(body).hexdigest()[:16]}" if body else ""
+    return f"{request.method} {url}{digest}"
+
+
+class Store:
+    """``entries.jsonl`` (append-only, shared by workers) plus content-addressed bodies."""
+
+    def __init__(self, path: Path = STORE_DIR):
+        self.path = path
+        self.index = path / "entries.jsonl"
+        self.bodies = path / "bodies"
+        self.entries: dict[str, list[dict]] = {}
+        self.load()
+
+    def load(self):
+        by_run: dict[str, dict[str, list[dict]]] = defaultdict(lambda: defaultdict(list))
+        if self.index.exists():
+            with open(self.index) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        by_run[entry["key"]][entry["run"]].append(entry)
+        # Newest run wins per key; run ids sort chronologically.
+        self.entries = {key: runs[max(runs)] for key, runs in by_run.items()}
+
+    def get(self, key: str, n: int) -> Optional[dict]:
+        entries = self.entries.get(key)
+        return entries[min(n, len(entries) - 1)] if entries else None
+
+    def body(self, entry: dict) -> bytes:
+        return (self.bodies / entry["body"]).read_bytes()
+
+    def add(self, key: str, url: str, status: int, headers: dict, body: bytes):
+        digest = hashlib.sha256(body).hexdigest()
+        self.bodies.mkdir(parents=True, exist_ok=True)
+        target = self.bodies / digest
+        if not target.exists():
+            tmp = target.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(body)
+            os.replace(tmp, target)
+        entry = {
+            "run": RUN_ID,
+            "key": key,
+            "url": url,
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() not in DROPPED_HEADERS},
+            "body": digest,
+        }
+        # One O_APPEND write per entry so parallel workers never interleave lines.
+        fd = os.open(self.index, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, (json.dumps(entry) + "\n").encode())
+        finally:
+            os.close(fd)
+        self.entries.setdefault(key, []).append(entry)
+
+
+_store: Optional[Store] = None
+_misses: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def store() -> Store:
+    global _store
+    if _store is None:
+        _store = Store()
+    return _store
+
+
+async def attach(context):
+    """Route ``context``'s external requests according to ``TOOLS_NETWORK``."""
+    current = mode()
+    if current == "live":
+        return
+    recorded = store()
+    served: dict[str, int] = defaultdict(int)
+    misses = _misses[context] = []
+
+    async def record(route, request, key):
+        response = await route.fetch()
+        body = await response.body()
+        recorded.add(key, request.url, response.status, response.headers, body)
+        await route.fulfill(response=response, body=body)
+
+    async def handle(route, request):
+        if any(marker in request.url for marker in STREAMING):
+            return await (route.continue_() if current == "record" else route.abort("internetdisconnected"))
+        key = request_key(request)
+        if current == "record":
+            return await record(route, request, key)
+
+        entry = recorded.get(key, served[key])
+        served[key] += 1
+        if entry is not None:
+            return await route.fulfill(status=entry["status"], headers=entry["headers"], body=recorded.body(entry))
+        if current == "offline":
+            misses.append(key)
+            return await route.abort("internetdisconnected")
+        await record(route, request, key)
+
+    await context.route(is_external, handle)
+
+
+def unrecorded(context) -> list[str]:
+    """Requests an ``offline`` context had to abort."""
+    return list(_misses.get(context, ()))
@@ -0,0 +1,23 @@
+"""Page objects for the dashboard surfaces the flows drive.
+
+Elements resolve through ``data-testid`` or ARIA roles, and through a text
+filter where nothing else identifies them (a routine card by title, a
+LunchCount chip by student name). Everything is a ``Locator``, resolved
+when it is acted on.
+"""
+from .admin import AdminSettings, FeaturePermissions, PermissionCard, RoutinesLibrary
+from .dock import Dock
+from .widgets import CHIP, HOT_ZONE, UNASSIGNED_ZONE, LunchCount, WidgetSettings
+
+__all__ = [
+    "CHIP",
+    "HOT_ZONE",
+    "UNASSIGNED_ZONE",
+    "AdminSettings",
+    "Dock",
+    "FeaturePermissions",
+    "LunchCount",
+    "PermissionCard",
+    "RoutinesLibrary",
+    "WidgetSettings",
+]
@@ -0,0 +1,103 @@
+"""Admin Settings and the Feature Permissions / Instructional Routines screens inside it."""
+from playwright.async_api import Locator, Page, TimeoutError, expect
+
+from readiness import wait_for_animations, wait_for_auth
+
+PERMISSION_CARD = '[data-testid="widget-permission-card"]'
+ROUTINE_CARD = '[data-testid="routine-card"]'
+
+
+class AdminSettings:
+    """The Admin Settings dialog opened from the sidebar header."""
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.button: Locator = page.get_by_role("button", name="Admin Settings")
+        # The heading (and so the accessible name) follows the selected tab.
+        self.dialog: Locator = page.locator('[role="dialog"][aria-labelledby="admin-settings-title"]')
+        self.permissions = FeaturePermissions(page, self.dialog)
+
+    async def open(self, timeout: int = 10000) -> "AdminSettings":
+        await wait_for_auth(self.page, admin=True, timeout=timeout)
+        await self.button.click()
+        await self.dialog.wait_for(state="visible", timeout=timeout)
+        await wait_for_animations(self.dialog, timeout)
+        return self
+
+    def tab(self, label: str) -> Locator:
+        return self.dialog.get_by_role("tab", name=label)
+
+    async def select(self, label: str):
+        tab = self.tab(label)
+        await tab.click()
+        await expect(tab).to_have_attribute("aria-selected", "true")
+
+    async def close(self, timeout: int = 10000):
+        """Escape out of any nested editor and the dialog itself."""
+        for _ in range(3):
+            await self.page.keyboard.press("Escape")
+            try:
+                await self.dialog.wait_for(state="hidden", timeout=timeout // 3)
+                return
+            except TimeoutError:
+                continue
+        await self.dialog.wait_for(state="hidden", timeout=timeout)
+
+
+class FeaturePermissions:
+    """The Feature Permissions tab: one card per widget type."""
+
+    def __init__(self, page: Page, dialog: Locator):
+        self.page = page
+        self.panel: Locator = dialog.get_by_role("tabpanel", name="Feature Permissions")
+
+    async def wait(self, timeout: int = 10000) -> "FeaturePermissions":
+        await self.panel.locator(PERMISSION_CARD).first.wait_for(state="visible", timeout=timeout)
+        return self
+
+    def card(self, widget_type: str) -> "PermissionCard":
+        return PermissionCard(self.page, self.panel.locator(f'{PERMISSION_CARD}[data-widget-type="{widget_type}"]'))
+
+
+class PermissionCard:
+    def __init__(self, page: Page, root: Locator):
+        self.page = page
+        self.root = root
+        self.configure_button: Locator = root.get_by_title("Edit widget configuration")
+
+    async def configure(self, timeout: int = 10000):
+        """Open the widget's configuration modal."""
+        await self.root.scroll_into_view_if_needed(timeout=timeout)
+        await self.configure_button.click(timeout=timeout)
+
+    async def open_routines_library(self, timeout: int = 10000) -> "RoutinesLibrary":
+        await self.configure(timeout)
+        return await RoutinesLibrary(self.page).wait(timeout)
+
+
+class RoutinesLibrary:
+    """InstructionalRoutinesManager: the admin's routine list and its editor."""
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.root: Locator = page.get_by_test_id("routines-library")
+        self.heading: Locator = self.root.get_by_role("heading", name="Instructional Routines Library")
+        self.editor: Locator = page.get_by_test_id("routine-editor")
+
+    async def wait(self, timeout: int = 10000) -> "RoutinesLibrary":
+        await self.heading.wait_for(state="visible", timeout=timeout)
+        await wait_for_animations(self.root, timeout)
+        return self
+
+    def card(self, routine_id: str) -> Locator:
+        return self.root.locator(f'{ROUTINE_CARD}[data-routine-id="{routine_id}"]')
+
+    def card_named(self, name: str) -> Locator:
+        """The card titled ``name``; ids differ between the built-in and saved routines."""
+        return self.root.locator(ROUTINE_CARD).filter(has=self.page.get_by_text(name, exact=True))
+
+    async def edit(self, name: str, timeout: int = 10000) -> Locator:
+        await self.card_named(name).get_by_title("Edit Routine", exact=True).click(timeout=timeout)
+        await self.editor.wait_for(state="visible", timeout=timeout)
+        await wait_for_animations(self.editor, timeout)
+        return self.editor
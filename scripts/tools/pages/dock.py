@@ -0,0 +1,28 @@
+"""The tool dock along the bottom of the dashboard."""
+from playwright.async_api import Locator, Page
+
+from dashboard import DOCK_TOOL, add_widget, open_dock
+from readiness import scroll_to_end
+
+
+class Dock:
+    def __init__(self, page: Page):
+        self.page = page
+        self.root: Locator = page.get_by_test_id("dock")
+        self.open_button: Locator = page.get_by_title("Open Tools")
+        # The tool strip scrolls horizontally (vertically for a side dock).
+        self.scroller: Locator = self.root.locator(".overflow-x-auto, .overflow-y-auto").first
+
+    async def open(self) -> Locator:
+        """Expand the dock if it is collapsed and wait for it to settle."""
+        return await open_dock(self.page)
+
+    def tool(self, tool_id: str) -> Locator:
+        return self.page.locator(f'{DOCK_TOOL}[data-tool-id="{tool_id}"]')
+
+    async def add(self, tool_id: str, timeout: int = 10000) -> Locator:
+        """Click ``tool_id`` and return the widget it adds."""
+        return await add_widget(self.page, tool_id, timeout)
+
+    async def scroll_to_end(self):
+        await scroll_to_end(self.scroller)
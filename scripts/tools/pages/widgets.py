@@ -0,0 +1,83 @@
+"""Widgets on the dashboard and the settings side they flip to."""
+import asyncio
+from typing import Optional
+
+from playwright.async_api import Locator, Page
+
+from dashboard import set_settings_open
+from readiness import SETTINGS_PANEL, wait_for_animations
+
+from .dock import Dock
+
+HOT_ZONE = '[data-testid="hot-zone"]'
+UNASSIGNED_ZONE = '[data-testid="unassigned-zone"]'
+# dnd-kit's useDraggable sets aria-roledescription on every chip.
+CHIP = '[aria-roledescription="draggable"]'
+
+
+class WidgetSettings:
+    """A widget's settings popover, flipped open and closed with Alt+S."""
+
+    def __init__(self, page: Page, widget: Locator):
+        self.page = page
+        self.widget = widget
+        self.panel: Locator = page.locator(SETTINGS_PANEL).last
+        self.close_button: Locator = self.panel.get_by_role("button", name="Close settings")
+
+    async def open(self) -> Locator:
+        return await set_settings_open(self.page, self.widget, open=True)
+
+    async def close(self):
+        await set_settings_open(self.page, self.widget, open=False)
+
+
+class LunchCount:
+    TOOL_ID = "lunchCount"
+
+    def __init__(self, page: Page, root: Locator):
+        self.page = page
+        self.root = root
+        self.hot_zone: Locator = root.locator(HOT_ZONE)
+        self.unassigned_zone: Locator = root.locator(UNASSIGNED_ZONE)
+        self.settings = WidgetSettings(page, root)
+
+    @classmethod
+    async def add(cls, page: Page, timeout: int = 10000) -> "LunchCount":
+        """Add a LunchCount from the dock and wait for it to finish animating in."""
+        dock = Dock(page)
+        await dock.open()
+        widget = await dock.add(cls.TOOL_ID, timeout)
+        await wait_for_animations(widget, timeout)
+        return cls(page, widget)
+
+    def chips(self, zone: Optional[Locator] = None) -> Locator:
+        return (zone or self.root).locator(CHIP)
+
+    def chip(self, name: str) -> Locator:
+        """The chip for student ``name``, wherever it currently is."""
+        return self.chips().filter(has=self.page.get_by_text(name, exact=True))
+
+    async def set_roster(self, names: list[str]):
+        """Switch to a custom roster of ``names`` through the settings side."""
+        panel = await self.settings.open()
+        await panel.get_by_role("button", name="Custom", exact=True).click()
+        await panel.locator("textarea").fill("\n".join(names))
+        await self.settings.close()
+        await self.chips().nth(len(names) - 1).wait_for(state="attached")
+        await wait_for_animations(self.root)
+
+    async def drag(self, name: str, zone: Locator, steps: int = 10):
+        """Drag ``name``'s chip onto ``zone`` with real mouse moves."""
+        chip = self.chip(name)
+        await chip.scroll_into_view_if_needed()
+        chip_box, zone_box = await asyncio.gather(chip.bounding_box(), zone.bounding_box())
+        if chip_box is None or zone_box is None:
+            raise AssertionError(f"Cannot drag {name!r}: chip or drop zone is not on screen")
+        sx, sy = chip_box["x"] + chip_box["width"] / 2, chip_box["y"] + chip_box["height"] / 2
+        await self.page.mouse.move(sx, sy)
+        await self.page.mouse.down()
+        # Clear dnd-kit's 10px MouseSensor activation distance first.
+        await self.page.mouse.move(sx + 12, sy, steps=2)
+        await self.page.mouse.move(zone_box["x"] + zone_box["width"] / 2, zone_box["y"] + zone_box["height"] / 2, steps=steps)
+        await self.page.mouse.up()
+        await wait_for_animations(self.root)
@@ -0,0 +1,433 @@
+"""Performance budget gate: timing history per commit and device, checked at merge time.
+
+``record`` stores the step timings of a run (timing.py's JSONL) and, from
+``run_flows.py``, each flow's total duration in a SQLite database, keyed by
+git commit and device profile. ``check`` then judges the current commit's
+samples two ways:
+
+* **budgets** - declared p50 limits for the interactions teachers feel most
+  (``BUDGETS`` below), stricter on the desktop profile than on the
+  throttled ones;
+* **change detection** - against the samples of the last ``--history``
+  commits: a one-sided Mann-Whitney U test when both sides have enough
+  samples, otherwise a robust z-score (median / MAD, the spread never
+  taken as less than ``SPREAD_FLOOR`` of the median). A metric regresses
+  when the slowdown is significant at ``--alpha`` *and* at least
+  ``--min-change`` of the historical median, so noise alone does not fail
+  a build. Until a metric has ``MIN_HISTORY_SAMPLES`` samples from
+  ``MIN_HISTORY_COMMITS`` earlier commits it reports "insufficient
+  history" and only its budget applies.
+
+History is drawn from the checked commit's own ancestry (when git knows
+it) and leaves out ``<sha>-dirty`` samples, which pool whatever edits were
+in the working tree at the time; ``--include-dirty`` keeps them.
+
+Budgeted steps and flow totals gate the build (exit 1); with
+``--all-steps`` every recorded step does. Each row shows the trend of
+per-commit medians, and an SVG chart per device goes to
+``test-results/tools/perf/``.
+
+The database defaults to ``scripts/tools/.cache/perf/history.sqlite``
+(``TOOLS_PERF_DB`` or ``--db`` to share one, e.g. a CI cache).
+
+Usage:
+
+    python scripts/tools/run_flows.py --repeat 5 --gate       # run, record, check
+    python scripts/tools/perf_gate.py record test-results/tools/timings/RUN.jsonl
+    python scripts/tools/perf_gate.py check --history 20 --all-steps
+    python scripts/tools/perf_gate.py trend --flow debug_landing
+"""
+import argparse
+import json
+import math
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from charts import line_chart
+from harness import ARTIFACT_DIR, REPO_ROOT, RUN_ID, TOOLS_DIR
+from timing import TIMINGS_DIR
+from timing_report import load
+
+DB_PATH = Path(os.environ.get("TOOLS_PERF_DB", TOOLS_DIR / ".cache" / "perf" / "history.sqlite"))
+PERF_DIR = ARTIFACT_DIR / "perf"
+
+# Step name under which a flow's total duration is stored.
+FLOW_TOTAL = "(flow)"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run TEXT NOT NULL,
+    source TEXT NOT NULL,
+    commit_sha TEXT NOT NULL,
+    recorded REAL NOT NULL,
+    PRIMARY KEY (run, source)
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run TEXT NOT NULL,
+    commit_sha TEXT NOT NULL,
+    device TEXT NOT NULL,
+    flow TEXT NOT NULL,
+    step TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    recorded REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_by_key ON samples (device, flow, step, metric, commit_sha);
+"""
+
+# Change detection needs this much history before it judges a metric.
+MIN_HISTORY_SAMPLES = 5
+MIN_HISTORY_COMMITS = 3
+# Smallest spread the robust z-score assumes, as a fraction of the median:
+# a few identical samples would otherwise make any difference "significant".
+SPREAD_FLOOR = 0.05
+
+_SPARKS = "▁▂▃▄▅▆▇█"
+
+
+@dataclass(frozen=True)
+class Budget:
+    label: str
+    flow: str
+    step: str
+    desktop_ms: float
+    # Any profile with CPU or network throttling (see devices.py).
+    throttled_ms: float
+
+    def limit(self, device: str) -> float:
+        return self.desktop_ms if device == "desktop" else self.throttled_ms
+
+
+BUDGETS = (
+    # goto until the dock is mounted and auth has resolved: the board is usable.
+    Budget("Landing time to interactive", "debug_landing", "Loading landing page", 2500, 8000),
+    Budget("Admin Settings open", "debug_admin_settings", "Opening Admin Settings", 800, 2500),
+    Budget("Routines library open", "verify_instructional_routines_manager", "Opening Routines library", 1000, 3000),
+    Budget("Dock scroll", "verify_dock_icons", "Scrolling dock to end", 600, 2000),
+)
+
+
+def git_commit() -> str:
+    """Short HEAD, with ``-dirty`` when the working tree has uncommitted changes."""
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True).stdout.strip()
+
+    head = git("rev-parse", "--short", "HEAD") or "nogit"
+    return f"{head}-dirty" if git("status", "--porcelain", "--untracked-files=no") else head
+
+
+def connect(path: Path = DB_PATH) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path)
+    db.executescript(_SCHEMA)
+    return db
+
+
+def _claim(db, run: str, source: str, commit: str) -> bool:
+    """Mark ``run`` as recorded from ``source``; False if it already was."""
+    cursor = db.execute(
+        "INSERT OR IGNORE INTO runs (run, source, commit_sha, recorded) VALUES (?, ?, ?, ?)",
+        (run, source, commit, time.time()),
+    )
+    return cursor.rowcount == 1
+
+
+def record_steps(db, entries: list[dict], commit: str) -> int:
+    """Store the passing steps of timing entries (any number of runs); returns the samples added."""
+    added = 0
+    now = time.time()
+    for run in dict.fromkeys(e["run"] for e in entries):
+        if not _claim(db, run, "steps", commit):
+            continue
+        rows = []
+        for e in entries:
+            if e["run"] != run or e.get("error") is not None:
+                continue
+            device = e.get("device") or "desktop"
+            rows.append((run, commit, device, e["flow"], e["step"], "duration_ms", e["duration_ms"], now))
+            if e.get("long_task_ms") is not None:
+                rows.append((run, commit, device, e["flow"], e["step"], "long_task_ms", e["long_task_ms"], now))
+        db.executemany("INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        added += len(rows)
+    db.commit()
+    return added
+
+
+def record_flows(db, run: str, device: str, results, commit: str) -> int:
+    """Store each passing flow's total duration (``FlowResult``s or their dicts)."""
+    if not _claim(db, run, f"flows:{device}", commit):
+        return 0
+    now = time.time()
+    rows = []
+    for r in results:
+        r = r if isinstance(r, dict) else vars(r)
+        if r["passed"]:
+            rows.append((run, commit, device, r["name"], FLOW_TOTAL, "duration_ms", r["duration"] * 1000, now))
+    db.executemany("INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    db.commit()
+    return len(rows)
+
+
+def commit_order(db) -> list[str]:
+    """Commits oldest first, by when they were first recorded."""
+    return [c for c, in db.execute("SELECT commit_sha FROM runs GROUP BY commit_sha ORDER BY MIN(recorded)")]
+
+
+def ancestors(commit: str, limit: int = 5000) -> Optional[set[str]]:
+    """Full SHAs of ``commit`` and its recent ancestors; None when git does not know it."""
+    base = commit.split("-dirty")[0]
+    out = subprocess.run(
+        ["git", "rev-list", f"--max-count={limit}", base, "--"], cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    return set(out.stdout.split()) if out.returncode == 0 else None
+
+
+def history_commits(db, commit: str, history: int, include_dirty: bool = False) -> list[str]:
+    """The last ``history`` recorded commits to compare ``commit`` with, oldest first."""
+    earlier = [c for c in commit_order(db) if c != commit and (include_dirty or not c.endswith("-dirty"))]
+    line = ancestors(commit)
+    if line is not None:
+        # Leave out commits from other branches.
+        earlier = [c for c in earlier if any(sha.startswith(c.split("-dirty")[0]) for sha in line)]
+    return earlier[-history:]
+
+
+def values(db, device: str, flow: str, step: str, commits: list[str], metric: str = "duration_ms") -> dict[str, list[float]]:
+    if not commits:
+        return {}
+    marks = ", ".join("?" * len(commits))
+    out: dict[str, list[float]] = {c: [] for c in commits}
+    for commit, value in db.execute(
+        f"SELECT commit_sha, value FROM samples WHERE device = ? AND flow = ? AND step = ? AND metric = ? "
+        f"AND commit_sha IN ({marks})",
+        (device, flow, step, metric, *commits),
+    ):
+        out[commit].append(value)
+    return out
+
+
+# Change detection
+
+
+def mann_whitney_greater(current: list[float], history: list[float]) -> float:
+    """One-sided p-value that ``current`` is stochastically larger (normal approximation, tie-corrected)."""
+    n1, n2 = len(current), len(history)
+    combined = sorted([(v, True) for v in current] + [(v, False) for v in history])
+    rank_sum = ties = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        count = j - i + 1
+        ties += count**3 - count
+        rank_sum += (i + j + 2) / 2 * sum(1 for k in range(i, j + 1) if combined[k][1])
+        i = j + 1
+    n = n1 + n2
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 1 - statistics.NormalDist().cdf(z)
+
+
+def detect(current: list[float], history: list[float], alpha: float, min_change: float, commits: Optional[int] = None) -> dict:
+    """Is ``current`` slower than ``history`` (samples from ``commits`` earlier commits) beyond noise?"""
+    result = {"history_p50": None, "change": None, "p": None, "method": None, "regressed": False, "improved": False}
+    if not current or not history:
+        return result
+    now, before = statistics.median(current), statistics.median(history)
+    result.update(history_p50=before, change=now / before - 1 if before else None)
+    if len(history) < MIN_HISTORY_SAMPLES or (commits is not None and commits < MIN_HISTORY_COMMITS):
+        result["method"] = "insufficient history"
+        return result
+    if len(current) >= 3:
+        slower = mann_whitney_greater(current, history)
+        faster = mann_whitney_greater(history, current)
+        result["method"] = "mann-whitney"
+    else:
+        # Too few samples for a rank test: distance from the historical median in robust SDs.
+        mad = statistics.median(abs(v - before) for v in history) * 1.4826
+        z = (now - before) / max(mad, abs(before) * SPREAD_FLOOR, 1e-9)
+        slower, faster = 1 - statistics.NormalDist().cdf(z), statistics.NormalDist().cdf(z)
+        result["method"] = "robust-z"
+    result["p"] = slower
+    change = result["change"] or 0
+    result["regressed"] = slower < alpha and change >= min_change
+    result["improved"] = faster < alpha and change <= -min_change
+    return result
+
+
+def sparkline(points: list[Optional[float]]) -> str:
+    known = [p for p in points if p is not None]
+    if not known:
+        return ""
+    low, high = min(known), max(known)
+    return "".join(
+        " " if p is None else _SPARKS[int((p - low) / ((high - low) or 1) * (len(_SPARKS) - 1))] for p in points
+    )
+
+
+def check(
+    db,
+    commit: str,
+    history: int = 10,
+    alpha: float = 0.01,
+    min_change: float = 0.1,
+    all_steps: bool = False,
+    devices: Optional[list[str]] = None,
+    include_dirty: bool = False,
+) -> list[dict]:
+    """One row per gated (device, flow, step) with samples at ``commit``."""
+    earlier = history_commits(db, commit, history, include_dirty)
+    budgets = {(b.flow, b.step): b for b in BUDGETS}
+    keys = db.execute(
+        "SELECT DISTINCT device, flow, step FROM samples WHERE commit_sha = ? AND metric = 'duration_ms' "
+        "ORDER BY device, flow, step",
+        (commit,),
+    ).fetchall()
+
+    rows = []
+    for device, flow, step in keys:
+        if devices and device not in devices:
+            continue
+        budget = budgets.get((flow, step))
+        if not (budget or all_steps or step == FLOW_TOTAL):
+            continue
+        by_commit = values(db, device, flow, step, earlier + [commit])
+        current = by_commit.pop(commit)
+        past = [v for c in earlier for v in by_commit.get(c, [])]
+        p50 = statistics.median(current)
+        row = {
+            "device": device,
+            "flow": flow,
+            "step": step,
+            "label": budget.label if budget else None,
+            "n": len(current),
+            "p50_ms": p50,
+            "budget_ms": budget.limit(device) if budget else None,
+            "history_n": len(past),
+            "trend": [statistics.median(by_commit[c]) if by_commit.get(c) else None for c in earlier] + [p50],
+            **detect(current, past, alpha, min_change, sum(1 for c in earlier if by_commit.get(c))),
+        }
+        row["over_budget"] = bool(budget) and p50 > row["budget_ms"]
+        row["failed"] = row["over_budget"] or row["regressed"]
+        rows.append(row)
+    return rows
+
+
+def print_check(rows: list[dict], commit: str, history: list[str]):
+    def ms(value):
+        return "-" if value is None else f"{value:.0f}ms"
+
+    print(f"Performance gate for {commit} against {len(history)} earlier commit(s)")
+    print(f"{'Metric':<44} {'Device':<14} {'n':>3} {'p50':>8} {'budget':>8} {'before':>8} {'change':>7} {'p':>6}  {'verdict':<20} trend")
+    for r in rows:
+        name = r["label"] or (f"{r['flow']} total" if r["step"] == FLOW_TOTAL else f"{r['flow']}: {r['step']}")
+        verdict = (
+            "OVER BUDGET" if r["over_budget"]
+            else "REGRESSED" if r["regressed"]
+            else "improved" if r["improved"]
+            else "insufficient history" if r["method"] == "insufficient history"
+            else "ok"
+        )
+        change = "-" if r["change"] is None else f"{r['change']:+.0%}"
+        p = "-" if r["p"] is None else f"{r['p']:.3f}"
+        print(
+            f"{name[:44]:<44} {r['device'][:14]:<14} {r['n']:>3} {ms(r['p50_ms']):>8} {ms(r['budget_ms']):>8} "
+            f"{ms(r['history_p50']):>8} {change:>7} {p:>6}  {verdict:<20} {sparkline(r['trend'])}"
+        )
+
+
+def write_trend_charts(rows: list[dict], commit: str) -> list[str]:
+    """One SVG per device: per-commit p50 of the budgeted metrics, oldest commit at x=1."""
+    paths = []
+    for device in dict.fromkeys(r["device"] for r in rows):
+        series = {
+            (r["label"] or r["step"]): [(i + 1, v) for i, v in enumerate(r["trend"]) if v is not None]
+            for r in rows
+            if r["device"] == device and r["label"]
+        }
+        if not series:
+            continue
+        path = PERF_DIR / f"{RUN_ID}-{commit}-{device}.svg"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(line_chart(series, f"Budgeted timings on {device}, last commits", "commit", "p50 ms"))
+        paths.append(str(path))
+    return paths
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", type=Path, default=DB_PATH, help=f"history database (default: {DB_PATH})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    add = sub.add_parser("record", help="store timing traces (default: the latest run) or run_flows.py --report files")
+    add.add_argument("paths", nargs="*", type=Path)
+    add.add_argument("--commit", help="record under this commit (default: HEAD)")
+    gate = sub.add_parser("check", help="apply budgets and change detection to a commit")
+    gate.add_argument("--commit", help="commit to check (default: HEAD)")
+    gate.add_argument("--device", action="append", help="only these device profiles")
+    gate.add_argument("--history", type=int, default=10, help="earlier commits to compare with")
+    gate.add_argument("--alpha", type=float, default=0.01, help="significance level for a slowdown")
+    gate.add_argument("--min-change", type=float, default=0.1, help="smallest relative slowdown that fails")
+    gate.add_argument("--all-steps", action="store_true", help="gate every step, not just budgeted ones and flow totals")
+    gate.add_argument("--include-dirty", action="store_true", help="also compare with samples from uncommitted trees")
+    gate.add_argument("--json", help="also write the rows to this file")
+    trend = sub.add_parser("trend", help="per-commit p50 of one flow's steps")
+    trend.add_argument("--flow", required=True)
+    trend.add_argument("--device", default="desktop")
+    trend.add_argument("--history", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    db = connect(args.db)
+    if args.command == "record":
+        commit = args.commit or git_commit()
+        paths = args.paths or sorted(TIMINGS_DIR.glob("*.jsonl"))[-1:]
+        added = 0
+        for path in paths:
+            if path.suffix == ".json":
+                report = json.loads(path.read_text())
+                for run in report["runs"]:
+                    added += record_flows(db, path.stem, run["device"] or "desktop", run["results"], commit)
+            else:
+                added += record_steps(db, load([path]), commit)
+        print(f"Recorded {added} sample(s) for {commit} in {args.db}")
+        return 0
+
+    if args.command == "trend":
+        commits = commit_order(db)[-args.history :]
+        steps = [s for s, in db.execute("SELECT DISTINCT step FROM samples WHERE flow = ? AND device = ?", (args.flow, args.device))]
+        print(f"{'Step':<40} " + " ".join(f"{c[:9]:>9}" for c in commits))
+        for step in steps:
+            by_commit = values(db, args.device, args.flow, step, commits)
+            cells = [f"{statistics.median(v):>7.0f}ms" if v else f"{'-':>9}" for v in by_commit.values()]
+            print(f"{step[:40]:<40} " + " ".join(cells))
+        return 0
+
+    commit = args.commit or git_commit()
+    rows = check(db, commit, args.history, args.alpha, args.min_change, args.all_steps, args.device, args.include_dirty)
+    if not rows:
+        print(f"No samples recorded for {commit}; run the flows with --gate or use 'record' first", file=sys.stderr)
+        return 1
+    print_check(rows, commit, history_commits(db, commit, args.history, args.include_dirty))
+    for path in write_trend_charts(rows, commit):
+        print(f"Trend: {path}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+    failed = [r for r in rows if r["failed"]]
+    if failed:
+        print(f"FAILED: {len(failed)} metric(s) over budget or slower than the last commits", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
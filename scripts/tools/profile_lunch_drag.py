@@ -0,0 +1,295 @@
+"""LunchCount drag profiler: frame pacing and long tasks vs. roster size.
+
+Adds a LunchCount widget, loads a custom roster of each requested size
+through the settings textarea (the same path as verify_lunch_count.py) and
+drags chips between "Unassigned" and "Hot Lunch" with ``page.mouse``. While
+each drag runs, an in-page probe records every ``requestAnimationFrame``
+timestamp plus ``longtask`` and ``long-animation-frame`` entries, so the
+numbers are not skewed by the Playwright round trips that drive the mouse.
+
+Per drag it reports frame count, p50/p95/max frame time, dropped frames
+(frames late by more than half a refresh interval, measured against the idle
+frame rate sampled before the drag) and long-task time, then aggregates per
+roster size and step count. ``--cpu-throttle`` slows an unthrottled device
+profile down (through devices.py, like ``--device``); the throttled profiles
+bring their own rate and do not take it. The rate in effect is printed with
+the results.
+
+Usage:
+
+    python scripts/tools/profile_lunch_drag.py
+    python scripts/tools/profile_lunch_drag.py --sizes 25,100,300 --steps 10,40 --drags 6
+    python scripts/tools/profile_lunch_drag.py --cpu-throttle 4 --json drag.json
+"""
+import argparse
+import asyncio
+import dataclasses
+import json
+import statistics
+import sys
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import devices
+import tracebuffer
+from dashboard import add_widget, open_dock, set_settings_open
+from devserver import server
+from harness import BASE_URL, VIEWPORT, Flow, run_many
+from pages import CHIP, HOT_ZONE, UNASSIGNED_ZONE
+from readiness import wait_for_animations, wait_for_auth, wait_for_dashboard
+from timing import step
+from timing_report import percentile
+
+# Idle frame interval, used as the refresh period for dropped-frame counting.
+_IDLE_FRAME_JS = """
+() => new Promise((resolve) => {
+  const stamps = [];
+  const tick = (t) => {
+    stamps.push(t);
+    if (stamps.length < 12) return requestAnimationFrame(tick);
+    const gaps = stamps.slice(1).map((t, i) => t - stamps[i]).sort((a, b) => a - b);
+    resolve(gaps[Math.floor(gaps.length / 2)]);
+  };
+  requestAnimationFrame(tick);
+})
+"""
+
+_START_PROBE_JS = """
+() => {
+  const probe = (window.__dragProbe = { frames: [], longTasks: [], loafs: [], running: true, observers: [] });
+  const tick = (t) => {
+    if (!probe.running) return;
+    probe.frames.push(t);
+    requestAnimationFrame(tick);
+  };
+  requestAnimationFrame(tick);
+  for (const [type, sink] of [['longtask', probe.longTasks], ['long-animation-frame', probe.loafs]]) {
+    try {
+      const observer = new PerformanceObserver((list) => {
+        for (const e of list.getEntries()) sink.push({ start: e.startTime, duration: e.duration });
+      });
+      observer.observe({ type });
+      probe.observers.push(observer);
+    } catch (e) {
+      // Entry type unsupported in this browser; that series stays empty.
+    }
+  }
+}
+"""
+
+_STOP_PROBE_JS = """
+() => new Promise((resolve) => {
+  const probe = window.__dragProbe;
+  // One more frame so the drop's render is included, then flush observers.
+  requestAnimationFrame(() => setTimeout(() => {
+    probe.running = false;
+    for (const observer of probe.observers) {
+      for (const e of observer.takeRecords()) {
+        const sink = e.entryType === 'longtask' ? probe.longTasks : probe.loafs;
+        sink.push({ start: e.startTime, duration: e.duration });
+      }
+      observer.disconnect();
+    }
+    resolve({ frames: probe.frames, longTasks: probe.longTasks, loafs: probe.loafs });
+  }, 0));
+})
+"""
+
+
+@dataclass
+class DragSample:
+    roster: int
+    steps: int
+    direction: str
+    frames: int = 0
+    duration_ms: float = 0.0
+    frame_p50_ms: Optional[float] = None
+    frame_p95_ms: Optional[float] = None
+    frame_max_ms: Optional[float] = None
+    dropped_frames: int = 0
+    long_tasks: int = 0
+    long_task_ms: float = 0.0
+    long_frames: int = 0
+    error: Optional[str] = None
+
+
+def analyze(sample: DragSample, probe: dict, refresh_ms: float):
+    frames = probe["frames"]
+    gaps = [b - a for a, b in zip(frames, frames[1:])]
+    sample.frames = len(frames)
+    sample.duration_ms = frames[-1] - frames[0] if len(frames) > 1 else 0.0
+    if gaps:
+        sample.frame_p50_ms = percentile(gaps, 50)
+        sample.frame_p95_ms = percentile(gaps, 95)
+        sample.frame_max_ms = max(gaps)
+        # A gap of k refresh periods means k - 1 frames were never presented.
+        sample.dropped_frames = sum(max(0, round(gap / refresh_ms) - 1) for gap in gaps)
+    sample.long_tasks = len(probe["longTasks"])
+    sample.long_task_ms = sum(t["duration"] for t in probe["longTasks"])
+    sample.long_frames = len(probe["loafs"])
+
+
+async def idle_frame_interval(page) -> float:
+    """Median frame interval while nothing is happening, i.e. the refresh period."""
+    return await page.evaluate(_IDLE_FRAME_JS)
+
+
+async def load_roster(page, widget, size: int):
+    names = "\n".join(f"Student {i:03d}" for i in range(1, size + 1))
+    panel = await set_settings_open(page, widget, open=True)
+    await panel.get_by_role("button", name="Custom", exact=True).click()
+    await panel.locator("textarea").fill(names)
+    await set_settings_open(page, widget, open=False)
+    await widget.locator(CHIP).nth(size - 1).wait_for(state="attached")
+    await wait_for_animations(widget)
+
+
+async def center(locator) -> tuple[float, float]:
+    box = await locator.bounding_box()
+    if box is None:
+        raise AssertionError(f"{locator} has no bounding box")
+    return box["x"] + box["width"] / 2, box["y"] + box["height"] / 2
+
+
+async def drag(page, widget, source: str, target: str, steps: int, refresh_ms: float, sample: DragSample):
+    chip = widget.locator(source).locator(CHIP).first
+    await chip.scroll_into_view_if_needed()
+    (sx, sy), (tx, ty) = await asyncio.gather(center(chip), center(widget.locator(target)))
+
+    await page.evaluate(_START_PROBE_JS)
+    await page.mouse.move(sx, sy)
+    await page.mouse.down()
+    # Clear dnd-kit's 10px MouseSensor activation distance before the timed path.
+    await page.mouse.move(sx + 12, sy, steps=2)
+    await page.mouse.move(tx, ty, steps=steps)
+    await page.mouse.up()
+    analyze(sample, await page.evaluate(_STOP_PROBE_JS), refresh_ms)
+    await wait_for_animations(widget)
+
+
+def make_flow(samples: list, sizes: list[int], steps: list[int], drags: int, cpu_throttle: Optional[float] = None) -> Flow:
+    async def profile_lunch_drag(page):
+        async with step("Loading app"):
+            await page.goto(BASE_URL)
+            await wait_for_dashboard(page)
+            await wait_for_auth(page)
+        if cpu_throttle is not None:
+            # The harness applied the active profile already; this re-applies it with the override.
+            await devices.apply(page, dataclasses.replace(devices.current(), cpu_throttle=cpu_throttle))
+
+        async with step("Adding Lunch widget"):
+            await open_dock(page)
+            widget = await add_widget(page, "lunchCount")
+            await wait_for_animations(widget)
+        refresh_ms = await idle_frame_interval(page)
+        print(f"Idle frame interval: {refresh_ms:.1f}ms")
+
+        for size in sizes:
+            async with step(f"Loading roster of {size}"):
+                await load_roster(page, widget, size)
+            for n in steps:
+                # Alternate directions so the roster ends where it started.
+                for i in range(drags):
+                    source, target, direction = (
+                        (UNASSIGNED_ZONE, HOT_ZONE, "to hot") if i % 2 == 0 else (HOT_ZONE, UNASSIGNED_ZONE, "to unassigned")
+                    )
+                    sample = DragSample(size, n, direction)
+                    async with step(f"Drag {direction} ({size} students, {n} steps)"):
+                        try:
+                            await drag(page, widget, source, target, n, refresh_ms, sample)
+                        except Exception as e:
+                            sample.error = f"{type(e).__name__}: {e}"
+                            await page.mouse.up()
+                    samples.append(sample)
+
+    return Flow(name="profile_lunch_drag", func=profile_lunch_drag, module="profile_lunch_drag", viewport=VIEWPORT)
+
+
+def summarize(samples: list[DragSample]) -> list[dict]:
+    """One row per (roster size, steps), in the order they ran."""
+    groups: dict[tuple, list[DragSample]] = {}
+    for s in samples:
+        groups.setdefault((s.roster, s.steps), []).append(s)
+
+    rows = []
+    for (roster, steps), items in groups.items():
+        ok = [s for s in items if s.error is None]
+        frames = [s.frames for s in ok]
+        rows.append(
+            {
+                "roster": roster,
+                "steps": steps,
+                "drags": len(ok),
+                "failed": len(items) - len(ok),
+                "frame_p50_ms": statistics.median([s.frame_p50_ms for s in ok if s.frame_p50_ms is not None] or [0]),
+                "frame_p95_ms": statistics.median([s.frame_p95_ms for s in ok if s.frame_p95_ms is not None] or [0]),
+                "frame_max_ms": max((s.frame_max_ms or 0 for s in ok), default=0),
+                "dropped_pct": 100 * sum(s.dropped_frames for s in ok) / max(1, sum(frames) + sum(s.dropped_frames for s in ok)),
+                "long_tasks_per_drag": sum(s.long_tasks for s in ok) / len(ok) if ok else 0,
+                "long_task_ms_per_drag": sum(s.long_task_ms for s in ok) / len(ok) if ok else 0,
+            }
+        )
+    return rows
+
+
+def print_table(rows: list[dict]):
+    print(f"{'Roster':>6} {'Steps':>5} {'Drags':>5} {'p50':>7} {'p95':>7} {'max':>7} {'dropped':>8} {'LT/drag':>8} {'LTms/drag':>9}")
+    for r in rows:
+        print(
+            f"{r['roster']:>6} {r['steps']:>5} {r['drags']:>5} {r['frame_p50_ms']:>5.1f}ms {r['frame_p95_ms']:>5.1f}ms "
+            f"{r['frame_max_ms']:>5.0f}ms {r['dropped_pct']:>7.1f}% {r['long_tasks_per_drag']:>8.1f} "
+            f"{r['long_task_ms_per_drag']:>9.0f}"
+        )
+
+
+def int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int_list, default=[10, 50, 100, 200, 400], help="comma-separated roster sizes")
+    parser.add_argument("--steps", type=int_list, default=[10, 30], help="comma-separated mouse steps per drag")
+    parser.add_argument("--drags", type=int, default=4, help="drags per roster size and step count")
+    parser.add_argument(
+        "--cpu-throttle", type=float, help="CDP CPU slowdown factor, e.g. 4 (default: the device profile's)"
+    )
+    parser.add_argument("--json", help="write raw samples and the summary to this file")
+    parser.add_argument("--headed", action="store_true", help="show the browser")
+    args = parser.parse_args(argv)
+    tracebuffer.measuring()
+    profile = devices.current()
+    if args.cpu_throttle is not None and profile.cpu_throttle > 1 and args.cpu_throttle != profile.cpu_throttle:
+        parser.error(
+            f"--cpu-throttle {args.cpu_throttle:g} conflicts with the {profile.name} profile's "
+            f"{profile.cpu_throttle:g}x; drop one of them"
+        )
+    cpu_throttle = profile.cpu_throttle if args.cpu_throttle is None else args.cpu_throttle
+
+    samples: list[DragSample] = []
+    flow = make_flow(samples, args.sizes, args.steps, args.drags, args.cpu_throttle)
+    with server():
+        _, (result,) = asyncio.run(run_many([flow], headless=not args.headed))
+    if not result.passed:
+        print(f"Profiling aborted: {result.error}", file=sys.stderr)
+
+    rows = summarize(samples)
+    print(f"Device profile {profile.name}, CPU throttle {cpu_throttle:g}x")
+    print_table(rows)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "device": profile.name,
+                    "cpu_throttle": cpu_throttle,
+                    "summary": rows,
+                    "samples": [asdict(s) for s in samples],
+                },
+                f,
+                indent=2,
+            )
+    return 0 if result.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
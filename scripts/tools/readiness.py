@@ -0,0 +1,120 @@
+"""Readiness probes the scripts/tools flows wait on instead of fixed sleeps.
+
+Each probe resolves as soon as the app reports the state it is waiting for:
+either a DOM condition, the Web Animations API (``Animation.finished``) or,
+under ``VITE_AUTH_BYPASS``, the ``data-auth-ready`` / ``data-is-admin``
+attributes AuthContext sets on ``<html>``. All probes take a ``timeout`` in
+milliseconds and raise Playwright's ``TimeoutError`` when it runs out.
+Probes are coroutines for the async flow layer in ``flows.py``.
+"""
+DEFAULT_TIMEOUT = 15000
+
+DOCK = '[data-testid="dock"]'
+SETTINGS_PANEL = '[data-testid="settings-panel"]'
+
+# Resolves once every finite animation/transition on the target has finished.
+# Waits two frames first so transitions started by the triggering click are
+# already registered, and loops because finishing one animation can start
+# another (e.g. a modal's backdrop fade followed by its zoom-in).
+_SETTLE_JS = """
+async (el, timeout) => {
+  const root = el ?? document;
+  const frame = () => new Promise((r) => requestAnimationFrame(() => r()));
+  const settle = async () => {
+    await frame();
+    await frame();
+    for (;;) {
+      const running = root.getAnimations({ subtree: true }).filter(
+        (a) => a.playState !== 'finished' && a.effect?.getTiming().iterations !== Infinity
+      );
+      if (running.length === 0) return true;
+      await Promise.all(running.map((a) => a.finished.catch(() => null)));
+    }
+  };
+  const expired = new Promise((r) => setTimeout(() => r(false), timeout));
+  return Promise.race([settle(), expired]);
+}
+"""
+
+_AUTH_JS = """
+(admin) => {
+  const { authReady, isAdmin } = document.documentElement.dataset;
+  if (authReady === 'true') return !admin || isAdmin === 'true';
+  // Builds without VITE_AUTH_BYPASS publish no signal; fall back to the DOM.
+  return admin
+    ? !!document.querySelector('[aria-label="Admin Settings"], [title="Admin Settings"]')
+    : !!document.querySelector('[data-testid="dock"]');
+}
+"""
+
+
+async def wait_for_animations(target, timeout: int = DEFAULT_TIMEOUT):
+    """Wait until ``target`` (a Page or Locator) has no running finite animations."""
+    if hasattr(target, "goto"):
+        settled = await target.evaluate(f"(timeout) => ({_SETTLE_JS})(null, timeout)", timeout)
+    else:
+        await target.wait_for(state="attached", timeout=timeout)
+        settled = await target.evaluate(_SETTLE_JS, timeout)
+    if not settled:
+        from playwright.async_api import TimeoutError
+
+        raise TimeoutError(f"Animations did not settle within {timeout}ms")
+
+
+async def wait_for_dashboard(page, timeout: int = DEFAULT_TIMEOUT):
+    """Wait until the dashboard shell (dock) is mounted and the page has loaded."""
+    await page.wait_for_function(
+        f"document.readyState === 'complete' && !!document.querySelector('{DOCK}')",
+        timeout=timeout,
+    )
+
+
+async def wait_for_auth(page, admin: bool = False, timeout: int = DEFAULT_TIMEOUT):
+    """Wait until auth (and, with ``admin=True``, the isAdmin check) has resolved."""
+    await page.wait_for_function(_AUTH_JS, arg=admin, timeout=timeout)
+
+
+async def wait_for_dock_expanded(page, expanded: bool = True, timeout: int = DEFAULT_TIMEOUT):
+    """Wait for the dock to reach the expanded/collapsed state and finish animating."""
+    dock = page.locator(f'{DOCK}[data-expanded="{str(expanded).lower()}"]')
+    await dock.wait_for(state="attached", timeout=timeout)
+    await wait_for_animations(dock, timeout)
+    return dock
+
+
+async def wait_for_settings_panel(page, open: bool = True, timeout: int = DEFAULT_TIMEOUT):
+    """Wait for a widget's settings side to finish flipping open or closed."""
+    panel = page.locator(SETTINGS_PANEL).last
+    if open:
+        await panel.wait_for(state="visible", timeout=timeout)
+        await wait_for_animations(panel, timeout)
+    else:
+        await panel.wait_for(state="detached", timeout=timeout)
+    return panel
+
+
+async def wait_for_modal(page, name=None, open: bool = True, timeout: int = DEFAULT_TIMEOUT):
+    """Wait for a ``role="dialog"`` (optionally by accessible name) to open or close."""
+    dialog = page.get_by_role("dialog", name=name) if name else page.get_by_role("dialog")
+    dialog = dialog.last
+    if open:
+        await dialog.wait_for(state="visible", timeout=timeout)
+        await wait_for_animations(dialog, timeout)
+    else:
+        await dialog.wait_for(state="hidden", timeout=timeout)
+    return dialog
+
+
+async def scroll_to_end(locator, timeout: int = DEFAULT_TIMEOUT):
+    """Scroll ``locator`` fully right/down and wait for its ``scrollend`` event."""
+    await locator.evaluate(
+        """(el, timeout) => new Promise((resolve) => {
+          const targetLeft = el.scrollWidth - el.clientWidth;
+          const targetTop = el.scrollHeight - el.clientHeight;
+          if (el.scrollLeft >= targetLeft && el.scrollTop >= targetTop) return resolve();
+          el.addEventListener('scrollend', () => resolve(), { once: true });
+          setTimeout(resolve, timeout);
+          el.scrollTo({ left: el.scrollWidth, top: el.scrollHeight });
+        })""",
+        timeout,
+    )
@@ -0,0 +1,261 @@
+"""Run every scripts/tools flow against one shared browser.
+
+Usage (from the repo root):
+
+    python scripts/tools/run_flows.py                  # all flows
+    python scripts/tools/run_flows.py verify_lunch_count debug_landing
+    python scripts/tools/run_flows.py --list
+    python scripts/tools/run_flows.py --concurrency 4  # 4 pages at once in one event loop
+    python scripts/tools/run_flows.py --workers 4      # shard across 4 processes
+    python scripts/tools/run_flows.py --baseline       # also time each script on its own
+    python scripts/tools/run_flows.py --repeat 20      # sample step timings (see timing_report.py)
+    python scripts/tools/run_flows.py --network offline  # third-party traffic from the store (see netreplay.py)
+    python scripts/tools/run_flows.py --keep-server    # leave the preview server up for the next run
+    python scripts/tools/run_flows.py --device desktop --device chromebook  # same flows per device profile
+    python scripts/tools/run_flows.py --trace dom      # failure trace with a DOM snapshot per step (see tracebuffer.py)
+    python scripts/tools/run_flows.py --visual         # also diff screenshots against baselines (see screenshots.py)
+    python scripts/tools/run_flows.py --repeat 5 --gate  # record timings for this commit, fail on regressions (see perf_gate.py)
+
+The app on PLAYWRIGHT_BASE_URL (default http://localhost:3000) is used if it
+is already up; otherwise a cached build is served with ``pnpm run preview``
+for the duration of the run and shared by all workers (see devserver.py).
+
+Before the browser starts, the selected flows' titles, labels and test ids
+are checked against the sources (see selector_index.py); a selector that no
+longer exists in components/ fails the run immediately. ``--no-preflight``
+skips the check.
+
+Without ``--baseline`` the time saved is estimated from the measured browser
+start-up cost, which every standalone script pays once. With ``--baseline``
+each flow module is additionally run as its own process and the real
+wall-clock difference is reported.
+
+With ``--workers N`` the flows are split round-robin into N shards, each run
+in its own process with its own browser; screenshots get a ``.w<N>`` suffix
+and the shard results are merged into a single report. ``--concurrency``
+applies within each worker.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+
+import perf_gate
+import screenshots
+import tracebuffer
+from devices import DEFAULT as DEFAULT_DEVICE, PROFILES
+from devserver import MODES as SERVER_MODES, ServerError, server
+from harness import REPO_ROOT, RUN_ID, TOOLS_DIR, discover_flows, run_many, set_worker_id
+from netreplay import MODES
+from selector_index import preflight
+from timing import TIMINGS_DIR
+from timing_report import aggregate, compare_devices, load, print_comparison
+
+
+def run_shard(worker_id, names, headed=False, pool_size=None, concurrency=1, auth_cache=True, refresh_auth=False):
+    """Run ``names`` in one browser and return ``(startup_seconds, results)``."""
+    set_worker_id(worker_id)
+    registry = {f.name: f for f in discover_flows()}
+    flows = [registry[name] for name in names]
+    return asyncio.run(
+        run_many(
+            flows,
+            concurrency,
+            headless=not headed,
+            pool_size=pool_size,
+            auth_cache=auth_cache,
+            refresh_auth=refresh_auth,
+        )
+    )
+
+
+def run_sharded(flows, workers: int, **options):
+    """Split ``flows`` round-robin over ``workers`` processes and merge the results."""
+    shards = [[f.name for f in flows[i::workers]] for i in range(workers)]
+    shards = [s for s in shards if s]
+    # Playwright's driver does not survive fork(); always start fresh interpreters.
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=ctx) as executor:
+        futures = [
+            executor.submit(run_shard, worker_id, names, **options)
+            for worker_id, names in enumerate(shards)
+        ]
+        outcomes = [future.result() for future in futures]
+
+    order = {f.name: i for i, f in enumerate(flows)}
+    results = sorted((r for _, rs in outcomes for r in rs), key=lambda r: order[r.name])
+    startup = max(startup for startup, _ in outcomes)
+    return startup, results
+
+
+def run_baseline(flows) -> float:
+    """Run each flow module as a separate process, the way the scripts used to be run."""
+    start = time.perf_counter()
+    for module in dict.fromkeys(f.module for f in flows):
+        subprocess.run(
+            [sys.executable, str(TOOLS_DIR / f"{module}.py")],
+            cwd=REPO_ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    return time.perf_counter() - start
+
+
+def print_report(results, startup: float, total: float, baseline=None, workers: int = 1):
+    print()
+    print(f"{'Flow':<45} {'Result':<7} {'Time':>8}")
+    for r in results:
+        status = "PASS" if r.passed else "FAIL"
+        worker = "" if r.worker is None else f"  w{r.worker}"
+        print(f"{r.name:<45} {status:<7} {r.duration:>7.1f}s{worker}")
+        if r.error:
+            print(f"    {r.error.splitlines()[0]}")
+
+    passed = sum(r.passed for r in results)
+    serial = sum(r.duration for r in results)
+    print()
+    print(f"{passed}/{len(results)} flows passed in {total:.1f}s (browser start-up {startup:.1f}s)")
+    if serial > total:
+        print(f"Parallelism: flows alone add up to {serial:.1f}s ({workers} worker(s))")
+    if baseline is not None:
+        print(f"Standalone scripts took {baseline:.1f}s; saved {baseline - total:.1f}s")
+    else:
+        modules = len({r.module for r in results})
+        saved = startup * modules + serial - total
+        print(f"Estimated saving vs. {modules} standalone scripts: {saved:.1f}s")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("flows", nargs="*", help="flow or module names (default: all)")
+    parser.add_argument("--list", action="store_true", help="list discovered flows and exit")
+    parser.add_argument("--headed", action="store_true", help="show the browser")
+    parser.add_argument("--pool-size", type=int, help="spare contexts kept warm (default: --concurrency)")
+    parser.add_argument("--concurrency", "-c", type=int, default=1, help="flows run at once per browser")
+    parser.add_argument(
+        "--workers", "-j", type=int, default=1, help="worker processes, each with its own browser (0 = one per CPU)"
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="run every selected flow N times")
+    parser.add_argument("--report", help="also write the merged results to this JSON file")
+    parser.add_argument("--no-auth-cache", action="store_true", help="start admin flows from a cold context")
+    parser.add_argument("--refresh-auth", action="store_true", help="re-capture auth snapshots for this build")
+    parser.add_argument("--baseline", action="store_true", help="also time each script run on its own")
+    parser.add_argument("--no-preflight", action="store_true", help="skip the static selector check")
+    parser.add_argument(
+        "--server", choices=SERVER_MODES, default="auto", help="auto (attach or serve a cached build), attach or dev"
+    )
+    parser.add_argument("--keep-server", action="store_true", help="leave a server started for this run running")
+    parser.add_argument(
+        "--device",
+        action="append",
+        choices=PROFILES,
+        help="run under this device profile; repeat to compare profiles side by side (see devices.py)",
+    )
+    parser.add_argument(
+        "--network", choices=MODES, help="live, record, replay or offline third-party traffic (default: $TOOLS_NETWORK or live)"
+    )
+    parser.add_argument(
+        "--trace",
+        choices=tracebuffer.MODES,
+        help="rolling per-flow trace archived on failure: ring, dom (plus DOM snapshots) or off "
+        "(default: $TOOLS_TRACE, else off with --repeat/--gate and ring otherwise; see tracebuffer.py)",
+    )
+    parser.add_argument(
+        "--visual", action="store_true", help="compare the run's screenshots with the baselines (see screenshots.py)"
+    )
+    parser.add_argument(
+        "--gate", action="store_true", help="record timings per commit and fail on budget or trend regressions (see perf_gate.py)"
+    )
+    args = parser.parse_args(argv)
+
+    flows = discover_flows(args.flows)
+    if args.list:
+        for f in flows:
+            print(f"{f.name:<45} {f.module}")
+        return 0
+    if not args.no_preflight:
+        selected = {f.func.__name__ for f in flows}
+        if not preflight(skip={f.func.__name__ for f in discover_flows()} - selected):
+            print("Selectors above are not in the sources; fix them or pass --no-preflight", file=sys.stderr)
+            return 1
+    flows = flows * max(args.repeat, 1)
+    if args.network:
+        # Read by netreplay in this process and inherited by spawned workers.
+        os.environ["TOOLS_NETWORK"] = args.network
+    if args.trace:
+        os.environ["TOOLS_TRACE"] = args.trace
+    elif args.repeat > 1 or args.gate:
+        # Timing runs: keep the recorder off the page unless asked for.
+        tracebuffer.measuring()
+
+    workers = min(args.workers or os.cpu_count() or 1, len(flows)) or 1
+    options = {
+        "headed": args.headed,
+        "pool_size": args.pool_size,
+        "concurrency": args.concurrency,
+        "auth_cache": not args.no_auth_cache,
+        "refresh_auth": args.refresh_auth,
+    }
+    runs = []
+    try:
+        with server(args.server, keep=args.keep_server):
+            for device in args.device or [None]:
+                if device:
+                    # Read by harness.run_many here and in spawned workers.
+                    os.environ["TOOLS_DEVICE"] = device
+                    print(f"=== Device profile: {device}", flush=True)
+                start = time.perf_counter()
+                if workers > 1:
+                    startup, results = run_sharded(flows, workers, **options)
+                else:
+                    startup, results = run_shard(None, [f.name for f in flows], **options)
+                runs.append((device, startup, results, time.perf_counter() - start))
+
+            baseline = run_baseline(flows) if args.baseline else None
+    except ServerError as e:
+        print(e, file=sys.stderr)
+        return 1
+    for device, startup, results, total in runs:
+        if device:
+            print(f"\n=== {device}")
+        print_report(results, startup, total, baseline, workers)
+    timings = TIMINGS_DIR / f"{RUN_ID}.jsonl"
+    print(f"Step timings: {timings}")
+    if len(runs) > 1 and timings.exists():
+        print()
+        print_comparison(*compare_devices(aggregate(load([timings])), baseline=runs[0][0]), baseline=runs[0][0])
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(
+                {
+                    "workers": workers,
+                    "runs": [
+                        {"device": device, "total": total, "startup": startup, "results": [asdict(r) for r in results]}
+                        for device, startup, results, total in runs
+                    ],
+                },
+                f,
+                indent=2,
+            )
+    passed = all(r.passed for _, _, results, _ in runs for r in results)
+    if args.visual:
+        print()
+        passed = screenshots.main(["compare", "--run", RUN_ID]) == 0 and passed
+    if args.gate:
+        print()
+        db, commit = perf_gate.connect(), perf_gate.git_commit()
+        if timings.exists():
+            perf_gate.record_steps(db, load([timings]), commit)
+        for device, _, results, _ in runs:
+            perf_gate.record_flows(db, RUN_ID, device or os.environ.get("TOOLS_DEVICE", DEFAULT_DEVICE), results, commit)
+        passed = perf_gate.main(["check", "--commit", commit]) == 0 and passed
+    return 0 if passed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,416 @@
+"""Visual regression checks for the screenshots the flows take.
+
+``harness.save_screenshot(target, "dock_start.png")`` captures a Page or, when
+given a Locator, just that element (the widget, the dock, a dialog), with CSS
+animations stopped and the caret hidden. Chromium encodes the PNG; hashing,
+the disk write and the manifest line happen on a worker thread while the
+flow carries on. Each run's images go to
+``test-results/tools/screenshots/<run id>/<device>/<flow>/<name>.png`` with a
+``manifest.jsonl`` recording flow, step (the file name), device profile, build
+and SHA-256.
+
+Baselines live in ``scripts/tools/.cache/baselines/<device>/<flow>/<step>/``,
+one PNG per build that was accepted. ``compare`` checks each shot of a run
+against the most recently accepted build (or ``--against BUILD``), cheapest
+test first:
+
+1. same SHA-256 as the baseline - identical, done;
+2. different dimensions - regressed;
+3. 16x16 difference hash (dHash) within ``--hash-distance`` bits of the
+   baseline's - perceptually the same, no pixel diff (``--full`` skips this);
+4. per-pixel diff; regressed when more than ``--tolerance`` of the pixels
+   moved by more than ``--threshold`` in any channel. A diff image (changes
+   in red over the faded baseline) is written next to the report.
+
+The report is ``report.json`` and ``report.html`` in the run's directory;
+``compare`` exits 1 on any regression.
+
+Usage:
+
+    python scripts/tools/screenshots.py compare               # latest run
+    python scripts/tools/screenshots.py compare --run 20260101-120000 --against dev-1a2b3c4
+    python scripts/tools/screenshots.py accept                # latest run's shots become baselines
+    python scripts/tools/screenshots.py baselines             # what is stored, per build
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import shutil
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+from harness import ARTIFACT_DIR, RUN_ID, TOOLS_DIR, worker_id
+
+SHOTS_DIR = ARTIFACT_DIR / "screenshots"
+BASELINE_DIR = TOOLS_DIR / ".cache" / "baselines"
+HASH_SIZE = 16
+
+FAILED = ("regressed", "resized")
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# PNG color type -> channels, for the 8-bit images Chromium writes.
+_CHANNELS = {0: 1, 2: 3, 4: 2, 6: 4}
+# Unchanged pixels in diff images: the baseline lightened to a quarter of its contrast.
+_FADE = bytes(255 - (255 - v) // 4 for v in range(256))
+
+
+class Image(NamedTuple):
+    width: int
+    height: int
+    channels: int
+    rows: list
+
+
+# Capture side (runs inside the flows)
+
+
+@lru_cache(maxsize=None)
+def build() -> str:
+    from auth_cache import app_version
+
+    return app_version()
+
+
+def shot_path(filename: str, flow: str, device: str) -> Path:
+    """Where this run keeps ``filename``; parallel workers get a ``.w<N>`` suffix."""
+    stem, dot, ext = filename.rpartition(".")
+    if not dot:
+        stem, ext = filename, "png"
+    worker = worker_id()
+    name = f"{stem}.w{worker}.{ext}" if worker is not None else f"{stem}.{ext}"
+    return SHOTS_DIR / RUN_ID / device / flow / name
+
+
+def store(path: Path, data: bytes, entry: dict):
+    """Write one capture and append its manifest line; called on a worker thread."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    width, height = png_size(data)
+    entry.update(
+        path=str(path),
+        sha256=hashlib.sha256(data).hexdigest(),
+        width=width,
+        height=height,
+        build=build(),
+        time=time.time(),
+    )
+    # One O_APPEND write per shot so parallel workers never interleave lines.
+    manifest = SHOTS_DIR / RUN_ID / "manifest.jsonl"
+    fd = os.open(manifest, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, (json.dumps(entry) + "\n").encode())
+    finally:
+        os.close(fd)
+
+
+# PNG codec (8-bit, non-interlaced: what Chromium produces)
+
+
+def png_size(data: bytes) -> tuple[int, int]:
+    return struct.unpack(">II", data[16:24])
+
+
+def decode_png(data: bytes) -> Image:
+    if not data.startswith(_PNG_SIGNATURE):
+        raise ValueError("not a PNG")
+    pos, idat = 8, []
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos : pos + 8])
+        body = data[pos + 8 : pos + 8 + length]
+        if kind == b"IHDR":
+            width, height, depth, color, _, _, interlace = struct.unpack(">IIBBBBB", body)
+            if depth != 8 or interlace or color not in _CHANNELS:
+                raise ValueError(f"unsupported PNG (depth {depth}, color type {color}, interlace {interlace})")
+            channels = _CHANNELS[color]
+        elif kind == b"IDAT":
+            idat.append(body)
+        elif kind == b"IEND":
+            break
+        pos += length + 12
+
+    raw = zlib.decompress(b"".join(idat))
+    stride = width * channels
+    rows, prev = [], bytearray(stride)
+    for y in range(height):
+        start = y * (stride + 1)
+        kind, line = raw[start], bytearray(raw[start + 1 : start + 1 + stride])
+        if kind == 1:
+            for x in range(channels, stride):
+                line[x] = (line[x] + line[x - channels]) & 0xFF
+        elif kind == 2:
+            line = bytearray((a + b) & 0xFF for a, b in zip(line, prev))
+        elif kind == 3:
+            for x in range(stride):
+                left = line[x - channels] if x >= channels else 0
+                line[x] = (line[x] + ((left + prev[x]) >> 1)) & 0xFF
+        elif kind == 4:
+            for x in range(stride):
+                a = line[x - channels] if x >= channels else 0
+                b = prev[x]
+                c = prev[x - channels] if x >= channels else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                line[x] = (line[x] + (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 0xFF
+        rows.append(bytes(line))
+        prev = line
+    return Image(width, height, channels, rows)
+
+
+def encode_png(image: Image) -> bytes:
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    color = {v: k for k, v in _CHANNELS.items()}[image.channels]
+    header = struct.pack(">IIBBBBB", image.width, image.height, 8, color, 0, 0, 0)
+    raw = b"".join(b"\0" + row for row in image.rows)
+    return _PNG_SIGNATURE + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b"")
+
+
+# Comparison
+
+
+def dhash(image: Image, size: int = HASH_SIZE) -> int:
+    """Difference hash: is each cell of a size x (size + 1) luminance grid brighter than its right neighbour."""
+    width, height, channels, rows = image
+    columns = size + 1
+    bits = 0
+    for gy in range(size):
+        y0 = gy * height // size
+        y1 = max(y0 + 1, (gy + 1) * height // size)
+        ys = range(y0, y1, max(1, (y1 - y0) // 8))
+        cells = []
+        for gx in range(columns):
+            x0 = gx * width // columns
+            x1 = max(x0 + 1, (gx + 1) * width // columns)
+            xs = range(x0 * channels, x1 * channels, max(1, (x1 - x0) // 8) * channels)
+            total = count = 0
+            for y in ys:
+                row = rows[y]
+                for i in xs:
+                    total += 299 * row[i] + 587 * row[i + 1] + 114 * row[i + 2] if channels >= 3 else 1000 * row[i]
+                    count += 1
+            cells.append(total / count)
+        for left, right in zip(cells, cells[1:]):
+            bits = bits << 1 | (left > right)
+    return bits
+
+
+def pixel_diff(baseline: Image, candidate: Image, threshold: int) -> tuple[int, Image]:
+    """Count pixels whose channels moved by more than ``threshold``; return them marked red on the faded baseline."""
+    channels = candidate.channels
+    compared = min(channels, 3)
+    red = bytes((255, 0, 0, 255)[:channels]) if channels >= 3 else bytes((0, 255)[:channels])
+    changed, out = 0, []
+    for old, new in zip(baseline.rows, candidate.rows):
+        faded = bytearray(old.translate(_FADE))
+        if old != new:
+            for i in range(0, len(new), channels):
+                if any(abs(old[i + k] - new[i + k]) > threshold for k in range(compared)):
+                    changed += 1
+                    faded[i : i + channels] = red
+        out.append(bytes(faded))
+    return changed, Image(candidate.width, candidate.height, channels, out)
+
+
+def baselines_for(device: str, flow: str, step: str) -> list[dict]:
+    """Accepted baselines for one shot, newest first."""
+    folder = BASELINE_DIR / device / flow / step
+    metas = [json.loads(p.read_text()) for p in folder.glob("*.json")] if folder.is_dir() else []
+    return sorted(metas, key=lambda m: m["accepted"], reverse=True)
+
+
+def compare_one(entry: dict, baseline: Optional[dict], diff_path: str, options: dict) -> dict:
+    """Check one manifest entry against its baseline; runs in a worker process."""
+    result = {k: entry[k] for k in ("flow", "step", "device", "build", "path", "width", "height")}
+    result.update(baseline_build=None, baseline_path=None, hash_distance=None, changed_ratio=None, diff_path=None)
+    if baseline is None:
+        return {**result, "status": "new"}
+    result.update(baseline_build=baseline["build"], baseline_path=baseline["path"])
+    if entry["sha256"] == baseline["sha256"]:
+        return {**result, "status": "identical"}
+    if (entry["width"], entry["height"]) != (baseline["width"], baseline["height"]):
+        return {**result, "status": "resized"}
+
+    candidate = decode_png(Path(entry["path"]).read_bytes())
+    distance = bin(dhash(candidate) ^ int(baseline["dhash"], 16)).count("1")
+    result["hash_distance"] = distance
+    if distance <= options["hash_distance"] and not options["full"]:
+        return {**result, "status": "similar"}
+
+    changed, diff = pixel_diff(decode_png(Path(baseline["path"]).read_bytes()), candidate, options["threshold"])
+    ratio = changed / (candidate.width * candidate.height)
+    result["changed_ratio"] = ratio
+    if changed:
+        Path(diff_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(diff_path).write_bytes(encode_png(diff))
+        result["diff_path"] = diff_path
+    return {**result, "status": "regressed" if ratio > options["tolerance"] else "changed"}
+
+
+def load_manifest(run: str) -> list[dict]:
+    """The run's shots, the last capture of each (device, flow, step) winning."""
+    path = SHOTS_DIR / run / "manifest.jsonl"
+    latest = {}
+    for line in path.read_text().splitlines():
+        if line.strip():
+            entry = json.loads(line)
+            latest[(entry["device"], entry["flow"], entry["step"])] = entry
+    return sorted(latest.values(), key=lambda e: (e["device"], e["flow"], e["step"]))
+
+
+def latest_run() -> Optional[str]:
+    runs = sorted(p.parent.name for p in SHOTS_DIR.glob("*/manifest.jsonl"))
+    return runs[-1] if runs else None
+
+
+def compare(run: str, against: Optional[str] = None, **options) -> list[dict]:
+    entries = load_manifest(run)
+    jobs = []
+    for entry in entries:
+        candidates = baselines_for(entry["device"], entry["flow"], entry["step"])
+        if against:
+            candidates = [b for b in candidates if b["build"] == against]
+        diff_path = SHOTS_DIR / run / "diffs" / entry["device"] / entry["flow"] / f"{entry['step']}.png"
+        jobs.append((entry, candidates[0] if candidates else None, str(diff_path), options))
+    # Decoding is pure Python; spread it over processes.
+    with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1) or 1) as executor:
+        return list(executor.map(compare_one, *zip(*jobs))) if jobs else []
+
+
+def accept(run: str, select: Optional[Callable[[dict], bool]] = None) -> list[dict]:
+    """Store the run's shots (those ``select`` picks) as the baselines for their build."""
+    accepted = []
+    for entry in load_manifest(run):
+        if select and not select(entry):
+            continue
+        folder = BASELINE_DIR / entry["device"] / entry["flow"] / entry["step"]
+        folder.mkdir(parents=True, exist_ok=True)
+        target = folder / f"{entry['build']}.png"
+        shutil.copyfile(entry["path"], target)
+        meta = {
+            **{k: entry[k] for k in ("flow", "step", "device", "build", "sha256", "width", "height")},
+            "path": str(target),
+            "dhash": f"{dhash(decode_png(target.read_bytes())):0{HASH_SIZE * HASH_SIZE // 4}x}",
+            "run": run,
+            "accepted": time.time(),
+        }
+        (folder / f"{entry['build']}.json").write_text(json.dumps(meta, indent=2))
+        accepted.append(meta)
+    return accepted
+
+
+# Reporting
+
+
+def write_report(run: str, results: list[dict], options: dict) -> tuple[Path, Path]:
+    folder = SHOTS_DIR / run
+    json_path, html_path = folder / "report.json", folder / "report.html"
+    json_path.write_text(json.dumps({"run": run, "options": options, "results": results}, indent=2))
+
+    def image(path):
+        if not path:
+            return "<td></td>"
+        src = html.escape(os.path.relpath(path, folder))
+        return f'<td><a href="{src}"><img src="{src}" loading="lazy"></a></td>'
+
+    colors = {"regressed": "#dc2626", "resized": "#dc2626", "changed": "#ca8a04", "new": "#2563eb"}
+    rows = []
+    order = {status: i for i, status in enumerate(FAILED + ("changed", "new", "similar", "identical"))}
+    for r in sorted(results, key=lambda r: (order[r["status"]], r["device"], r["flow"], r["step"])):
+        detail = []
+        if r["changed_ratio"] is not None:
+            detail.append(f"{r['changed_ratio']:.3%} of pixels")
+        if r["hash_distance"] is not None:
+            detail.append(f"dHash distance {r['hash_distance']}")
+        rows.append(
+            f"<tr><td style=\"color:{colors.get(r['status'], '#4b5563')}\"><b>{r['status']}</b></td>"
+            f"<td>{html.escape(r['device'])}<br>{html.escape(r['flow'])}<br><code>{html.escape(r['step'])}</code></td>"
+            f"<td>{html.escape(str(r['baseline_build']))} &rarr; {html.escape(r['build'])}<br>{', '.join(detail)}</td>"
+            f"{image(r['baseline_path'])}{image(r['path'])}{image(r['diff_path'])}</tr>"
+        )
+    counts = ", ".join(f"{sum(r['status'] == s for r in results)} {s}" for s in order if any(r["status"] == s for r in results))
+    html_path.write_text(
+        "<!doctype html><meta charset=utf-8><title>Visual regressions " + html.escape(run) + "</title>"
+        "<style>body{font-family:sans-serif}td{vertical-align:top;padding:4px 8px;border-bottom:1px solid #e5e7eb}"
+        "img{max-width:360px;max-height:240px;border:1px solid #e5e7eb}</style>"
+        f"<h1>Visual regressions: run {html.escape(run)}</h1><p>{html.escape(counts)}</p>"
+        "<table><tr><th>Status</th><th>Shot</th><th>Builds</th><th>Baseline</th><th>This run</th><th>Diff</th></tr>"
+        + "".join(rows)
+        + "</table>"
+    )
+    return json_path, html_path
+
+
+def print_results(results: list[dict]):
+    print(f"{'Status':<10} {'Device':<12} {'Flow':<38} {'Step':<32} {'Detail'}")
+    for r in results:
+        detail = "" if r["changed_ratio"] is None else f"{r['changed_ratio']:.3%} changed"
+        if r["status"] == "resized":
+            detail = f"now {r['width']}x{r['height']}"
+        print(f"{r['status']:<10} {r['device']:<12} {r['flow']:<38} {r['step']:<32} {detail}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    check = sub.add_parser("compare", help="compare a run's screenshots with the baselines")
+    check.add_argument("--run", help="run id (default: the latest run with screenshots)")
+    check.add_argument("--against", help="compare with this build's baselines (default: newest accepted)")
+    check.add_argument("--tolerance", type=float, default=0.001, help="fraction of changed pixels that still passes")
+    check.add_argument("--threshold", type=int, default=16, help="per-channel difference that counts as a change")
+    check.add_argument("--hash-distance", type=int, default=0, help="dHash bits that may differ before pixel diffing")
+    check.add_argument("--full", action="store_true", help="always pixel-diff, even when the hashes match")
+    check.add_argument("--accept-new", action="store_true", help="store shots without a baseline as baselines")
+    promote = sub.add_parser("accept", help="make a run's screenshots the baselines for their build")
+    promote.add_argument("--run", help="run id (default: the latest run with screenshots)")
+    promote.add_argument("--only", action="append", help="only this flow or step (repeatable)")
+    sub.add_parser("baselines", help="list stored baselines")
+    args = parser.parse_args(argv)
+
+    if args.command == "baselines":
+        for meta_path in sorted(BASELINE_DIR.glob("*/*/*/*.json")):
+            meta = json.loads(meta_path.read_text())
+            accepted = time.strftime("%Y-%m-%d %H:%M", time.localtime(meta["accepted"]))
+            print(f"{meta['device']:<12} {meta['flow']:<38} {meta['step']:<32} {meta['build']:<20} {accepted}")
+        return 0
+
+    run = args.run or latest_run()
+    if run is None or not (SHOTS_DIR / run / "manifest.jsonl").exists():
+        print(f"No screenshots for {f'run {run}' if run else 'any run'} under {SHOTS_DIR}")
+        return 0
+    if args.command == "accept":
+        only = args.only
+        accepted = accept(run, (lambda e: e["flow"] in only or e["step"] in only) if only else None)
+        print(f"Accepted {len(accepted)} screenshot(s) from run {run} as baselines")
+        return 0
+
+    options = {
+        "tolerance": args.tolerance,
+        "threshold": args.threshold,
+        "hash_distance": args.hash_distance,
+        "full": args.full,
+    }
+    start = time.perf_counter()
+    results = compare(run, args.against, **options)
+    print_results(results)
+    json_path, html_path = write_report(run, results, options)
+    new = {(r["device"], r["flow"], r["step"]) for r in results if r["status"] == "new"}
+    if new and args.accept_new:
+        accept(run, lambda e: (e["device"], e["flow"], e["step"]) in new)
+        print(f"Accepted {len(new)} new baseline(s)")
+    failed = [r for r in results if r["status"] in FAILED]
+    print(f"{len(results)} screenshot(s), {len(failed)} regression(s) in {time.perf_counter() - start:.1f}s")
+    print(f"Report: {html_path} ({json_path.name})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,407 @@
+"""Static index of the UI strings flows select by, and a browser-free pre-flight.
+
+The index maps every ``title``, ``aria-label`` and ``data-testid`` value in
+components/ (plus ``label`` on ``IconButton``, which renders as both title
+and aria-label), JSX text, i18n strings from locales/en.json and
+human-readable string literals to ``file:line`` and the enclosing
+component. ``t('key')`` calls are resolved through en.json, and template
+literals such as ``${t('widgetWindow.settings')} (Alt+S)`` are indexed as
+patterns. The index lives in ``scripts/tools/.cache/selectors/index.json``
+and only files whose mtime changed are re-parsed.
+
+``check`` reads the locators the Python flows use straight from their
+source (``get_by_title``, ``get_by_role(name=)``, ``[aria-label="..."]``,
+``text=...``, ...) and reports any that no longer exist in the sources, so
+a renamed button fails in milliseconds instead of after a browser timeout.
+Text lookups that match nothing are only warnings: they can come from
+Firestore data or from text the flow typed itself.
+
+Usage:
+
+    python scripts/tools/selector_index.py check            # what run_flows.py runs first
+    python scripts/tools/selector_index.py find "Open Tools"
+    python scripts/tools/selector_index.py build --full
+"""
+import argparse
+import ast
+import bisect
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from codemod import CodemodError, Source, write_atomic
+from harness import REPO_ROOT, TOOLS_DIR
+
+INDEX_PATH = TOOLS_DIR / ".cache" / "selectors" / "index.json"
+LOCALE = REPO_ROOT / "locales" / "en.json"
+SOURCE_GLOBS = ("components/**/*.tsx", "components/**/*.ts", "context/*.tsx", "config/*.ts", "config/*.tsx", "App.tsx")
+# Scripts and page objects scanned for selectors; files without locator calls contribute nothing.
+FLOW_GLOBS = ("*.py", "pages/*.py")
+
+ATTRIBUTES = {"title": "title", "aria-label": "aria-label", "data-testid": "testid"}
+# Components whose ``label`` prop ends up as the button's title and aria-label.
+LABEL_COMPONENTS = {"IconButton"}
+
+_COMPONENT = re.compile(r"^(?:export\s+)?(?:default\s+)?(?:const|function|class)\s+([A-Z]\w*)", re.M)
+_T_CALL = re.compile(r"""\bt\(\s*(['"])([\w.-]+)\1""")
+_INTERPOLATION = re.compile(r"\{\{\s*\w+\s*\}\}")
+_HUMAN = re.compile(r"[A-Z][\w'’&,.!?:()/ -]*[\w.!?)]")
+_CSS_ATTRIBUTE = re.compile(r"""\[(title|aria-label|data-testid)\s*=\s*(['"])(.*?)\2\]""")
+_TEXT_ENGINE = re.compile(r"""^text\s*=\s*(['"]?)(.*?)\1$""")
+
+
+@lru_cache(maxsize=None)
+def _wildcard(value: str, exact: bool) -> re.Pattern:
+    return re.compile(".*".join(re.escape(part) for part in value.split("*")), 0 if exact else re.I)
+
+
+@dataclass(frozen=True)
+class Entry:
+    kind: str  # title, aria-label, testid, text, i18n or string
+    value: str  # may contain "*" wildcards (dynamic template parts)
+    path: str
+    line: int
+    component: Optional[str] = None
+    key: Optional[str] = None  # i18n key the value came from
+
+    def matches(self, wanted: str, exact: bool) -> bool:
+        """Playwright's rules: case-insensitive substring unless ``exact``."""
+        if "*" in self.value:
+            parts = self.value.split("*")
+            if _wildcard(self.value, exact).fullmatch(wanted):
+                return True
+            return not exact and any(wanted.lower() in part.lower() for part in parts if part)
+        if exact:
+            return self.value == wanted
+        return wanted.lower() in self.value.lower()
+
+
+# -- indexing ------------------------------------------------------------
+
+
+def load_locale(path: Path = LOCALE) -> tuple[dict[str, str], dict[str, int]]:
+    """Flattened ``a.b.c -> string`` and ``a.b.c -> line`` for a pretty-printed locale file."""
+    with open(path) as f:
+        lines = f.read().splitlines()
+    strings, line_numbers, stack = {}, {}, []
+    for number, line in enumerate(lines, 1):
+        match = re.match(r'\s*"([^"]+)":\s*(\{|")', line)
+        if match and match.group(2) == "{":
+            stack.append(match.group(1))
+        elif match:
+            key = ".".join(stack + [match.group(1)])
+            line_numbers[key] = number
+        elif line.strip().startswith("}") and stack:
+            stack.pop()
+
+    def flatten(node, prefix=""):
+        for k, v in node.items():
+            if isinstance(v, dict):
+                flatten(v, f"{prefix}{k}.")
+            else:
+                strings[f"{prefix}{k}"] = str(v)
+
+    flatten(json.loads("\n".join(lines)))
+    return strings, line_numbers
+
+
+def _template(body: str, locale: dict[str, str]) -> tuple[str, Optional[str]]:
+    """``${t('key')}`` becomes the translation, any other ``${...}`` a wildcard."""
+    keys = [key for _, key in _T_CALL.findall(body)]
+    body = re.sub(r"""\$\{\s*t\(\s*(['"])([\w.-]+)\1[^}]*\}""", lambda m: locale.get(m.group(2), "*"), body)
+    return _INTERPOLATION.sub("*", re.sub(r"\$\{[^}]*\}", "*", body)), keys[0] if len(keys) == 1 else None
+
+
+def resolve(expression: str, locale: dict[str, str]) -> list[tuple[str, Optional[str]]]:
+    """Candidate static values of an attribute value (quotes/braces included).
+
+    Every branch of a ternary or ``??`` is a candidate; anything that is not
+    a literal, template or ``t()`` call contributes nothing.
+    """
+    expression = expression.strip()
+    if expression[:1] in "'\"" and expression[-1:] == expression[:1]:
+        return [(expression[1:-1], None)]
+    values = [_template(body, locale) for body in re.findall(r"`([^`]*)`", expression)]
+    rest = re.sub(r"`[^`]*`", "", expression)
+    values += [(_INTERPOLATION.sub("*", locale[key]), key) for _, key in _T_CALL.findall(rest) if key in locale]
+    rest = _T_CALL.sub("", rest)
+    values += [(literal, None) for _, literal in re.findall(r"""(['"])((?:(?!\1).)+)\1""", rest)]
+    return values
+
+
+def index_file(path: Path, locale: dict[str, str]) -> list[Entry]:
+    rel = str(path.relative_to(REPO_ROOT))
+    src = Source(path.read_text(), rel)
+    components = [(m.start(), m.group(1)) for m in _COMPONENT.finditer(src.text)]
+    starts = [pos for pos, _ in components]
+
+    def component_at(pos: int) -> Optional[str]:
+        i = bisect.bisect_right(starts, pos) - 1
+        return components[i][1] if i >= 0 else None
+
+    entries = []
+
+    def add(kind: str, value: str, pos: int, key: Optional[str] = None):
+        value = " ".join(value.split())
+        # Values that are mostly interpolation would match any selector.
+        if re.search(r"\w\w", value.replace("*", " ")):
+            entries.append(Entry(kind, value, rel, src.line(pos), component_at(pos), key))
+
+    for element in src.elements:
+        attributes = dict(ATTRIBUTES)
+        if element.name in LABEL_COMPONENTS:
+            attributes["label"] = ("title", "aria-label")
+        for attribute, kinds in attributes.items():
+            span = src.attribute(element, attribute)
+            if span is None:
+                continue
+            for value, key in resolve(src.source(span), locale):
+                for kind in kinds if isinstance(kinds, tuple) else (kinds,):
+                    add(kind, value, span.start, key)
+    for span in src.texts:
+        add("text", src.source(span), span.start)
+    for span in src.strings:
+        literal = src.source(span)[1:-1]
+        if rel.startswith("config/") or _HUMAN.fullmatch(literal):
+            add("string", literal, span.start)
+    for match in _T_CALL.finditer(src.text):
+        if match.group(2) in locale:
+            add("i18n", _INTERPOLATION.sub("*", locale[match.group(2)]), match.start(), match.group(2))
+    return entries
+
+
+class SelectorIndex:
+    """``value -> [Entry]`` over the app sources, persisted and refreshed by mtime."""
+
+    def __init__(self, path: Path = INDEX_PATH):
+        self.path = path
+        self.files: dict[str, dict] = {}
+        self.errors: list[str] = []
+        self.reparsed = 0
+        self._by_kind: Optional[dict[str, list[Entry]]] = None
+        if path.exists():
+            self.files = json.loads(path.read_text()).get("files", {})
+
+    def update(self, full: bool = False) -> "SelectorIndex":
+        locale_mtime = LOCALE.stat().st_mtime
+        if full or self.files.get(str(LOCALE.relative_to(REPO_ROOT)), {}).get("mtime") != locale_mtime:
+            # Every t('key') resolution depends on the locale.
+            self.files = {}
+        locale, locale_lines = load_locale()
+
+        seen = set()
+        for pattern in SOURCE_GLOBS:
+            for path in REPO_ROOT.glob(pattern):
+                if path.name.endswith((".test.tsx", ".test.ts")):
+                    continue
+                rel = str(path.relative_to(REPO_ROOT))
+                seen.add(rel)
+                mtime = path.stat().st_mtime
+                if self.files.get(rel, {}).get("mtime") == mtime:
+                    continue
+                try:
+                    entries = index_file(path, locale)
+                except CodemodError as e:
+                    self.errors.append(str(e))
+                    entries = []
+                self.files[rel] = {"mtime": mtime, "entries": [list(vars(e).values()) for e in entries]}
+                self.reparsed += 1
+
+        rel_locale = str(LOCALE.relative_to(REPO_ROOT))
+        seen.add(rel_locale)
+        if rel_locale not in self.files:
+            entries = [Entry("i18n", _INTERPOLATION.sub("*", v), rel_locale, locale_lines.get(k, 0), None, k) for k, v in locale.items()]
+            self.files[rel_locale] = {"mtime": locale_mtime, "entries": [list(vars(e).values()) for e in entries]}
+        for rel in set(self.files) - seen:
+            del self.files[rel]
+        self._by_kind = None
+        return self
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, json.dumps({"files": self.files}))
+
+    def entries(self) -> list[Entry]:
+        return [Entry(*row) for data in self.files.values() for row in data["entries"]]
+
+    def lookup(self, value: str, kinds, exact: bool = False) -> list[Entry]:
+        if self._by_kind is None:
+            self._by_kind = {}
+            for entry in self.entries():
+                self._by_kind.setdefault(entry.kind, []).append(entry)
+        return [e for kind in kinds for e in self._by_kind.get(kind, ()) if e.matches(value, exact)]
+
+
+# -- flow selectors ------------------------------------------------------
+
+# Entry kinds each Playwright lookup can be satisfied by.
+TEXT_KINDS = {"text", "i18n", "string"}
+NAME_KINDS = {"aria-label", "title"} | TEXT_KINDS
+LOOKUP_KINDS = {
+    "get_by_title": {"title"},
+    "get_by_test_id": {"testid"},
+    "get_by_label": {"aria-label"} | TEXT_KINDS,
+    "get_by_placeholder": TEXT_KINDS,
+    "get_by_text": TEXT_KINDS,
+    "get_by_role": NAME_KINDS,
+    "title": {"title"},
+    "aria-label": {"aria-label"},
+    "data-testid": {"testid"},
+    "has_text": TEXT_KINDS,
+    "text": TEXT_KINDS,
+}
+
+
+@dataclass(frozen=True)
+class Selector:
+    lookup: str
+    value: str
+    exact: bool
+    path: str
+    line: int
+    function: Optional[str] = None  # enclosing top-level function
+
+    @property
+    def soft(self) -> bool:
+        """Text lookups may legitimately target runtime data."""
+        return not LOOKUP_KINDS[self.lookup] & {"title", "aria-label", "testid"}
+
+
+def _constants(tree: ast.Module) -> dict[str, str]:
+    return {
+        target.id: node.value.value
+        for node in tree.body
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str)
+        for target in node.targets
+        if isinstance(target, ast.Name)
+    }
+
+
+def _string(node, constants) -> Optional[str]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.Name):
+        return constants.get(node.id)
+    if isinstance(node, ast.JoinedStr):
+        # Keep literal parts; formatted values become wildcards nobody can match.
+        return "".join(v.value if isinstance(v, ast.Constant) else "\0" for v in node.values)
+    return None
+
+
+def flow_selectors(paths) -> list[Selector]:
+    selectors = []
+    for path in paths:
+        tree = ast.parse(path.read_text(), str(path))
+        constants = _constants(tree)
+        rel = str(path.relative_to(REPO_ROOT))
+        functions = [
+            (node.lineno, node.end_lineno, node.name)
+            for node in tree.body
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        ]
+
+        def add(lookup, value, exact, node):
+            if value and "\0" not in value:
+                function = next((name for first, last, name in functions if first <= node.lineno <= last), None)
+                selectors.append(Selector(lookup, value, exact, rel, node.lineno, function))
+
+        def css(value, node):
+            for attribute, _, wanted in _CSS_ATTRIBUTE.findall(value.replace("\0", "")):
+                if "\0" not in wanted:
+                    add(attribute, wanted, True, node)
+            text = _TEXT_ENGINE.match(value)
+            if text:
+                add("text", text.group(2), bool(text.group(1)), node)
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+                css(node.value.value, node)
+            if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)):
+                continue
+            method = node.func.attr
+            keywords = {k.arg: k.value for k in node.keywords}
+            exact = isinstance(keywords.get("exact"), ast.Constant) and keywords["exact"].value is True
+            first = _string(node.args[0], constants) if node.args else None
+            if method in ("get_by_title", "get_by_test_id", "get_by_label", "get_by_placeholder", "get_by_text") and first:
+                add(method, first, exact or method == "get_by_test_id", node)
+            elif method == "get_by_role" and "name" in keywords:
+                add(method, _string(keywords["name"], constants), exact, node)
+            elif method in ("locator", "wait_for_selector", "query_selector", "eval_on_selector_all") and first:
+                if isinstance(node.args[0], ast.Constant):
+                    css(first, node)
+            if "has_text" in keywords:
+                add("has_text", _string(keywords["has_text"], constants), False, node)
+    return selectors
+
+
+def check(index: SelectorIndex, selectors: list[Selector]) -> tuple[list, list]:
+    """``(missing, unmatched_text)``: hard failures and soft warnings."""
+    missing, unmatched = [], []
+    for selector in selectors:
+        if index.lookup(selector.value, LOOKUP_KINDS[selector.lookup], selector.exact):
+            continue
+        (unmatched if selector.soft else missing).append(selector)
+    return missing, unmatched
+
+
+def preflight(skip=(), verbose: bool = True) -> bool:
+    """Validate the flows' selectors against the (refreshed) index; True if none are missing.
+
+    ``skip`` names functions whose selectors are not checked, i.e. the
+    flows that are not about to run.
+    """
+    start = time.perf_counter()
+    index = SelectorIndex().update()
+    index.save()
+    scripts = sorted(p for pattern in FLOW_GLOBS for p in TOOLS_DIR.glob(pattern))
+    selectors = [s for s in flow_selectors(scripts) if s.function not in skip]
+    missing, unmatched = check(index, selectors)
+    elapsed = (time.perf_counter() - start) * 1000
+    for selector in missing:
+        print(f"MISSING {selector.lookup}({selector.value!r}) at {selector.path}:{selector.line}", file=sys.stderr)
+    if verbose:
+        for selector in unmatched:
+            print(f"warning: no static text for {selector.lookup}({selector.value!r}) at {selector.path}:{selector.line}")
+        print(
+            f"Selector pre-flight: {len(selectors)} selectors, {len(missing)} missing, "
+            f"{len(unmatched)} text-only warnings ({index.reparsed} files re-indexed, {elapsed:.0f}ms)"
+        )
+    return not missing
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="update the index")
+    build.add_argument("--full", action="store_true", help="re-parse every file")
+    sub.add_parser("check", help="validate the flows' selectors")
+    find = sub.add_parser("find", help="where does a string come from?")
+    find.add_argument("value")
+    find.add_argument("--exact", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "check":
+        return 0 if preflight() else 1
+
+    start = time.perf_counter()
+    index = SelectorIndex().update(full=getattr(args, "full", False))
+    index.save()
+    for error in index.errors:
+        print(f"warning: {error}", file=sys.stderr)
+    if args.command == "build":
+        total = sum(len(data["entries"]) for data in index.files.values())
+        print(f"{total} entries from {len(index.files)} files ({index.reparsed} re-indexed) in {time.perf_counter() - start:.2f}s")
+        return 0
+    for entry in index.lookup(args.value, set(LOOKUP_KINDS["get_by_role"]) | {"testid"}, args.exact):
+        key = f" [{entry.key}]" if entry.key else ""
+        print(f"{entry.kind:<10} {entry.path}:{entry.line} {entry.component or '-'}  {entry.value!r}{key}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
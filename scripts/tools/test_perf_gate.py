@@ -0,0 +1,100 @@
+"""Unit tests for perf_gate's change detection (no browser or database needed).
+
+Usage:
+
+    python -m pytest -q scripts/tools/test_perf_gate.py
+    python -m unittest scripts/tools/test_perf_gate.py
+"""
+import math
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from perf_gate import MIN_HISTORY_COMMITS, MIN_HISTORY_SAMPLES, detect, mann_whitney_greater  # noqa: E402
+
+
+class MannWhitneyGreaterTest(unittest.TestCase):
+    def test_separated_samples(self):
+        # U = 9 of a possible 9; mean 4.5, variance 3 * 3 / 12 * 7 = 5.25, continuity-corrected.
+        expected = 1 - 0.5 * (1 + math.erf((9 - 4.5 - 0.5) / math.sqrt(5.25) / math.sqrt(2)))
+        self.assertAlmostEqual(mann_whitney_greater([4, 5, 6], [1, 2, 3]), expected, places=9)
+
+    def test_direction(self):
+        history = [100, 102, 98, 101, 99, 100]
+        slower = [130, 128, 131, 129]
+        self.assertLess(mann_whitney_greater(slower, history), 0.01)
+        self.assertGreater(mann_whitney_greater(history, slower), 0.99)
+
+    def test_identical_samples_are_not_significant(self):
+        self.assertEqual(mann_whitney_greater([5, 5, 5], [5, 5, 5, 5, 5]), 1.0)
+
+    def test_ties_across_groups(self):
+        p = mann_whitney_greater([10, 10, 11], [10, 10, 10, 9, 11])
+        self.assertGreater(p, 0.05)
+        self.assertLessEqual(p, 1.0)
+
+
+class DetectTest(unittest.TestCase):
+    def test_empty(self):
+        result = detect([], [1000] * 10, 0.01, 0.1)
+        self.assertIsNone(result["method"])
+        self.assertFalse(result["regressed"])
+
+    def test_single_history_sample_is_insufficient(self):
+        # Used to regress with p=0.0: one sample has no spread at all.
+        result = detect([1100], [1000], 0.01, 0.1)
+        self.assertEqual(result["method"], "insufficient history")
+        self.assertIsNone(result["p"])
+        self.assertFalse(result["regressed"])
+        self.assertAlmostEqual(result["change"], 0.1)
+
+    def test_too_few_samples(self):
+        result = detect([2000], [1000] * (MIN_HISTORY_SAMPLES - 1), 0.01, 0.1, commits=MIN_HISTORY_COMMITS)
+        self.assertEqual(result["method"], "insufficient history")
+        self.assertFalse(result["regressed"])
+
+    def test_too_few_commits(self):
+        result = detect([2000] * 5, [1000] * 20, 0.01, 0.1, commits=MIN_HISTORY_COMMITS - 1)
+        self.assertEqual(result["method"], "insufficient history")
+        self.assertFalse(result["regressed"])
+
+    def test_spread_floor_absorbs_small_changes_without_spread(self):
+        # MAD is 0; a 10% change is two floor-sized spreads, not significant at 1%.
+        result = detect([1100], [1000] * 6, 0.01, 0.1, commits=3)
+        self.assertEqual(result["method"], "robust-z")
+        self.assertGreater(result["p"], 0.01)
+        self.assertFalse(result["regressed"])
+
+    def test_large_change_without_spread_regresses(self):
+        result = detect([1300], [1000] * 6, 0.01, 0.1, commits=3)
+        self.assertEqual(result["method"], "robust-z")
+        self.assertTrue(result["regressed"])
+
+    def test_significant_but_below_min_change(self):
+        history = [1000, 1001, 999, 1000, 1002, 998, 1000, 1001]
+        result = detect([1060, 1061, 1059, 1062], history, 0.01, 0.1, commits=4)
+        self.assertEqual(result["method"], "mann-whitney")
+        self.assertLess(result["p"], 0.01)
+        self.assertFalse(result["regressed"])
+
+    def test_rank_test_regression_and_improvement(self):
+        history = [1000, 1020, 980, 1010, 990, 1005, 995, 1000]
+        slower = detect([1300, 1320, 1290, 1310], history, 0.01, 0.1, commits=4)
+        self.assertEqual(slower["method"], "mann-whitney")
+        self.assertTrue(slower["regressed"])
+        self.assertFalse(slower["improved"])
+        faster = detect([700, 710, 690, 705], history, 0.01, 0.1, commits=4)
+        self.assertTrue(faster["improved"])
+        self.assertFalse(faster["regressed"])
+
+    def test_noise_is_ok(self):
+        history = [1000, 1100, 950, 1050, 980, 1020, 1070, 960]
+        result = detect([1010, 1040, 990], history, 0.01, 0.1, commits=5)
+        self.assertFalse(result["regressed"])
+        self.assertFalse(result["improved"])
+
+
+if __name__ == "__main__":
+    unittest.main()
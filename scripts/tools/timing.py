@@ -0,0 +1,178 @@
+"""Per-step latency tracing for the scripts/tools flows.
+
+Flows mark their steps with ``async with step("Opening settings"):`` instead
+of ``print``. Each step still prints its name, and when the flow runs under
+``harness.run_flow`` it also records:
+
+* monotonic wall-clock start/end (``time.perf_counter``),
+* the page's ``performance.now()`` at both ends,
+* the number and total duration of long tasks (>50 ms) during the step,
+  from a ``PerformanceObserver`` installed before the app loads.
+
+Every run appends one line per step to
+``test-results/tools/timings/<run id>.jsonl``; all flows and workers of a
+``run_flows.py`` invocation share the run id. ``timing_report.py``
+aggregates any number of those files into p50/p95/p99 per step.
+
+Other recorders (``tracebuffer.TraceBuffer``) follow the steps by adding
+themselves to ``Tracer.listeners``.
+"""
+import contextvars
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional
+
+from harness import ARTIFACT_DIR, RUN_ID
+
+TIMINGS_DIR = ARTIFACT_DIR / "timings"
+
+# Installed with add_init_script so it observes from the first navigation.
+_OBSERVER_JS = """
+(() => {
+  const stats = (window.__flowLongTasks = { count: 0, duration: 0 });
+  try {
+    new PerformanceObserver((list) => {
+      for (const entry of list.getEntries()) {
+        stats.count += 1;
+        stats.duration += entry.duration;
+      }
+    }).observe({ type: 'longtask', buffered: true });
+  } catch (e) {
+    // Long Task API unavailable (non-Chromium); counts stay at zero.
+  }
+})();
+"""
+
+_SAMPLE_JS = """
+() => {
+  const t = window.__flowLongTasks || { count: 0, duration: 0 };
+  return { now: performance.now(), count: t.count, duration: t.duration };
+}
+"""
+
+# Every requestAnimationFrame timestamp for ``duration`` ms.
+_FRAMES_JS = """
+(duration) => new Promise((resolve) => {
+  const stamps = [];
+  const end = performance.now() + duration;
+  const tick = (t) => {
+    stamps.push(t);
+    if (t < end) requestAnimationFrame(tick);
+    else resolve(stamps);
+  };
+  requestAnimationFrame(tick);
+})
+"""
+
+_tracer: contextvars.ContextVar[Optional["Tracer"]] = contextvars.ContextVar("tracer", default=None)
+
+
+class Tracer:
+    """Collects the step timings of one flow run."""
+
+    def __init__(
+        self, flow: str, page, worker: Optional[int] = None, path: Optional[Path] = None, device: Optional[str] = None
+    ):
+        self.flow = flow
+        self.page = page
+        self.worker = worker
+        self.device = device
+        self.path = path or TIMINGS_DIR / f"{RUN_ID}.jsonl"
+        self.steps: list[dict] = []
+        # Told about every step: ``step_started(name)`` and ``await step_finished(entry)``.
+        self.listeners: list = []
+
+    async def install(self):
+        await self.page.add_init_script(_OBSERVER_JS)
+
+    async def sample(self) -> Optional[dict]:
+        try:
+            return await self.page.evaluate(_SAMPLE_JS)
+        except Exception:
+            # Mid-navigation or page closed: keep the wall-clock timing anyway.
+            return None
+
+    def record(self, name: str, start: float, end: float, before, after, error: Optional[str]):
+        entry = {
+            "run": RUN_ID,
+            "flow": self.flow,
+            "step": name,
+            "worker": self.worker,
+            "device": self.device,
+            "start": start,
+            "end": end,
+            "duration_ms": (end - start) * 1000,
+            "page_start_ms": before and before["now"],
+            "page_end_ms": after and after["now"],
+            "long_tasks": None,
+            "long_task_ms": None,
+            "error": error,
+        }
+        # A navigation inside the step resets the page counters; only diff
+        # samples taken in the same document.
+        if before and after and after["now"] >= before["now"]:
+            entry["long_tasks"] = after["count"] - before["count"]
+            entry["long_task_ms"] = after["duration"] - before["duration"]
+        self.steps.append(entry)
+        return entry
+
+    def flush(self):
+        if not self.steps:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = "".join(json.dumps(entry) + "\n" for entry in self.steps)
+        # One O_APPEND write per flow so parallel workers never interleave lines.
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, lines.encode())
+        finally:
+            os.close(fd)
+        self.steps.clear()
+
+
+def current_tracer() -> Optional[Tracer]:
+    return _tracer.get()
+
+
+def activate(tracer: Optional[Tracer]):
+    return _tracer.set(tracer)
+
+
+def deactivate(token):
+    _tracer.reset(token)
+
+
+@asynccontextmanager
+async def step(name: str):
+    """Time a named flow step; prints ``name...`` like the old progress messages."""
+    print(f"{name}...", flush=True)
+    tracer = _tracer.get()
+    if tracer is None:
+        yield
+        return
+
+    for listener in tracer.listeners:
+        listener.step_started(name)
+    before = await tracer.sample()
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        end = time.perf_counter()
+        after = await tracer.sample()
+        entry = tracer.record(name, start, end, before, after, error)
+        for listener in tracer.listeners:
+            await listener.step_finished(entry)
+
+
+async def frame_intervals(page, duration_ms: float) -> list[float]:
+    """Gaps between consecutive frames the page rendered over ``duration_ms``."""
+    stamps = await page.evaluate(_FRAMES_JS, duration_ms)
+    return [b - a for a, b in zip(stamps, stamps[1:])]
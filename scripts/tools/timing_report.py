@@ -0,0 +1,152 @@
+"""Aggregate step timings written by timing.py into per-step percentiles.
+
+Usage:
+
+    python scripts/tools/timing_report.py                     # every run in test-results/tools/timings
+    python scripts/tools/timing_report.py --last 10           # the 10 most recent runs
+    python scripts/tools/timing_report.py path/to/run.jsonl ...
+    python scripts/tools/timing_report.py --flow test_lunch_count_drag --json
+    python scripts/tools/timing_report.py --compare-devices   # p50 per device profile, side by side
+
+Collect repeated samples with ``run_flows.py --repeat N`` and per device
+profile with ``run_flows.py --device NAME`` (see devices.py).
+"""
+import argparse
+import json
+import math
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from timing import TIMINGS_DIR
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Linear-interpolated percentile of ``values`` (0 <= pct <= 100)."""
+    ordered = sorted(values)
+    if not ordered:
+        return math.nan
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def load(paths) -> list[dict]:
+    entries = []
+    for path in paths:
+        with open(path) as f:
+            entries.extend(json.loads(line) for line in f if line.strip())
+    return entries
+
+
+def aggregate(entries: list[dict]) -> list[dict]:
+    """Group by (flow, step, device), keeping steps in the order they first ran."""
+    groups: dict[tuple, list[dict]] = defaultdict(list)
+    for entry in entries:
+        if entry.get("error") is None:
+            # Traces from before device profiles ran on the desktop.
+            groups[(entry["flow"], entry["step"], entry.get("device") or "desktop")].append(entry)
+
+    rows = []
+    for (flow_name, step_name, device), items in groups.items():
+        durations = [e["duration_ms"] for e in items]
+        long_tasks = [e["long_tasks"] for e in items if e.get("long_tasks") is not None]
+        long_task_ms = [e["long_task_ms"] for e in items if e.get("long_task_ms") is not None]
+        rows.append(
+            {
+                "flow": flow_name,
+                "step": step_name,
+                "device": device,
+                "n": len(durations),
+                "p50_ms": percentile(durations, 50),
+                "p95_ms": percentile(durations, 95),
+                "p99_ms": percentile(durations, 99),
+                "max_ms": max(durations),
+                "long_tasks_avg": sum(long_tasks) / len(long_tasks) if long_tasks else None,
+                "long_task_ms_p95": percentile(long_task_ms, 95) if long_task_ms else None,
+            }
+        )
+    return rows
+
+
+def print_table(rows: list[dict]):
+    print(f"{'Flow':<38} {'Step':<40} {'Device':<14} {'n':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'LT/run':>7}")
+    for row in rows:
+        lt = "-" if row["long_tasks_avg"] is None else f"{row['long_tasks_avg']:.1f}"
+        print(
+            f"{row['flow'][:38]:<38} {row['step'][:40]:<40} {row['device'][:14]:<14} {row['n']:>4} "
+            f"{row['p50_ms']:>6.0f}ms {row['p95_ms']:>6.0f}ms {row['p99_ms']:>6.0f}ms {lt:>7}"
+        )
+
+
+def compare_devices(rows: list[dict], baseline: str = "desktop") -> tuple[list[str], list[dict]]:
+    """One row per (flow, step) with the p50 of every device and its ratio to ``baseline``."""
+    devices = list(dict.fromkeys(r["device"] for r in rows))
+    if baseline in devices:
+        devices.remove(baseline)
+        devices.insert(0, baseline)
+    table: dict[tuple, dict] = {}
+    for r in rows:
+        table.setdefault((r["flow"], r["step"]), {"flow": r["flow"], "step": r["step"], "p50_ms": {}, "long_tasks": {}})
+        table[(r["flow"], r["step"])]["p50_ms"][r["device"]] = r["p50_ms"]
+        table[(r["flow"], r["step"])]["long_tasks"][r["device"]] = r["long_tasks_avg"]
+    for row in table.values():
+        base = row["p50_ms"].get(baseline)
+        row["ratio"] = {d: v / base for d, v in row["p50_ms"].items() if base and d != baseline}
+    return devices, list(table.values())
+
+
+def print_comparison(devices: list[str], rows: list[dict], baseline: str = "desktop"):
+    header = "".join(f" {d[:16]:>16}" for d in devices)
+    print(f"{'Flow':<30} {'Step':<34}{header}")
+    for row in rows:
+        cells = []
+        for d in devices:
+            value, ratio = row["p50_ms"].get(d), row["ratio"].get(d)
+            cell = "-" if value is None else f"{value:.0f}ms" + (f" {ratio:.1f}x" if ratio else "")
+            cells.append(f" {cell:>16}")
+        print(f"{row['flow'][:30]:<30} {row['step'][:34]:<34}{''.join(cells)}")
+    print(f"(p50 per device profile; ratios are against {baseline})")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", type=Path, help=f"trace files (default: {TIMINGS_DIR})")
+    parser.add_argument("--last", type=int, help="only the N most recent runs")
+    parser.add_argument("--flow", action="append", help="only these flows")
+    parser.add_argument("--device", action="append", help="only these device profiles")
+    parser.add_argument("--compare-devices", action="store_true", help="p50 per device profile side by side")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or sorted(TIMINGS_DIR.glob("*.jsonl"))
+    if args.last:
+        paths = paths[-args.last :]
+    if not paths:
+        print(f"No timing traces found in {TIMINGS_DIR}", file=sys.stderr)
+        return 1
+
+    entries = load(paths)
+    if args.flow:
+        entries = [e for e in entries if e["flow"] in args.flow]
+    if args.device:
+        entries = [e for e in entries if (e.get("device") or "desktop") in args.device]
+    rows = aggregate(entries)
+    if args.compare_devices:
+        devices, table = compare_devices(rows)
+        if args.json:
+            json.dump(table, sys.stdout, indent=2)
+            print()
+        else:
+            print_comparison(devices, table)
+    elif args.json:
+        json.dump(rows, sys.stdout, indent=2)
+        print()
+    else:
+        print(f"{len(paths)} run(s), {len(entries)} step samples")
+        print_table(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""Rolling flight recorder for flows: keep the recent past, write it out only on failure.
+
+Every flow run under ``harness.run_flow`` gets a ``TraceBuffer``, set by
+``TOOLS_TRACE`` (``run_flows.py --trace``):
+
+* ``ring`` (default) - console messages, page errors, requests, responses,
+  failed requests and step boundaries (``timing.step``) from the last
+  ``TOOLS_TRACE_SECONDS`` (default 30) seconds,
+* ``dom`` - additionally a zlib-compressed DOM snapshot after each step,
+  the last ``TOOLS_TRACE_ACTIONS`` (default 20) kept. Serializing the DOM
+  is renderer work, so it is taken after the step's timer has stopped and
+  finished before the next step starts; it still lengthens the flow,
+* ``off`` - nothing. The benchmark tools, ``--repeat`` and ``--gate`` runs
+  default to this so nothing shares the page with a measured step.
+
+Never more than ``TOOLS_TRACE_MB`` (default 16) MiB is kept; the oldest
+records go first. Events are serialized once when they arrive, so the
+buffer holds bytes rather than live objects. When the flow passes the
+buffer is dropped; when it fails the buffer, the final DOM and a
+screenshot are written to ``test-results/tools/traces/<run id>-<flow>.zip``.
+
+Usage:
+
+    python scripts/tools/tracebuffer.py show ARCHIVE.zip          # timeline
+    python scripts/tools/tracebuffer.py dom ARCHIVE.zip -1 > last.html
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import zipfile
+import zlib
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+from harness import ARTIFACT_DIR, RUN_ID
+
+TRACES_DIR = ARTIFACT_DIR / "traces"
+MODES = ("ring", "dom", "off")
+
+
+def mode() -> str:
+    value = os.environ.get("TOOLS_TRACE", "ring")
+    if value not in MODES:
+        raise ValueError(f"TOOLS_TRACE must be one of {', '.join(MODES)}, not {value!r}")
+    return value
+
+
+def enabled() -> bool:
+    return mode() != "off"
+
+
+def measuring():
+    """For tools that time the page: no recorder unless ``TOOLS_TRACE`` asks for one."""
+    os.environ.setdefault("TOOLS_TRACE", "off")
+
+
+class TraceBuffer:
+    """Bounded ring of serialized page events and compressed DOM snapshots."""
+
+    def __init__(
+        self,
+        page,
+        name: str,
+        seconds: Optional[float] = None,
+        actions: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        snapshots: Optional[bool] = None,
+    ):
+        self.page = page
+        self.name = name
+        self.take_snapshots = snapshots if snapshots is not None else mode() == "dom"
+        self.seconds = seconds if seconds is not None else float(os.environ.get("TOOLS_TRACE_SECONDS", 30))
+        self.actions = actions if actions is not None else int(os.environ.get("TOOLS_TRACE_ACTIONS", 20))
+        self.max_bytes = max_bytes if max_bytes is not None else int(float(os.environ.get("TOOLS_TRACE_MB", 16)) * 2**20)
+        self.events: deque[tuple[float, bytes]] = deque()
+        self.snapshots: deque[tuple[float, str, bytes]] = deque()
+        self.size = 0
+        self.dropped = 0
+        self._handlers = {
+            "console": lambda msg: self.add("console", {"level": msg.type, "text": msg.text, "location": msg.location}),
+            "pageerror": lambda error: self.add("pageerror", {"message": str(error), "stack": getattr(error, "stack", None)}),
+            "request": lambda r: self.add("request", {"method": r.method, "url": r.url, "type": r.resource_type}),
+            "response": lambda r: self.add("response", {"status": r.status, "url": r.url}),
+            "requestfailed": lambda r: self.add("requestfailed", {"url": r.url, "failure": r.failure}),
+            "framenavigated": lambda frame: frame == self.page.main_frame and self.add("navigated", {"url": frame.url}),
+        }
+
+    def attach(self):
+        for event, handler in self._handlers.items():
+            self.page.on(event, handler)
+        return self
+
+    def detach(self):
+        for event, handler in self._handlers.items():
+            self.page.remove_listener(event, handler)
+
+    def add(self, kind: str, data):
+        now = time.time()
+        line = json.dumps({"type": kind, "time": now, "data": data}).encode()
+        self.events.append((now, line))
+        self.size += len(line)
+        self._trim(now)
+
+    def _trim(self, now: float):
+        horizon = now - self.seconds
+        while self.events and self.events[0][0] < horizon:
+            self.size -= len(self.events.popleft()[1])
+            self.dropped += 1
+        while len(self.snapshots) > self.actions:
+            self.size -= len(self.snapshots.popleft()[2])
+        while self.size > self.max_bytes and (self.events or self.snapshots):
+            # Whichever is older goes first.
+            if self.snapshots and (not self.events or self.snapshots[0][0] <= self.events[0][0]):
+                self.size -= len(self.snapshots.popleft()[2])
+            else:
+                self.size -= len(self.events.popleft()[1])
+                self.dropped += 1
+
+    # timing.Tracer listener interface
+
+    def step_started(self, name: str):
+        self.add("step", {"name": name, "phase": "start"})
+
+    async def step_finished(self, entry: dict):
+        # Called after the step's timer stopped; awaited so the snapshot is done
+        # before the flow starts (and times) its next step.
+        self.add("step", {"name": entry["step"], "phase": "end", "duration_ms": entry["duration_ms"], "error": entry["error"]})
+        if self.take_snapshots:
+            await self._snapshot(entry["step"])
+
+    async def _snapshot(self, label: str):
+        try:
+            html = await self.page.content()
+        except Exception:
+            return  # Navigating or closed; the next step will snapshot.
+        data = zlib.compress(html.encode(), 1)
+        now = time.time()
+        self.snapshots.append((now, label, data))
+        self.size += len(data)
+        self._trim(now)
+
+    async def flush(self, error: str, suffix: str = "") -> Optional[Path]:
+        """Write the buffer plus the current DOM and a screenshot to a zip; returns its path."""
+        final_html = screenshot = None
+        try:
+            final_html = await self.page.content()
+            screenshot = await self.page.screenshot()
+        except Exception:
+            pass
+        path = TRACES_DIR / f"{RUN_ID}-{self.name}{suffix}.zip"
+        meta = {
+            "flow": self.name,
+            "run": RUN_ID,
+            "error": error,
+            "seconds": self.seconds,
+            "actions": self.actions,
+            "dropped_events": self.dropped,
+        }
+        await asyncio.to_thread(self._write, path, meta, final_html, screenshot)
+        return path
+
+    def _write(self, path: Path, meta: dict, final_html: Optional[str], screenshot: Optional[bytes]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("meta.json", json.dumps(meta, indent=2))
+            archive.writestr("events.jsonl", b"\n".join(line for _, line in self.events) + b"\n")
+            for i, (when, label, data) in enumerate(self.snapshots):
+                safe = "".join(c if c.isalnum() else "_" for c in label)[:60]
+                archive.writestr(f"dom/{i:03d}-{safe}.html", zlib.decompress(data))
+            if final_html is not None:
+                archive.writestr("dom/final.html", final_html)
+            if screenshot is not None:
+                archive.writestr("screenshot.png", screenshot)
+
+    def discard(self):
+        self.events.clear()
+        self.snapshots.clear()
+        self.size = 0
+
+
+def show(path: Path):
+    with zipfile.ZipFile(path) as archive:
+        meta = json.loads(archive.read("meta.json"))
+        events = [json.loads(line) for line in archive.read("events.jsonl").splitlines() if line.strip()]
+        doms = [n for n in archive.namelist() if n.startswith("dom/")]
+    print(f"{meta['flow']} (run {meta['run']}): {meta['error']}")
+    print(f"{len(events)} events, {meta['dropped_events']} older ones dropped; DOM snapshots: {len(doms)}")
+    start = events[0]["time"] if events else 0
+    for e in events:
+        data = e["data"]
+        if e["type"] == "step":
+            detail = f"{data['phase']:<5} {data['name']}" + (
+                f" ({data['duration_ms']:.0f}ms)" if data["phase"] == "end" else ""
+            ) + (f"  !! {data['error']}" if data.get("error") else "")
+        elif e["type"] in ("request", "response", "requestfailed", "navigated"):
+            detail = " ".join(str(data.get(k, "")) for k in ("method", "status", "failure", "url") if data.get(k) is not None)
+        else:
+            detail = data.get("text") or data.get("message") or ""
+        print(f"{e['time'] - start:>8.2f}s {e['type']:<13} {detail[:140]}")
+    for name in doms:
+        print(f"  {name}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    timeline = sub.add_parser("show", help="print the timeline of a failure archive")
+    timeline.add_argument("archive", type=Path)
+    dom = sub.add_parser("dom", help="print one DOM snapshot (index, negative from the end, or 'final')")
+    dom.add_argument("archive", type=Path)
+    dom.add_argument("index")
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        show(args.archive)
+        return 0
+    with zipfile.ZipFile(args.archive) as archive:
+        names = sorted(n for n in archive.namelist() if n.startswith("dom/") and n != "dom/final.html")
+        name = "dom/final.html" if args.index == "final" else names[int(args.index)]
+        sys.stdout.write(archive.read(name).decode())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
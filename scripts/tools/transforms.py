@@ -0,0 +1,179 @@
+"""Registered codemods (see codemod.py).
+
+``breathing_controls`` and ``feature_permissions_panels`` are the former
+fix_buttons.py and refactor_manager.py: the first rebuilds the Breathing
+widget's controls row with container-query sized buttons, the second moves
+FeaturePermissionsManager's inline configuration and beta-user panels into
+FeatureConfigurationPanel and BetaUsersPanel. Each checks for the markup it
+migrates from and stops with "pattern not found" when it is absent, so on a
+tree where the migration has landed it changes nothing.
+
+``control_button_sizing`` is the batch form of the breathing_controls
+sizing: any widget or admin ``<button>`` still sized with fixed ``w-14
+h-14`` classes gets the container-relative ``min(56px, 18cqmin)`` style.
+"""
+import re
+
+from codemod import Source, Span, codemod
+
+FIXED_56PX = re.compile(r"(?<![\w:-])(?:w-14 h-14|h-14 w-14)(?![\w-])")
+
+BREATHING_CONTROLS = """\
+<div className="shrink-0 p-4 w-full flex justify-center gap-4 bg-white/50 dark:bg-black/20 backdrop-blur-sm z-20">
+            <button
+              onClick={toggleActive}
+              className={`flex items-center justify-center rounded-2xl transition-all shadow-md active:scale-95 ${
+                isActive
+                  ? 'bg-slate-200 text-slate-700 dark:bg-slate-700 dark:text-slate-300'
+                  : 'bg-brand-blue-primary text-white shadow-brand-blue-primary/30 hover:bg-brand-blue-light'
+              }`}
+              style={{
+                width: 'min(56px, 18cqmin)',
+                height: 'min(56px, 18cqmin)',
+              }}
+              aria-label={isActive ? 'Pause' : 'Start'}
+            >
+              {isActive ? (
+                <Pause
+                  fill="currentColor"
+                  style={{
+                    width: 'min(24px, 7cqmin)',
+                    height: 'min(24px, 7cqmin)',
+                  }}
+                />
+              ) : (
+                <Play
+                  fill="currentColor"
+                  style={{
+                    width: 'min(24px, 7cqmin)',
+                    height: 'min(24px, 7cqmin)',
+                    marginLeft: 'min(4px, 1cqmin)',
+                  }}
+                />
+              )}
+            </button>
+            <button
+              onClick={reset}
+              disabled={!isActive && progress === 0}
+              className="flex items-center justify-center rounded-2xl bg-slate-100 text-slate-500 hover:bg-slate-200 dark:bg-slate-800 dark:text-slate-400 dark:hover:bg-slate-700 transition-all active:scale-95 disabled:opacity-50 disabled:cursor-not-allowed"
+              style={{
+                width: 'min(56px, 18cqmin)',
+                height: 'min(56px, 18cqmin)',
+              }}
+              aria-label="Reset"
+            >
+              <RotateCcw
+                style={{
+                  width: 'min(24px, 7cqmin)',
+                  height: 'min(24px, 7cqmin)',
+                }}
+              />
+            </button>
+          </div>"""
+
+
+@codemod("components/widgets/Breathing/BreathingWidget.tsx")
+def breathing_controls(src: Source):
+    controls = src.element(src.after("{/* Controls */}"))
+    # Only the fixed-size row is migrated; the current cqmin row is left alone.
+    if not FIXED_56PX.search(src.source(controls)):
+        raise src.error(controls.start, "pattern not found: controls sized with 'w-14 h-14'")
+    src.replace(controls, BREATHING_CONTROLS)
+
+
+FEATURE_PANEL_IMPORTS = """\
+import { FeatureConfigurationPanel } from './FeatureConfigurationPanel';
+import { BetaUsersPanel } from './BetaUsersPanel';
+"""
+
+# Comment that precedes each inline panel -> the component that replaces it.
+FEATURE_PANELS = {
+    "{/* Settings Panel */}": """\
+{editingConfig === tool.type && (
+                      <FeatureConfigurationPanel
+                        tool={tool}
+                        permission={permission}
+                        updatePermission={updatePermission}
+                        showMessage={showMessage}
+                        uploadWeatherImage={uploadWeatherImage}
+                      />
+                    )}""",
+    "{/* Beta Users Panel */}": """\
+{permission.accessLevel === 'beta' && (
+                      <BetaUsersPanel
+                        tool={tool}
+                        permission={permission}
+                        updatePermission={updatePermission}
+                        showMessage={showMessage}
+                        variant="expanded"
+                      />
+                    )}""",
+    "{/* Configuration Panel */}": """\
+{editingConfig === tool.type && (
+                <FeatureConfigurationPanel
+                  tool={tool}
+                  permission={permission}
+                  updatePermission={updatePermission}
+                  showMessage={showMessage}
+                  uploadWeatherImage={uploadWeatherImage}
+                />
+              )}""",
+    "{/* Beta Users (only show if access level is beta) */}": """\
+{permission.accessLevel === 'beta' && (
+                <BetaUsersPanel
+                  tool={tool}
+                  permission={permission}
+                  updatePermission={updatePermission}
+                  showMessage={showMessage}
+                  variant="card"
+                />
+              )}""",
+}
+
+# Handlers that moved into the extracted panels.
+MOVED_HANDLERS = (
+    "addBetaUser",
+    "removeBetaUser",
+    "addWeatherRange",
+    "updateWeatherRange",
+    "removeWeatherRange",
+    "handleWeatherImageUpload",
+)
+
+
+@codemod("components/admin/FeaturePermissionsManager.tsx")
+def feature_permissions_panels(src: Source):
+    src.insert(src.after("import { Toggle } from '../common/Toggle';\n"), FEATURE_PANEL_IMPORTS)
+
+    guard = src.const("isCatalystConfig")
+    src.delete(Span(src.find("// Helper type guard\n"), guard.end))
+    src.delete(src.line_of("const [uploadingRangeId, setUploadingRangeId] = useState<string | null>(null);"))
+    for name in MOVED_HANDLERS:
+        src.delete(src.const(name))
+
+    for comment, replacement in FEATURE_PANELS.items():
+        src.replace(src.block(src.after(comment)), replacement)
+
+
+SCALED_56PX = "style={{ width: 'min(56px, 18cqmin)', height: 'min(56px, 18cqmin)' }}"
+
+
+@codemod("components/widgets/**/*.tsx", "components/admin/**/*.tsx")
+def control_button_sizing(src: Source):
+    for button in src.elements_named("button"):
+        class_name = src.attribute(button, "className")
+        if class_name is None or src.attribute(button, "style") is not None:
+            continue
+        value = src.source(class_name)
+        if value[0] not in "\"'" or not FIXED_56PX.search(value):
+            continue
+        quote = value[0]
+        classes = " ".join(FIXED_56PX.sub("", value[1:-1]).split())
+        # Put the style on its own line when className is on its own line.
+        line_start = src.text.rfind("\n", 0, class_name.start) + 1
+        indent = src.text[line_start : class_name.start - len("className=")]
+        separator = "\n" + indent if not indent.strip() else " "
+        if classes:
+            src.replace(class_name, f"{quote}{classes}{quote}{separator}{SCALED_56PX}")
+        else:
+            src.replace(Span(class_name.start - len("className="), class_name.end), SCALED_56PX)
@@ -0,0 +1,5 @@
+from flows import verify_breathing_animation
+from harness import run_standalone
+
+if __name__ == "__main__":
+    run_standalone(verify_breathing_animation)